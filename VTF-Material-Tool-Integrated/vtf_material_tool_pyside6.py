@@ -11,36 +11,135 @@ from pathlib import Path
 from typing import List, Optional, Dict, Any
 import subprocess
 import json
+import hashlib
+import mmap
+import re
 import shutil
+import tempfile
+import threading
+import time
 from PIL import Image
 import numpy as np
 import logging
 import datetime
+import multiprocessing
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
 # VTF转换现在使用VTF CMD命令行工具，不再依赖sourcepp
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
-    QScrollArea, QLabel, QLineEdit, QPushButton, QListWidget, QTextEdit,
+    QScrollArea, QLabel, QLineEdit, QPushButton, QListWidget, QListView, QTextEdit,
     QGroupBox, QRadioButton, QCheckBox, QButtonGroup, QFileDialog,
     QMessageBox, QProgressBar, QStatusBar, QFrame, QGridLayout,
     QSizePolicy, QSpacerItem, QComboBox, QDialog, QPlainTextEdit, QMenuBar, QMenu,
     QSpinBox, QSplitter, QInputDialog
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer, QSettings
-from PySide6.QtGui import QFont, QIcon, QPalette, QColor, QDragEnterEvent, QDropEvent, QAction
+from PySide6.QtCore import (
+    Qt, QThread, Signal, QTimer, QSettings, QUrl, QStringListModel, QSignalBlocker, QStandardPaths
+)
+from PySide6.QtGui import (
+    QFont, QIcon, QPalette, QColor, QDragEnterEvent, QDropEvent, QAction, QDesktopServices,
+    QImage, QPixmap, QPixmapCache
+)
+
+# numba为可选依赖，未安装时使用numpy实现
+try:
+    from numba import njit, prange, get_num_threads, types as numba_types
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# 设置环境变量VTF_PROFILE=1时，预览过程中的错误不再被捕获，直接抛出便于调试和性能分析
+_VTF_PROFILE = os.environ.get("VTF_PROFILE") == "1"
+
+
+def _coerce_bool(value, default=False) -> bool:
+    """把QSettings读出的值转换为布尔值（ini后端会把布尔值存成"true"/"false"字符串）"""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes')
+    return bool(value)
+
+
+if _HAS_NUMBA:
+    # 打包后的程序找不到模块源文件，numba的磁盘缓存无处存放，cache=True会在装饰时直接抛出RuntimeError
+    try:
+        @njit(parallel=True, cache=not getattr(sys, 'frozen', False))
+        def _assemble_mrao_kernel(src0, mask0, src1, mask1, src2, mask2, out):
+            """一次遍历写出MRAO的三个通道，mask为0xFF时反转对应通道"""
+            height, width = out.shape[0], out.shape[1]
+            for y in prange(height):
+                for x in range(width):
+                    out[y, x, 0] = src0[y, x] ^ mask0
+                    out[y, x, 1] = src1[y, x] ^ mask1
+                    out[y, x, 2] = src2[y, x] ^ mask2
+    except Exception as e:
+        print(f"numba内核初始化失败，改用numpy实现: {e}")
+        _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    # 未安装TBB/OpenMP时numba使用workqueue线程层，多个Python线程同时进入并行区域会直接中止进程；
+    # 界面线程的预览和处理线程池可能同时调用内核，因此串行执行（内核本身已占满所有核心）
+    _assemble_mrao_lock = threading.Lock()
+    
+    # 预览传入只读的连续平面，处理传入通道切片和broadcast_to常数平面，布局各不相同；
+    # 只按任意布局的只读输入编译一个版本，两条路径共用，不会再各自触发编译
+    _MRAO_PLANE = numba_types.Array(numba_types.uint8, 2, 'A', readonly=True)
+    _ASSEMBLE_MRAO_SIG = numba_types.void(
+        _MRAO_PLANE, numba_types.uint8, _MRAO_PLANE, numba_types.uint8, _MRAO_PLANE, numba_types.uint8,
+        numba_types.Array(numba_types.uint8, 3, 'A'))
+    
+    def _ensure_mrao_kernel():
+        """编译（或从磁盘缓存加载）内核的唯一版本，之后不再按其他参数类型编译；调用方需持有锁"""
+        if not _assemble_mrao_kernel.signatures:
+            _assemble_mrao_kernel.compile(_ASSEMBLE_MRAO_SIG)
+            _assemble_mrao_kernel.disable_compile()
+    
+    def _warm_up_mrao_kernel():
+        with _assemble_mrao_lock:
+            _ensure_mrao_kernel()
+    
+    def _start_mrao_kernel_warm_up():
+        """启动时在后台线程中编译内核，首次预览不再在界面线程上等待JIT编译
+        
+        numba的线程层先在主线程启动：TBB线程层首次由其他线程启动时，程序退出会卡住
+        """
+        get_num_threads()
+        threading.Thread(target=_warm_up_mrao_kernel, daemon=True).start()
+    
+    def _assemble_mrao(src0, mask0, src1, mask1, src2, mask2, out):
+        with _assemble_mrao_lock:
+            _ensure_mrao_kernel()
+            _assemble_mrao_kernel(src0, mask0, src1, mask1, src2, mask2, out)
 
 
 class ConfigManager:
     """配置管理器"""
     
+    __slots__ = ("settings", "_cache")
+    
     def __init__(self):
         self.settings = QSettings("VTFTool", "VTFMaterialTool")
+        # 启动时一次性读入全部配置，之后的读取直接查内存字典
+        self._cache = {key: self.settings.value(key) for key in self.settings.allKeys()}
         
     def get(self, key: str, default=None):
-        return self.settings.value(key, default)
+        return self._cache.get(key, default)
+        
+    def get_bool(self, key: str, default=False) -> bool:
+        return _coerce_bool(self._cache.get(key), default)
+        
+    def get_int(self, key: str, default=0) -> int:
+        try:
+            return int(self._cache.get(key, default))
+        except (ValueError, TypeError):
+            return default
         
     def set(self, key: str, value):
+        self._cache[key] = value
         self.settings.setValue(key, value)
         
     def sync(self):
@@ -146,8 +245,6 @@ class PBRSourceAlgorithms:
     @staticmethod
     def make_phong_exponent(roughness_img: Image) -> Image:
         """生成Phong指数纹理 - 基于PBR-2-Source原版算法"""
-        import numpy as np
-        
         # 转换为numpy数组进行计算
         roughness_data = np.array(roughness_img.convert('L'))
         roughness_normalized = roughness_data.astype(np.float32) / 255.0
@@ -169,8 +266,6 @@ class PBRSourceAlgorithms:
     @staticmethod
     def make_phong_mask(roughness_img: Image, ao_img: Image = None) -> Image:
         """生成Phong遮罩 - 基于PBR-2-Source原版算法"""
-        import numpy as np
-        
         # 转换为numpy数组
         roughness_data = np.array(roughness_img.convert('L'))
         roughness_normalized = roughness_data.astype(np.float32) / 255.0
@@ -195,8 +290,6 @@ class PBRSourceAlgorithms:
     @staticmethod
     def make_envmask(metallic_img: Image, roughness_img: Image, ao_img: Image = None, has_phong: bool = True) -> Image:
         """生成环境贴图遮罩 - 基于PBR-2-Source原版算法"""
-        import numpy as np
-        
         # 转换为numpy数组
         metallic_data = np.array(metallic_img.convert('L'))
         metallic_normalized = metallic_data.astype(np.float32) / 255.0
@@ -234,8 +327,6 @@ class PBRSourceAlgorithms:
         Args:
             preserve_alpha: 是否保持原始图像的alpha通道
         """
-        import numpy as np
-        
         # 转换为numpy数组
         albedo_data = np.array(albedo_img.convert('RGB'))
         albedo_normalized = albedo_data.astype(np.float32) / 255.0
@@ -260,16 +351,16 @@ class PBRSourceAlgorithms:
             ao_blend = ao_normalized * 0.75 + 0.25
             mask *= ao_blend
         
-        # 应用遮罩到每个颜色通道
-        result = albedo_normalized.copy()
-        for i in range(3):  # RGB通道
-            result[:, :, i] *= mask
+        # 应用遮罩到每个颜色通道（albedo_normalized本身就是新数组，直接原地运算，不再复制）
+        result = albedo_normalized
+        result *= mask[:, :, np.newaxis]
         
         # 限制在合理范围内
-        result = np.clip(result, 0.0, 1.0)
+        np.clip(result, 0.0, 1.0, out=result)
         
         # 转换回PIL图像
-        result_uint8 = (result * 255).astype(np.uint8)
+        result *= 255
+        result_uint8 = result.astype(np.uint8)
         
         if preserve_alpha and albedo_img.mode in ('RGBA', 'LA'):
             # 保持原始alpha通道
@@ -288,8 +379,6 @@ class PBRSourceAlgorithms:
     @staticmethod
     def make_bumpmap_with_phong_mask(normal_img: Image, phong_mask_img: Image) -> Image:
         """生成带有Phong遮罩的法线贴图 - PhongEnvmapAlpha模式"""
-        import numpy as np
-        
         # 转换法线贴图为RGB
         normal_data = np.array(normal_img.convert('RGB'))
         
@@ -298,7 +387,7 @@ class PBRSourceAlgorithms:
         
         # 合并为RGBA：RGB来自法线贴图，Alpha来自Phong遮罩
         height, width = normal_data.shape[:2]
-        result = np.zeros((height, width, 4), dtype=np.uint8)
+        result = np.empty((height, width, 4), dtype=np.uint8)  # 四个通道都会被写入，无需清零
         result[:, :, :3] = normal_data  # RGB通道
         result[:, :, 3] = phong_mask_data  # Alpha通道
         
@@ -309,8 +398,6 @@ class PBRSourceAlgorithms:
     @staticmethod
     def generate_default_normal(size: tuple) -> Image:
         """生成默认法线贴图 (0.5, 0.5, 1.0)"""
-        import numpy as np
-        
         width, height = size
         # 创建默认法线贴图：RGB = (128, 128, 255) 对应 (0.5, 0.5, 1.0)
         normal_data = np.full((height, width, 3), [128, 128, 255], dtype=np.uint8)
@@ -319,8 +406,6 @@ class PBRSourceAlgorithms:
     @staticmethod
     def generate_default_metallic(size: tuple, value: float = 0.0) -> Image:
         """生成默认金属度贴图"""
-        import numpy as np
-        
         width, height = size
         # 创建默认金属度贴图：通常为0（非金属）
         metallic_value = int(value * 255)
@@ -330,8 +415,6 @@ class PBRSourceAlgorithms:
     @staticmethod
     def generate_default_ao(size: tuple, value: float = 1.0) -> Image:
         """生成默认AO贴图"""
-        import numpy as np
-        
         width, height = size
         # 创建默认AO贴图：通常为1（无遮蔽）
         ao_value = int(value * 255)
@@ -341,8 +424,6 @@ class PBRSourceAlgorithms:
     @staticmethod
     def make_emit(emit_img: Image, is_pbr_mode: bool = False) -> Image:
         """生成自发光纹理 - 基于PBR-2-Source原版算法"""
-        import numpy as np
-        
         # 如果是PBR模式，直接返回原图
         if is_pbr_mode:
             return emit_img
@@ -364,8 +445,6 @@ class PBRSourceAlgorithms:
     @staticmethod
     def make_mrao(metallic_img: Image, roughness_img: Image, ao_img: Image = None) -> Image:
         """生成MRAO纹理 (Metallic-Roughness-AO) - 基于PBR-2-Source原版算法"""
-        import numpy as np
-        
         # 转换为numpy数组
         metallic_data = np.array(metallic_img.convert('L'))
         roughness_data = np.array(roughness_img.convert('L'))
@@ -621,7 +700,6 @@ class NightglowProcessingThread(QThread):
                     return
             
             # 使用临时目录处理文件
-            import tempfile
             with tempfile.TemporaryDirectory() as temp_dir:
                 temp_path = Path(temp_dir)
                 
@@ -867,7 +945,6 @@ class NightglowProcessingThread(QThread):
                         content = f.read()
                     
                     # 查找并替换$selfillum行（包括注释和非注释的情况）
-                    import re
                     modified = False
                     new_content = content
                     
@@ -1144,7 +1221,6 @@ class NightglowProcessingThread(QThread):
                     existing_content = f.read()
                 
                 # 检查是否已包含发光相关配置
-                import re
                 if (re.search(r'"\$EmissiveBlend', existing_content, re.IGNORECASE) or 
                     re.search(r'"\$selfillum"\s*"[01]"', existing_content, re.IGNORECASE)):
                     print(f"VMT文件已包含发光配置，跳过: {base_name}")
@@ -1464,7 +1540,6 @@ class NightglowProcessingThread(QThread):
                         content = f.read()
                     
                     # 查找并替换$selfillum行（包括注释和非注释的情况）
-                    import re
                     modified = False
                     new_content = content
                     
@@ -1938,10 +2013,10 @@ class NightglowTab(ScrollableTab):
         
     def update_status(self, message: str):
         """更新状态信息"""
-        # 连接到主窗口的状态栏
+        # 通过主窗口的状态信号转发到状态栏
         main_window = self.window()
-        if hasattr(main_window, 'status_bar'):
-            main_window.status_bar.showMessage(message)
+        if hasattr(main_window, 'report_status'):
+            main_window.report_status(message)
         
     def update_progress(self, value: int):
         """更新进度"""
@@ -2019,12 +2094,63 @@ class NightglowTab(ScrollableTab):
 
 
 
+# 眼部patch VMT模板（eye_r.vmt / eye_l.vmt 内容相同），预编码为bytes直接写入
+_EYE_VMT_BYTES = (
+    b'patch\n'
+    b'{\n'
+    b'\tinclude\t"materials/%s/shader/eye_base.vmt"\n'
+    b'\tinsert\n'
+    b'\t{\n'
+    b'\t}\n'
+    b'\treplace\n'
+    b'\t{\n'
+    b'\t"$iris" "%s/%s"\n'
+    b'\t}\n'
+    b'}\n'
+)
+
+# QCI中$cdmaterials的匹配模式（字节级），同时支持 $cdmaterials "path" 与 $cdmaterials path 两种格式
+_CD_COMBINED = re.compile(rb'\$cdmaterials\s+(?:"([^"\r\n]+)"|([^\s"]+))', re.IGNORECASE)
+
+
+def _find_cdmaterials(qci_file):
+    """通过内存映射扫描QCI文件，返回第一个$cdmaterials路径，未找到时返回None
+    
+    只解码匹配到的路径，不需要把整个文件读入并解码为字符串。
+    """
+    with open(qci_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None  # 空文件无法映射
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            match = _CD_COMBINED.search(mm)
+            if not match:
+                return None
+            return (match.group(1) or match.group(2)).decode('utf-8', errors='ignore')
+
+# VTFCmd格式参数表（format与alphaformat使用相同格式），模块加载时构建一次
+_VTF_PARAMS = {
+    fmt: ['-format', fmt.lower(), '-alphaformat', fmt.lower()]
+    for fmt in ("DXT1", "DXT3", "DXT5", "RGBA8888")
+}
+
+
 class MaterialConfigTab(ScrollableTab):
     """材质配置生成选项卡"""
     
-    def __init__(self, config_manager: ConfigManager, status_bar: QStatusBar):
+    # ImageMagick量子深度（如"Q16-HDRI"），首次分析时检测一次
+    _magick_quantum = None
+    
+    def __init__(self, config_manager: ConfigManager, report_status):
         self.config = config_manager
-        self.status_bar = status_bar
+        self.report_status = report_status
+        self._vtfcmd_path = None  # 缓存已解析的VTFCmd路径
+        # 屏蔽词列表缓存，复选框或自定义文本变化时置为None重新构建
+        self._skip_blacklist_cache = None
+        self._vmt_blacklist_cache = None
+        # 当前文件的VMT透明度参数，统一为字典形式 {参数名: 值}
+        self.vmt_alpha_config = {}
+        # 本批次已复制过的lightwarp目标路径，避免每个文件重复复制
+        self._lightwarp_copied = set()
         super().__init__()
         # 在UI设置完成后恢复设置
         self.restore_experimental_settings()
@@ -2141,13 +2267,11 @@ class MaterialConfigTab(ScrollableTab):
             checkbox = QCheckBox(word)
             # 从配置中恢复选中状态，如果没有则使用默认值
             default_checked = word in ['_N', '_Normal', '_emi']
-            is_checked = self.config.get(f'skip_preset_{word}_checked', default_checked)
-            # 确保is_checked是布尔值
-            if isinstance(is_checked, str):
-                is_checked = is_checked.lower() in ('true', '1', 'yes')
-            checkbox.setChecked(bool(is_checked))
+            is_checked = self.config.get_bool(f'skip_preset_{word}_checked', default_checked)
+            checkbox.setChecked(is_checked)
             # 连接信号以保存状态变化
             checkbox.stateChanged.connect(lambda state, w=word: self.save_skip_preset_state(w, state))
+            checkbox.stateChanged.connect(self._mark_blacklist_dirty)
             self.skip_preset_blacklist_vars[word] = checkbox
             self.skip_preset_layout.addWidget(checkbox, i // 4, i % 4)
         
@@ -2157,6 +2281,7 @@ class MaterialConfigTab(ScrollableTab):
         skip_layout.addWidget(QLabel("自定义屏蔽词（完全跳过）:"))
         self.skip_custom_blacklist_edit = QLineEdit()
         self.skip_custom_blacklist_edit.setPlaceholderText("用逗号分隔多个屏蔽词，匹配的文件将完全跳过生成")
+        self.skip_custom_blacklist_edit.textChanged.connect(self._mark_blacklist_dirty)
         skip_layout.addWidget(self.skip_custom_blacklist_edit)
         
         blacklist_layout.addWidget(skip_group)
@@ -2188,13 +2313,11 @@ class MaterialConfigTab(ScrollableTab):
         for i, word in enumerate(vmt_preset_words):
             checkbox = QCheckBox(word)
             # 从配置中恢复选中状态
-            is_checked = self.config.get(f'vmt_preset_{word}_checked', False)
-            # 确保is_checked是布尔值
-            if isinstance(is_checked, str):
-                is_checked = is_checked.lower() in ('true', '1', 'yes')
-            checkbox.setChecked(bool(is_checked))
+            is_checked = self.config.get_bool(f'vmt_preset_{word}_checked', False)
+            checkbox.setChecked(is_checked)
             # 连接信号以保存状态变化
             checkbox.stateChanged.connect(lambda state, w=word: self.save_vmt_preset_state(w, state))
+            checkbox.stateChanged.connect(self._mark_blacklist_dirty)
             self.vmt_preset_blacklist_vars[word] = checkbox
             self.vmt_preset_layout.addWidget(checkbox, i // 4, i % 4)
         
@@ -2204,6 +2327,7 @@ class MaterialConfigTab(ScrollableTab):
         vmt_only_layout.addWidget(QLabel("自定义屏蔽词（仅屏蔽VMT）:"))
         self.vmt_custom_blacklist_edit = QLineEdit()
         self.vmt_custom_blacklist_edit.setPlaceholderText("用逗号分隔多个屏蔽词，匹配的文件将生成VTF但不生成VMT")
+        self.vmt_custom_blacklist_edit.textChanged.connect(self._mark_blacklist_dirty)
         vmt_only_layout.addWidget(self.vmt_custom_blacklist_edit)
         
         blacklist_layout.addWidget(vmt_only_group)
@@ -2408,18 +2532,10 @@ class MaterialConfigTab(ScrollableTab):
         """恢复实验性功能设置"""
         # 恢复自动法线贴图设置
         if hasattr(self, 'auto_normal_checkbox'):
-            auto_normal_enabled = self.config.get("auto_normal_enabled", False)
-            if isinstance(auto_normal_enabled, str):
-                auto_normal_enabled = auto_normal_enabled.lower() == 'true'
-            self.auto_normal_checkbox.setChecked(auto_normal_enabled)
+            self.auto_normal_checkbox.setChecked(self.config.get_bool("auto_normal_enabled", False))
         
         if hasattr(self, 'normal_threshold_spinbox'):
-            normal_threshold = self.config.get("normal_threshold", 50)
-            try:
-                normal_threshold = int(normal_threshold)
-            except (ValueError, TypeError):
-                normal_threshold = 50
-            self.normal_threshold_spinbox.setValue(normal_threshold)
+            self.normal_threshold_spinbox.setValue(self.config.get_int("normal_threshold", 50))
         
     def select_material_file(self):
         """选择材质文件"""
@@ -2486,25 +2602,12 @@ class MaterialConfigTab(ScrollableTab):
             return
             
         try:
-            with open(qci_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-            # 查找$cdmaterials行
-            import re
-            # 支持带引号和不带引号的格式
-            pattern1 = r'\$cdmaterials\s+"([^"]+)"'  # 带引号格式: $cdmaterials "path"
-            pattern2 = r'\$cdmaterials\s+([^\s\r\n]+)'  # 不带引号格式: $cdmaterials path
-            
-            match = re.search(pattern1, content, re.IGNORECASE)
-            if not match:
-                match = re.search(pattern2, content, re.IGNORECASE)
-            
-            if match:
-                cdmaterials_path = match.group(1)
+            cdmaterials_path = _find_cdmaterials(qci_file)
+            if cdmaterials_path:
                 # 转换为materials路径格式
                 materials_path = f"materials/{cdmaterials_path}"
                 self.cdmaterials_edit.setText(materials_path)
-                self.status_bar.showMessage(f"已读取材质路径: {materials_path}")
+                self.report_status(f"已读取材质路径: {materials_path}")
             else:
                 QMessageBox.information(self, "提示", "QCI文件中未找到$cdmaterials路径")
                 
@@ -2541,21 +2644,8 @@ class MaterialConfigTab(ScrollableTab):
             return
             
         try:
-            with open(qci_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-            # 查找$cdmaterials行
-            import re
-            # 支持带引号和不带引号的格式
-            pattern1 = r'\$cdmaterials\s+"([^"]+)"'  # 带引号格式: $cdmaterials "path"
-            pattern2 = r'\$cdmaterials\s+([^\s\r\n]+)'  # 不带引号格式: $cdmaterials path
-            
-            match = re.search(pattern1, content, re.IGNORECASE)
-            if not match:
-                match = re.search(pattern2, content, re.IGNORECASE)
-            
-            if match:
-                cdmaterials_path = match.group(1)
+            cdmaterials_path = _find_cdmaterials(qci_file)
+            if cdmaterials_path:
                 # 直接使用cdmaterials路径，不添加materials前缀
                 self.cdmaterials_edit.setText(cdmaterials_path)
                 QMessageBox.information(self, "成功", f"已读取材质路径: {cdmaterials_path}")
@@ -2614,7 +2704,8 @@ class MaterialConfigTab(ScrollableTab):
         self.generate_material_btn.setText("处理中...")
         
         # 开始处理
-        self.status_bar.showMessage("开始处理材质配置...")
+        self.report_status("开始处理材质配置...")
+        self._lightwarp_copied.clear()
         
         try:
             success_count = 0
@@ -2625,10 +2716,11 @@ class MaterialConfigTab(ScrollableTab):
                 progress = int((i / total_files) * 100)
                 if hasattr(main_window, 'progress_bar'):
                     main_window.progress_bar.setValue(progress)
-                    main_window.progress_bar.setVisible(True)
                 
                 # 更新状态
-                self.status_bar.showMessage(f"正在处理: {Path(file_path).name} ({i+1}/{total_files})")
+                self.report_status(f"正在处理: {Path(file_path).name} ({i+1}/{total_files})")
+                if hasattr(main_window, 'flush_progress'):
+                    main_window.flush_progress()
                 
                 # 检查是否完全跳过
                 if self.should_skip_file(file_path, skip_blacklist):
@@ -2646,39 +2738,41 @@ class MaterialConfigTab(ScrollableTab):
                     success_count += 1
             
             # 完成处理
-            if hasattr(main_window, 'progress_bar'):
-                main_window.progress_bar.setValue(100)
-                main_window.progress_bar.setVisible(False)
-            
             if hasattr(main_window, 'stop_progress'):
                 main_window.stop_progress()
                     
             QMessageBox.information(self, "完成", f"成功处理 {success_count}/{len(files)} 个文件")
-            self.status_bar.showMessage("材质配置生成完成")
+            self.report_status("材质配置生成完成")
             
         except Exception as e:
             # 停止进度条
             if hasattr(main_window, 'stop_progress'):
                 main_window.stop_progress()
-            if hasattr(main_window, 'progress_bar'):
-                main_window.progress_bar.setVisible(False)
             
             QMessageBox.critical(self, "错误", f"处理过程中发生错误: {str(e)}")
-            self.status_bar.showMessage("处理失败")
+            self.report_status("处理失败")
         
         finally:
             # 恢复处理按钮
             self.generate_material_btn.setEnabled(True)
             self.generate_material_btn.setText("生成材质配置")
             
+    def _mark_blacklist_dirty(self, *args):
+        """屏蔽词设置变化时使缓存失效"""
+        self._skip_blacklist_cache = None
+        self._vmt_blacklist_cache = None
+    
     def get_skip_blacklist(self):
-        """获取完全跳过生成的屏蔽词列表"""
-        blacklist = []
+        """获取完全跳过生成的屏蔽词集合（小写）"""
+        if self._skip_blacklist_cache is not None:
+            return self._skip_blacklist_cache
+        
+        blacklist = set()
         
         # 添加预设屏蔽词（完全跳过）
         for word, checkbox in self.skip_preset_blacklist_vars.items():
             if checkbox.isChecked():
-                blacklist.append(word)
+                blacklist.add(word.lower())
                 
         # 添加自定义屏蔽词（完全跳过）
         custom_words = self.skip_custom_blacklist_edit.text().strip()
@@ -2686,18 +2780,23 @@ class MaterialConfigTab(ScrollableTab):
             for word in custom_words.split(','):
                 word = word.strip()
                 if word:
-                    blacklist.append(word)
-                    
-        return blacklist
+                    blacklist.add(word.lower())
+        
+        # 屏蔽词统一转为小写，匹配时无需再逐个转换
+        self._skip_blacklist_cache = frozenset(blacklist)
+        return self._skip_blacklist_cache
     
     def get_vmt_blacklist(self):
-        """获取仅屏蔽VMT生成的屏蔽词列表"""
-        blacklist = []
+        """获取仅屏蔽VMT生成的屏蔽词集合（小写）"""
+        if self._vmt_blacklist_cache is not None:
+            return self._vmt_blacklist_cache
+        
+        blacklist = set()
         
         # 添加预设屏蔽词（仅屏蔽VMT）
         for word, checkbox in self.vmt_preset_blacklist_vars.items():
             if checkbox.isChecked():
-                blacklist.append(word)
+                blacklist.add(word.lower())
                 
         # 添加自定义屏蔽词（仅屏蔽VMT）
         custom_words = self.vmt_custom_blacklist_edit.text().strip()
@@ -2705,22 +2804,23 @@ class MaterialConfigTab(ScrollableTab):
             for word in custom_words.split(','):
                 word = word.strip()
                 if word:
-                    blacklist.append(word)
-                    
-        return blacklist
+                    blacklist.add(word.lower())
+        
+        # 屏蔽词统一转为小写，匹配时无需再逐个转换
+        self._vmt_blacklist_cache = frozenset(blacklist)
+        return self._vmt_blacklist_cache
     
     def get_blacklist(self):
         """获取屏蔽词列表（保持向后兼容）"""
         return self.get_skip_blacklist()
         
     def should_skip_file(self, file_path, blacklist):
-        """检查文件是否应该被屏蔽"""
+        """检查文件是否应该被屏蔽（blacklist中的屏蔽词应已为小写）"""
         file_name = Path(file_path).name.lower()
-        print(f"检查文件: {file_name}, 屏蔽词列表: {[word.lower() for word in blacklist]}")
+        print(f"检查文件: {file_name}, 屏蔽词列表: {sorted(blacklist)}")
         for word in blacklist:
-            word_lower = word.lower()
-            if word_lower in file_name:
-                print(f"匹配到屏蔽词: '{word_lower}' 在文件名 '{file_name}' 中")
+            if word in file_name:
+                print(f"匹配到屏蔽词: '{word}' 在文件名 '{file_name}' 中")
                 return True
         print(f"文件 '{file_name}' 未匹配任何屏蔽词")
         return False
@@ -2870,7 +2970,7 @@ class MaterialConfigTab(ScrollableTab):
                 # 法线贴图强制使用RGBA8888格式以避免图像损坏
                 format_name = "RGBA8888"
                 format_params = self.get_vtf_command_params(format_name)
-                self.vmt_alpha_config = ""
+                self.vmt_alpha_config = {}
                 print(f"法线贴图检测: {file_path.name} -> 强制使用RGBA8888格式")
             else:
                 # 根据模式选择格式
@@ -2892,7 +2992,7 @@ class MaterialConfigTab(ScrollableTab):
                     # 手动模式，使用用户选择的格式
                     format_name = self.get_selected_manual_format()
                     format_params = self.get_vtf_command_params(format_name)
-                    self.vmt_alpha_config = ""
+                    self.vmt_alpha_config = {}
                     print(f"手动模式: {file_path.name} -> {format_name}")
             
             # 1. 图像转VTF - 直接输出到materials路径
@@ -2901,7 +3001,9 @@ class MaterialConfigTab(ScrollableTab):
                 raise Exception("未找到VTFCmd工具")
                 
             cmd = [vtfcmd_path, '-file', str(file_path), '-output', str(full_materials_path)] + format_params
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+            # 只需返回码和错误信息，丢弃VTFCmd的进度输出
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                    text=True, encoding='utf-8', errors='ignore')
             if result.returncode != 0:
                 raise Exception(f"图像转VTF失败 ({base_name}): {result.stderr}")
             
@@ -2916,7 +3018,7 @@ class MaterialConfigTab(ScrollableTab):
             else:
                 print(f"跳过VMT生成: {base_name}")
             
-            self.status_bar.showMessage(f"已处理: {file_path.name}")
+            self.report_status(f"已处理: {file_path.name}")
             return True
             
         except Exception as e:
@@ -2941,20 +3043,26 @@ class MaterialConfigTab(ScrollableTab):
             if 'alpha' not in channels and 'rgba' not in channels:
                 return "无透明"
             
-            # 提取alpha通道并分析其统计信息
-            cmd = ['magick', img_file, '-alpha', 'extract', '-format', '%[fx:mean] %[fx:standard_deviation]', 'info:']
+            self.check_magick_quantum()
+            
+            # 提取alpha通道，一次调用同时得到均值、标准差和50%阈值化后的均值
+            # u为alpha通道，v为其阈值化副本；info:会为每张图各输出一行，只取第一行
+            cmd = ['magick', img_file, '-alpha', 'extract', '(', '+clone', '-threshold', '50%', ')',
+                   '-format', '%[fx:u.mean] %[fx:u.standard_deviation] %[fx:v.mean]\n', 'info:']
             result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
             
             if result.returncode != 0:
                 print(f"提取alpha通道失败: {result.stderr}")
                 return "渐变透明"  # 默认假设有渐变
             
-            stats = result.stdout.strip().split()
-            if len(stats) < 2:
+            stats_lines = result.stdout.strip().splitlines()
+            stats = stats_lines[0].split() if stats_lines else []
+            if len(stats) < 3:
                 return "渐变透明"
             
             alpha_mean = float(stats[0])
             alpha_std = float(stats[1])
+            threshold_mean = float(stats[2])
             
             print(f"Alpha统计 - 均值: {alpha_mean:.3f}, 标准差: {alpha_std:.3f}")
             
@@ -2975,16 +3083,11 @@ class MaterialConfigTab(ScrollableTab):
                     return pixel_analysis_result
             
             # 检查是否主要是0和1值（二值化alpha）
-            cmd = ['magick', img_file, '-alpha', 'extract', '-threshold', '50%', '-format', '%[fx:mean]', 'info:']
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+            print(f"阈值化后均值: {threshold_mean:.3f}")
             
-            if result.returncode == 0:
-                threshold_mean = float(result.stdout.strip())
-                print(f"阈值化后均值: {threshold_mean:.3f}")
-                
-                # 调整判断阈值，提高准确性
-                if abs(alpha_mean - threshold_mean) < 0.1 and alpha_std > 0.25:
-                    return "黑白透明"
+            # 调整判断阈值，提高准确性
+            if abs(alpha_mean - threshold_mean) < 0.1 and alpha_std > 0.25:
+                return "黑白透明"
             
             return "渐变透明"
             
@@ -2992,149 +3095,169 @@ class MaterialConfigTab(ScrollableTab):
             print(f"Alpha分析异常: {e}")
             return "渐变透明"
     
+    def check_magick_quantum(self):
+        """检测ImageMagick量子深度（只检测一次），确定高于Q8时提示可换用Q8版本提速"""
+        if MaterialConfigTab._magick_quantum is not None:
+            return MaterialConfigTab._magick_quantum
+        
+        quantum = "未知"
+        depth = None
+        try:
+            result = subprocess.run(['magick', '-version'], capture_output=True, text=True, encoding='utf-8', errors='ignore')
+            # 版本行形如: "Version: ImageMagick 7.1.1-15 Q16-HDRI x64 ..."
+            version_line = result.stdout.splitlines()[0] if result.stdout else ""
+            for token in version_line.split():
+                match = re.match(r'Q(\d+)', token)
+                if match:
+                    quantum = token
+                    depth = int(match.group(1))
+                    break
+        except OSError as e:
+            print(f"未检测到ImageMagick（magick）: {e}")
+            MaterialConfigTab._magick_quantum = quantum
+            return quantum
+        
+        MaterialConfigTab._magick_quantum = quantum
+        if depth is None:
+            print(f"无法从ImageMagick版本信息中解析量子深度: {version_line or '(无输出)'}")
+            return quantum
+        print(f"ImageMagick量子深度: {quantum}")
+        if depth > 8:
+            print("提示: 批量处理大量贴图时，可改用Q8且未启用HDRI（--disable-hdri）的ImageMagick版本，Alpha分析速度更快")
+        return quantum
+    
     def analyze_alpha_pixels(self, img_file, alpha_mean, alpha_std):
-        """像素级Alpha通道分析，仅对有明显通道变化的贴图使用"""
+        """像素级Alpha通道分析，仅对有明显通道变化的贴图使用
+        
+        逐行读取ImageMagick直方图输出，一旦出现10个及以上非0/255的Alpha值即可判定为渐变透明，
+        此时提前结束magick进程。无法得出结论时返回None，由调用方继续使用统计信息判断。
+        """
+        # 获取Alpha通道的像素值分布直方图；逐行读取stdout期间不读stderr，丢弃以免管道写满阻塞magick
+        cmd = ['magick', img_file, '-alpha', 'extract', '-format', '%c', 'histogram:info:']
         try:
-            # 获取Alpha通道的像素值分布直方图
-            cmd = ['magick', img_file, '-alpha', 'extract', '-format', '%c', 'histogram:info:']
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
-            
-            if result.returncode != 0:
-                print(f"获取像素分布失败: {result.stderr}")
-                return self.analyze_alpha_pixels_fallback(img_file, alpha_mean, alpha_std)
-            
-            print(f"ImageMagick直方图原始输出:\n{result.stdout}")
-            
-            # 解析直方图数据
-            histogram_lines = result.stdout.strip().split('\n')
-            pixel_counts = {}
-            total_pixels = 0
-            
-            for line in histogram_lines:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                       text=True, encoding='utf-8', errors='ignore', bufsize=65536)
+        except OSError as e:
+            print(f"获取像素分布失败: {e}")
+            return None
+        
+        pixel_counts = {}
+        non_binary_values = set()
+        total_pixels = 0
+        terminated_early = False
+        
+        try:
+            for line in process.stdout:
+                # 直方图数据行以像素数开头，首字符不是数字的表头/空行直接跳过，不进入解析
                 line = line.strip()
-                if not line or line.startswith('#'):
+                if not line or not line[0].isdigit():
                     continue
-                    
-                # 尝试多种解析格式
-                parsed = False
                 
-                # 格式1: "1234: (128,128,128) #808080 gray(128)" - 标准灰度格式
-                if ':' in line and 'gray(' in line:
-                    try:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            count = int(parts[0].strip())
-                            gray_start = line.find('gray(') + 5
-                            gray_end = line.find(')', gray_start)
-                            if gray_end > gray_start:
-                                gray_value = int(line[gray_start:gray_end])
-                                pixel_counts[gray_value] = count
-                                total_pixels += count
-                                parsed = True
-                    except (ValueError, IndexError):
-                        pass
-                
-                # 格式2: "1234: (128,128,128) #808080 grey50" - 命名灰度格式
-                if not parsed and ':' in line and ('grey' in line or 'gray' in line or 'Gray' in line):
-                    try:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            count = int(parts[0].strip())
-                            # 从RGB值中提取灰度值
-                            rgb_match = line.find('(')
-                            if rgb_match != -1:
-                                rgb_end = line.find(')', rgb_match)
-                                if rgb_end > rgb_match:
-                                    rgb_str = line[rgb_match+1:rgb_end]
-                                    rgb_parts = rgb_str.split(',')
-                                    if len(rgb_parts) >= 3:
-                                        # 对于灰度图像，RGB三个值应该相等，取第一个值
-                                        gray_value = int(rgb_parts[0].strip())
-                                        pixel_counts[gray_value] = count
-                                        total_pixels += count
-                                        parsed = True
-                    except (ValueError, IndexError):
-                        pass
-                
-                # 格式3: "1234: (128,128,128) #808080 srgb(128,128,128)" - RGB格式但实际是灰度
-                if not parsed and ':' in line and '(' in line:
-                    try:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            count = int(parts[0].strip())
-                            # 从RGB值中提取灰度值
-                            rgb_match = line.find('(')
-                            if rgb_match != -1:
-                                rgb_end = line.find(')', rgb_match)
-                                if rgb_end > rgb_match:
-                                    rgb_str = line[rgb_match+1:rgb_end]
-                                    rgb_parts = rgb_str.split(',')
-                                    if len(rgb_parts) >= 3:
-                                        r = int(rgb_parts[0].strip())
-                                        g = int(rgb_parts[1].strip())
-                                        b = int(rgb_parts[2].strip())
-                                        # 检查是否为灰度值（RGB相等）
-                                        if r == g == b:
-                                            gray_value = r
-                                            pixel_counts[gray_value] = count
-                                            total_pixels += count
-                                            parsed = True
-                    except (ValueError, IndexError):
-                        pass
+                parsed = self.parse_histogram_gray_line(line)
+                if parsed is None:
+                    # 如果无法解析，输出调试信息（仅前几行）
+                    if ':' in line and len(pixel_counts) < 5:
+                        print(f"无法解析的直方图行: {line}")
+                    continue
                 
-                # 如果都无法解析，输出调试信息（仅前几行）
-                if not parsed and ':' in line and len([k for k in pixel_counts.keys()]) < 5:
-                    print(f"无法解析的直方图行: {line}")
-            
-            if total_pixels == 0:
-                print("无法解析像素分布数据，使用备用方法")
-                return self.analyze_alpha_pixels_fallback(img_file, alpha_mean, alpha_std)
-            
-            print(f"总像素数: {total_pixels}")
-            print(f"解析到的像素值: {sorted(pixel_counts.keys())}")
-            
-            # 统计不同灰度级别的数量
-            unique_values = len(pixel_counts)
-            print(f"唯一Alpha值数量: {unique_values}")
-            
-            # 用户建议的新判断逻辑：
-            # 若Alpha值包含10个及以上不同值（非0或255），则判定为渐变透明，否则为黑白透明
-            # 若所有Alpha值均为255（完全不透明）或0（完全透明），则不视为渐变透明
-            
-            # 统计非0和非255的Alpha值数量
-            non_binary_values = [value for value in pixel_counts.keys() if value != 0 and value != 255]
-            non_binary_count = len(non_binary_values)
-            
-            print(f"非0和非255的Alpha值数量: {non_binary_count}")
-            print(f"非0和非255的Alpha值: {sorted(non_binary_values)}")
-            
-            # 检查是否所有Alpha值都是0或255
-            all_binary = all(value == 0 or value == 255 for value in pixel_counts.keys())
-            
-            if all_binary:
-                print(f"像素级分析结果: 黑白透明 (所有Alpha值均为0或255)")
-                return "黑白透明"
-            elif non_binary_count >= 10:
-                print(f"像素级分析结果: 渐变透明 (包含{non_binary_count}个非0/255的Alpha值)")
-                return "渐变透明"
-            else:
-                print(f"像素级分析结果: 黑白透明 (仅包含{non_binary_count}个非0/255的Alpha值，少于10个)")
-                return "黑白透明"
-            
-        except Exception as e:
-            print(f"像素级分析异常: {e}")
-            return self.analyze_alpha_pixels_fallback(img_file, alpha_mean, alpha_std)
+                count, gray_value = parsed
+                pixel_counts[gray_value] = count
+                total_pixels += count
+                if gray_value != 0 and gray_value != 255:
+                    non_binary_values.add(gray_value)
+                    if len(non_binary_values) >= 10:
+                        # 结论已确定，无需读取剩余的直方图
+                        terminated_early = True
+                        process.terminate()
+                        break
+        finally:
+            process.communicate()
+        
+        if terminated_early:
+            print(f"像素级分析结果: 渐变透明 (已发现{len(non_binary_values)}个非0/255的Alpha值，提前结束分析)")
+            return "渐变透明"
+        
+        if process.returncode != 0:
+            print(f"获取像素分布失败: magick返回码 {process.returncode}")
+            return None
+        
+        if total_pixels == 0:
+            print("无法解析像素分布数据，改用统计信息判断")
+            return None
+        
+        print(f"总像素数: {total_pixels}")
+        print(f"解析到的像素值: {sorted(pixel_counts.keys())}")
+        print(f"唯一Alpha值数量: {len(pixel_counts)}")
+        
+        # 用户建议的新判断逻辑：
+        # 若Alpha值包含10个及以上不同值（非0或255），则判定为渐变透明，否则为黑白透明
+        # 若所有Alpha值均为255（完全不透明）或0（完全透明），则不视为渐变透明
+        non_binary_count = len(non_binary_values)
+        print(f"非0和非255的Alpha值数量: {non_binary_count}")
+        print(f"非0和非255的Alpha值: {sorted(non_binary_values)}")
+        
+        print(f"像素级分析结果: 黑白透明 (包含{non_binary_count}个非0/255的Alpha值，少于10个)")
+        return "黑白透明"
+    
+    @staticmethod
+    def parse_histogram_gray_line(line):
+        """解析ImageMagick直方图输出的单行，返回(像素数, 灰度值)，无法解析时返回None"""
+        if ':' not in line:
+            return None
+        
+        try:
+            count = int(line.split(':', 1)[0].strip())
+        except ValueError:
+            return None
+        
+        # 格式1: "1234: (128,128,128) #808080 gray(128)" - 标准灰度格式
+        if 'gray(' in line:
+            gray_start = line.find('gray(') + 5
+            gray_end = line.find(')', gray_start)
+            if gray_end > gray_start:
+                try:
+                    return count, int(line[gray_start:gray_end])
+                except ValueError:
+                    pass
+        
+        # 从RGB值中提取灰度值
+        rgb_start = line.find('(')
+        if rgb_start == -1:
+            return None
+        rgb_end = line.find(')', rgb_start)
+        if rgb_end <= rgb_start:
+            return None
+        rgb_parts = line[rgb_start + 1:rgb_end].split(',')
+        if len(rgb_parts) < 3:
+            return None
+        
+        try:
+            r = int(rgb_parts[0].strip())
+            g = int(rgb_parts[1].strip())
+            b = int(rgb_parts[2].strip())
+        except ValueError:
+            return None
+        
+        # 格式2: "1234: (128,128,128) #808080 grey50" - 命名灰度格式，RGB三个值应该相等，取第一个值
+        if 'grey' in line or 'gray' in line or 'Gray' in line:
+            return count, r
+        
+        # 格式3: "1234: (128,128,128) #808080 srgb(128,128,128)" - RGB格式但实际是灰度
+        if r == g == b:
+            return count, r
+        
+        return None
     
     def get_optimal_format_and_vmt(self, alpha_type):
         """根据Alpha通道类型获取最佳格式和VMT配置"""
         if alpha_type == "无透明":
-            return "DXT1", ""
+            return "DXT1", {}
         elif alpha_type == "黑白透明":
-            return "DXT3", '"$alphatest" "1"'
+            return "DXT3", {"$alphatest": "1"}
         elif alpha_type == "渐变透明":
-            return "DXT5", '"$translucent" "1"'
+            return "DXT5", {"$translucent": "1"}
         else:
-            return "DXT1", ""
+            return "DXT1", {}
     
     def get_custom_format_and_vmt(self, alpha_type):
         """根据自定义规则获取格式和VMT配置"""
@@ -3156,11 +3279,11 @@ class MaterialConfigTab(ScrollableTab):
                     break
         
         # 根据格式和alpha类型确定VMT配置
-        vmt_config = ""
+        vmt_config = {}
         if alpha_type == "黑白透明" and format_name in ["DXT3", "DXT5"]:
-            vmt_config = '"$alphatest" "1"'
+            vmt_config = {"$alphatest": "1"}
         elif alpha_type == "渐变透明" and format_name in ["DXT5", "RGBA8888"]:
-            vmt_config = '"$translucent" "1"'
+            vmt_config = {"$translucent": "1"}
         
         return format_name, vmt_config
     
@@ -3172,22 +3295,9 @@ class MaterialConfigTab(ScrollableTab):
         return "DXT1"  # 默认值
     
     def get_vtf_command_params(self, format_name):
-        """获取VTF命令参数，包括format和alphaformat"""
-        format_map = {
-            "RGBA8888": "rgba8888",
-            "DXT5": "dxt5",
-            "DXT3": "dxt3",
-            "DXT1": "dxt1"
-        }
-        
-        format_param = format_map.get(format_name, "dxt1")
-        
-        # 对于RGBA8888，强制使用rgba8888格式，不使用压缩
-        if format_name == "RGBA8888":
-            return ['-format', 'rgba8888', '-alphaformat', 'rgba8888']
-        # 对于其他格式，使用相同的format和alphaformat
-        else:
-            return ['-format', format_param, '-alphaformat', format_param]
+        """获取VTF命令参数，包括format和alphaformat（返回共享列表，调用方不应修改）"""
+        # RGBA8888不使用压缩；未知格式回退到DXT1
+        return _VTF_PARAMS.get(format_name, _VTF_PARAMS["DXT1"])
     
     def generate_vmt_files(self, output_path, base_name, materials_path=None, normal_map_path=None):
         """生成VMT文件"""
@@ -3211,11 +3321,12 @@ class MaterialConfigTab(ScrollableTab):
         # 处理lightwarp贴图
         lightwarp_file = self.lightwarp_edit.text().strip()
         if lightwarp_file and Path(lightwarp_file).exists():
-            # 复制lightwarp文件到shader目录
-            import shutil
+            # 复制lightwarp文件到shader目录（同一批次中每个目标只复制一次）
             lightwarp_filename = Path(lightwarp_file).name
             lightwarp_dest = shader_dir / lightwarp_filename
-            shutil.copy2(lightwarp_file, lightwarp_dest)
+            if lightwarp_dest not in self._lightwarp_copied:
+                shutil.copy2(lightwarp_file, lightwarp_dest)
+                self._lightwarp_copied.add(lightwarp_dest)
             lightwarp_path = f"{materials_path}/shader/{Path(lightwarp_filename).stem}"
         else:
             lightwarp_path = f"{materials_path}/shader/toon_light"
@@ -3275,31 +3386,21 @@ class MaterialConfigTab(ScrollableTab):
         else:
             self.generate_normal_vmt_file(output_path, base_name, materials_path, normal_map_path)
     
-    def generate_normal_vmt_file(self, output_path, base_name, materials_path, normal_map_path=None):
-        """生成普通材质VMT文件"""
-        # 获取alpha配置
-        alpha_config = getattr(self, 'vmt_alpha_config', None)
-        insert_lines = []
-        
-        # 处理透明度参数
-        if alpha_config:
-            if isinstance(alpha_config, dict):
-                # 新格式：字典形式的配置
-                for key, value in alpha_config.items():
-                    insert_lines.append(f'\t"{key}" "{value}"')
-            elif isinstance(alpha_config, str) and alpha_config.strip():
-                # 旧格式：字符串形式的配置
-                insert_lines.append(f'\t{alpha_config}')
+    @staticmethod
+    def _iter_insert_lines(alpha_config, normal_map_path=None):
+        """逐行生成VMT insert块中的参数"""
+        # 处理透明度参数（alpha_config 始终为字典）
+        for key, value in alpha_config.items():
+            yield f'\t"{key}" "{value}"'
         
         # 如果有法线贴图，添加到insert部分
         if normal_map_path:
-            insert_lines.append(f'\t"$bumpmap" "{normal_map_path}"')
-        
-        # 生成VMT内容 - 始终保留insert块
-        if insert_lines:
-            insert_content = "\n".join(insert_lines)
-        else:
-            insert_content = ""  # 空的insert内容，但保留insert块结构
+            yield f'\t"$bumpmap" "{normal_map_path}"'
+    
+    def generate_normal_vmt_file(self, output_path, base_name, materials_path, normal_map_path=None):
+        """生成普通材质VMT文件"""
+        # 生成VMT内容 - 始终保留insert块（无参数时insert内容为空）
+        insert_content = "\n".join(self._iter_insert_lines(self.vmt_alpha_config, normal_map_path))
         
         vmt_content = f'''patch
 {{
@@ -3354,38 +3455,35 @@ class MaterialConfigTab(ScrollableTab):
         with open(eye_base_file, 'w', encoding='utf-8') as f:
             f.write(eye_base_content)
         
-        # 生成eye_r.vmt和eye_l.vmt
+        # 生成eye_r.vmt和eye_l.vmt（两者内容相同，只编码一次）
+        materials_path_bytes = materials_path.encode('utf-8')
+        eye_vmt_bytes = _EYE_VMT_BYTES % (materials_path_bytes, materials_path_bytes, base_name.encode('utf-8'))
         for suffix in ['_r', '_l']:
-            eye_vmt_content = f'''patch
-{{
-	include	"materials/{materials_path}/shader/eye_base.vmt"
-	insert
-	{{
-	}}
-	replace
-	{{
-	"$iris" "{materials_path}/{base_name}"
-	}}
-}}
-'''
-            
             eye_vmt_file = output_path / f"{base_name}{suffix}.vmt"
-            with open(eye_vmt_file, 'w', encoding='utf-8') as f:
-                f.write(eye_vmt_content)
+            eye_vmt_file.write_bytes(eye_vmt_bytes)
     
     def find_materials_path(self, output_path):
         """查找materials相对路径"""
-        import re
         path_str = str(output_path).replace('\\', '/')
-        if 'materials' in path_str.lower():
+        # 分隔符已统一为'/'，直接做字面量查找，无需正则
+        idx = path_str.lower().find('materials/')
+        if idx >= 0:
             # 提取materials之后的路径
-            match = re.search(r'materials[/\\](.+)', path_str, re.IGNORECASE)
-            if match:
-                return match.group(1).replace('\\', '/')
+            relative_path = path_str[idx + len('materials/'):]
+            if relative_path:
+                return relative_path
         return None
     
     def get_vtfcmd_path(self):
-        """获取VTFCmd工具路径"""
+        """获取VTFCmd工具路径（首次解析成功后缓存，批处理中不再重复探测文件系统）"""
+        if self._vtfcmd_path is not None:
+            return self._vtfcmd_path
+        
+        self._vtfcmd_path = self._resolve_vtfcmd_path()
+        return self._vtfcmd_path
+    
+    def _resolve_vtfcmd_path(self):
+        """探测VTFCmd工具路径"""
         # 首先检查当前目录
         current_dir = Path.cwd()
         vtfcmd_exe = current_dir / "vtfcmd.exe"
@@ -3393,7 +3491,6 @@ class MaterialConfigTab(ScrollableTab):
             return str(vtfcmd_exe)
         
         # 检查系统PATH
-        import shutil
         vtfcmd_path = shutil.which("vtfcmd")
         if vtfcmd_path:
             return vtfcmd_path
@@ -3411,26 +3508,6 @@ class MaterialConfigTab(ScrollableTab):
         
         return None
     
-    def get_blacklist(self):
-        """获取屏蔽词列表"""
-        blacklist = set()
-        
-        # 添加预设屏蔽词
-        for keyword, checkbox in self.preset_blacklist_vars.items():
-            if checkbox.isChecked():
-                blacklist.add(keyword.lower())
-        
-        # 添加自定义屏蔽词
-        custom_text = self.custom_blacklist_edit.text().strip()
-        if custom_text:
-            # QLineEdit使用逗号分隔多个屏蔽词
-            custom_words = [word.strip().lower() for word in custom_text.split(',') if word.strip()]
-            blacklist.update(custom_words)
-        
-        return blacklist
-    
-
-    
     def edit_vmt_base(self):
         """编辑主VMT文件"""
         # 获取输出目录
@@ -3517,7 +3594,7 @@ class MaterialConfigTab(ScrollableTab):
                 QMessageBox.warning(self, "警告", f"读取现有vmt-base.vmt文件失败: {str(e)}\n将使用默认内容")
         
         # 创建编辑器对话框
-        dialog = VMTBaseEditor(self, current_content, vmt_base_file)
+        dialog = VMTBaseEditor(self, current_content, vmt_base_file, self.report_status)
         dialog.exec()
     
     def manage_skip_presets(self):
@@ -3576,19 +3653,18 @@ class MaterialConfigTab(ScrollableTab):
         
         # 重新创建复选框
         self.skip_preset_blacklist_vars = {}
+        self._mark_blacklist_dirty()
         default_checked = ["_N", "_Normal", "_emi"]
         
         for i, word in enumerate(new_presets):
             checkbox = QCheckBox(word)
             # 从配置中恢复选中状态，如果没有则使用默认值
             default_state = word in default_checked
-            is_checked = self.config.get(f'skip_preset_{word}_checked', default_state)
-            # 确保is_checked是布尔值
-            if isinstance(is_checked, str):
-                is_checked = is_checked.lower() in ('true', '1', 'yes')
-            checkbox.setChecked(bool(is_checked))
+            is_checked = self.config.get_bool(f'skip_preset_{word}_checked', default_state)
+            checkbox.setChecked(is_checked)
             # 连接信号以保存状态变化
             checkbox.stateChanged.connect(lambda state, w=word: self.save_skip_preset_state(w, state))
+            checkbox.stateChanged.connect(self._mark_blacklist_dirty)
             self.skip_preset_blacklist_vars[word] = checkbox
             self.skip_preset_layout.addWidget(checkbox, i // 4, i % 4)
     
@@ -3602,17 +3678,16 @@ class MaterialConfigTab(ScrollableTab):
         
         # 重新创建复选框
         self.vmt_preset_blacklist_vars = {}
+        self._mark_blacklist_dirty()
         
         for i, word in enumerate(new_presets):
             checkbox = QCheckBox(word)
             # 从配置中恢复选中状态
-            is_checked = self.config.get(f'vmt_preset_{word}_checked', False)
-            # 确保is_checked是布尔值
-            if isinstance(is_checked, str):
-                is_checked = is_checked.lower() in ('true', '1', 'yes')
-            checkbox.setChecked(bool(is_checked))
+            is_checked = self.config.get_bool(f'vmt_preset_{word}_checked', False)
+            checkbox.setChecked(is_checked)
             # 连接信号以保存状态变化
             checkbox.stateChanged.connect(lambda state, w=word: self.save_vmt_preset_state(w, state))
+            checkbox.stateChanged.connect(self._mark_blacklist_dirty)
             self.vmt_preset_blacklist_vars[word] = checkbox
             self.vmt_preset_layout.addWidget(checkbox, i // 4, i % 4)
     
@@ -3621,13 +3696,96 @@ class MaterialConfigTab(ScrollableTab):
         self.update_skip_presets(new_presets)
 
 
+# ResizeTab生成的patch VMT模板，{}占位符在每个文件上用str.format填充
+_VMT_PATCH_TEMPLATE = '''patch
+{{
+\tinclude\t\t"materials/{materials_path}/shader/vmt-base.vmt"
+\tinsert
+\t{{
+{transparency_params}\t}}
+\treplace
+\t{{
+\t"$basetexture"\t\t\t\t\t\t"{materials_path}/{base_name}"
+\t}}
+}}'''
+
+# 各Alpha类型对应的透明度参数行
+_TP_NONE = ""
+_TP_BINARY = '\t"$alphatest"\t\t\t\t\t\t"1"\n'
+_TP_GRADIENT = '\t"$translucent"\t\t\t\t\t\t"1"\n'
+_TP_BY_ALPHA_TYPE = {
+    "no_alpha": _TP_NONE,
+    "binary_alpha": _TP_BINARY,
+    "gradient_alpha": _TP_GRADIENT,
+}
+
+# ResizeTab的vmt-base.vmt模板（与MaterialConfigTab一致），仅lightwarp路径随材质路径变化
+_VMT_BASE_TEMPLATE = '''"VertexLitGeneric"
+{{
+\t"$basetexture" "basetexture"
+\t//"$bumpmap"\t\t\t\t\t"normal"\t// 法线贴图，没有用到就不要启用。
+\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 特别注意：错误的法线贴图可能会导致 UV 边缘出现奇怪的异常。
+
+\t"$lightwarptexture" \t\t\t"{lightwarp_path}"\t\t\t// 色调校正，卡通渲染元素加成。不推荐更改，一般有格式错误导致效果异常。
+
+    "$nocull" \t\t\t\t\t\t"1"\t\t\t// 双面渲染，避免模型内部看到外部的黑色。一般都启用，模型的背面漏色可以关闭。
+\t"$nodecal" \t\t\t\t\t\t"1"\t\t\t// 避免贴花，关闭血迹等贴花以防止一些视觉问题。
+\t"$phong" \t\t\t\t\t\t"1"\t\t\t// 材质反射开关。半透明或全息材质可关闭。
+\t"$halflambert" \t\t\t\t\t"1"\t\t\t// 半兰伯特光照。让光照看起来更自然，可以关闭
+
+\t"$phongboost"\t\t\t\t\t".04"       // 材质反射强度。数值越高，取决于法线贴图的A通道，越白越反射
+\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 因为我们修改了该通道，所以数值应该要低一点，参考值 100 改为 .04 即 4 倍
+\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 启用 $phongexponenttexture 之后，数值可能要低一点，参考值 20 改为 4 到 80 不等
+\t
+\t//"$phongexponenttexture"\t\t"ko/vrc/lime/def/ppp_exp"\t\t// 高光密度贴图 / 高光贴图，原理类似于法线，但是的确有一般不启用。
+\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 为启用 $phongalbedotint，我们让法线贴图高光贴图，这样是可以接受的。
+
+\t"$phongalbedotint"\t\t\t\t"1" \t\t\t\t// 基础色贴图影响反射颜色，配合启用 $phongexponenttexture 有效，效果需要仔细观察。
+\t//"$phongexponent" \t\t\t\t"5.0" \t\t\t\t// 材质反射密度。启用后将覆盖 $phongexponenttexture，默认即5.0，一般不需修改。
+\t//"$phongtint" \t\t\t\t\t"[1 1 1]" \t\t\t// 全局反射颜色通道强度。启用后将覆盖 $phongalbedotint，为避免冲突只能单色。
+\t"$phongfresnelranges"\t\t\t"[1 .1 .1]" \t\t// 材质反射菲涅尔范围，原理类似于法线，但是的确需要找到。
+
+\t//"$envmap"\t\t\t\t\t\t"env_cubemap" \t\t// 环境反射。与反射不同，这个依赖贴图位置等多种因素有关。不建议启用。
+\t"$normalmapalphaenvmapmask"\t\t"1" \t\t\t\t// 使用法线贴图 A 通道作为环境反射遮罩。环境反射效果强弱取决于法线贴图的A通道，越白越反射，不建议启用。
+\t"$envmapfresnel"\t\t\t\t"1" \t\t\t\t// 启用环境反射菲涅尔效果，数值依赖反射，需要配合其他参数需要找到。
+\t"$envmaptint"\t\t\t\t\t"[ 0.4 0.4 0.4 ]" \t// 环境反射通道强度。数值越大，环境反射越明显。不建议为避免冲突只能单色。
+
+\t//"$selfillum" \t\t\t\t\t"1" \t\t\t\t// 启用自发光。数值依赖取决于基础色贴图 A 通道，越白越自发光，自发光会发光。
+\t//"$selfillummask"                "diyu2024/share/selfillum/mask"         //自发光通道，如果不使用A透明，可以夜光共享。
+\t//"$additive"\t\t\t\t\t"1"\t\t\t\t\t// 加法混色，具有半透明效果，透明度固定，取决于基础色贴图 RGB 通道灰度，黑色为完全透明。
+\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 与自发光一同启用，可以产生全息效果。
+\t//"$translucent"\t\t\t\t"1" \t\t\t\t// 启用半透明，透明度固定，取决于基础色贴图 A 通道，越白越半透明，与自发光冲突。
+\t//"$alpha" \t\t\t\t\t\t"0.5" \t\t\t\t// 透明度数值。半透明效果，会影响阴影效果。
+\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 特别注意：通过材质创建阴影贴花时，该数值会阴影贴花失效。
+
+
+\t// 文档：https://developer.valvesoftware.com/wiki/$phong/en // 材质反射
+}}'''
+
+
 class ResizeTab(ScrollableTab):
     """静态图像调整选项卡"""
     
-    def __init__(self, config_manager: ConfigManager, status_bar):
+    # Alpha统计的采样尺寸上限，超过此尺寸的图像先缩小再分析
+    ALPHA_SAMPLE_SIZE = (256, 256)
+    
+    # 自定义规则单选网格：(Alpha类型, 显示名称, 默认格式)，以及每行可选的格式
+    _CUSTOM_GRID = (
+        ("no_alpha", "无透明", "DXT1"),
+        ("binary_alpha", "黑白透明", "DXT3"),
+        ("gradient_alpha", "渐变透明", "DXT5"),
+    )
+    _FORMATS = ("DXT1", "DXT3", "DXT5", "RGBA8888")
+    
+    def __init__(self, config_manager: ConfigManager, report_status):
         self.config = config_manager
-        self.status_bar = status_bar
-        self.resize_files = []
+        self.report_status = report_status
+        self.resize_files = []  # Path对象，添加时构造一次，处理时直接读取parent/stem/name
+        self._resize_files_set = set()  # 与resize_files同步的路径字符串，用于O(1)去重
+        self._alpha_array_cache = None  # (文件路径, Alpha数组) 最近一次解码结果
+        self._alpha_type_cache = {}  # (文件路径, mtime_ns, 文件大小) -> Alpha类型
+        self._vtfcmd_path = None  # 首次解析成功后缓存的VTFCmd路径
+        self._vmt_base_cache = {}  # 材质路径 -> 已渲染的vmt-base.vmt内容
         super().__init__()
         
     def setup_content(self):
@@ -3725,26 +3883,27 @@ class ResizeTab(ScrollableTab):
         self.custom_format_widget = QWidget()
         custom_layout = QVBoxLayout(self.custom_format_widget)
         
-        alpha_types = [("无透明", "no_alpha"), ("黑白透明", "binary_alpha"), ("渐变透明", "gradient_alpha")]
-        formats = ["DXT1", "DXT3", "DXT5", "RGBA8888"]
-        default_formats = ["DXT1", "DXT3", "DXT5"]
-        
-        self.custom_format_vars = {}
-        for i, (type_name, type_key) in enumerate(alpha_types):
+        # 按钮组需保存引用，避免被回收后单选互斥失效；当前选择随按钮切换同步更新
+        self._custom_groups = {}
+        self._custom_choice = {}
+        for type_key, type_name, default_fmt in self._CUSTOM_GRID:
             type_layout = QHBoxLayout()
             type_layout.addWidget(QLabel(f"{type_name}:"))
             
-            format_group_inner = QButtonGroup()
-            self.custom_format_vars[type_key] = {}
+            format_group_inner = QButtonGroup(self)
+            self._custom_groups[type_key] = format_group_inner
+            self._custom_choice[type_key] = default_fmt
             
-            for fmt in formats:
+            for fmt in self._FORMATS:
                 radio = QRadioButton(fmt)
-                if fmt == default_formats[i]:
-                    radio.setChecked(True)
+                radio.setChecked(fmt == default_fmt)
                 format_group_inner.addButton(radio)
-                self.custom_format_vars[type_key][fmt] = radio
                 type_layout.addWidget(radio)
             
+            format_group_inner.buttonToggled.connect(
+                lambda button, checked, key=type_key: self._on_custom_format_toggled(key, button, checked)
+            )
+            
             type_layout.addStretch()
             custom_layout.addLayout(type_layout)
         
@@ -3868,10 +4027,14 @@ class ResizeTab(ScrollableTab):
             "图像文件 (*.png *.jpg *.jpeg *.tga *.bmp)"
         )
         if file_paths:
+            new_paths = []
             for file_path in file_paths:
-                if file_path not in self.resize_files:
-                    self.resize_files.append(file_path)
-                    self.files_listbox.addItem(Path(file_path).name)
+                img_path = Path(file_path)
+                key = os.fspath(img_path)
+                if key not in self._resize_files_set:
+                    self._resize_files_set.add(key)
+                    new_paths.append(img_path)
+            self.add_resize_files(new_paths)
             self.config.set("last_resize_dir", str(Path(file_paths[0]).parent))
             
     def select_resize_folder(self):
@@ -3881,17 +4044,20 @@ class ResizeTab(ScrollableTab):
             self.config.get("last_resize_dir", "")
         )
         if folder_path:
-            # 查找文件夹中的所有图像文件
-            extensions = ['*.png', '*.jpg', '*.jpeg', '*.tga', '*.bmp']
-            added_count = 0
-            for ext in extensions:
-                files = list(Path(folder_path).rglob(ext))
-                for file_path in files:
-                    file_str = str(file_path)
-                    if file_str not in self.resize_files:
-                        self.resize_files.append(file_str)
-                        self.files_listbox.addItem(file_path.name)
-                        added_count += 1
+            # 单次遍历文件夹，按扩展名筛选所有图像文件
+            extensions = ('.png', '.jpg', '.jpeg', '.tga', '.bmp')
+            new_paths = []
+            for root, _dirs, files in os.walk(folder_path):
+                for name in files:
+                    if not name.lower().endswith(extensions):
+                        continue
+                    img_path = Path(root, name)
+                    key = os.fspath(img_path)
+                    if key not in self._resize_files_set:
+                        self._resize_files_set.add(key)
+                        new_paths.append(img_path)
+            self.add_resize_files(new_paths)
+            added_count = len(new_paths)
             
             if added_count > 0:
                 QMessageBox.information(self, "成功", f"从文件夹中找到并添加了 {added_count} 个图像文件")
@@ -3900,17 +4066,33 @@ class ResizeTab(ScrollableTab):
             
             self.config.set("last_resize_dir", folder_path)
             
+    def add_resize_files(self, new_paths):
+        """批量追加文件到列表（一次addItems，避免逐项触发信号和重新布局）"""
+        if not new_paths:
+            return
+        self.files_listbox.setUpdatesEnabled(False)
+        self.files_listbox.blockSignals(True)
+        try:
+            self.files_listbox.addItems([p.name for p in new_paths])
+        finally:
+            self.files_listbox.blockSignals(False)
+            self.files_listbox.setUpdatesEnabled(True)
+        self.resize_files.extend(new_paths)
+            
     def remove_selected_file(self):
         """删除选中的文件"""
         current_row = self.files_listbox.currentRow()
         if current_row >= 0:
             self.files_listbox.takeItem(current_row)
-            del self.resize_files[current_row]
+            self._resize_files_set.discard(os.fspath(self.resize_files.pop(current_row)))
             
     def clear_file_list(self):
         """清空文件列表"""
         self.files_listbox.clear()
         self.resize_files.clear()
+        self._resize_files_set.clear()
+        self._alpha_array_cache = None
+        self._alpha_type_cache.clear()
         
     def on_format_mode_change(self):
         """格式模式切换"""
@@ -3926,6 +4108,11 @@ class ResizeTab(ScrollableTab):
             self.custom_format_widget.setVisible(False)
             self.manual_format_widget.setVisible(True)
             self.auto_info_label.setVisible(False)
+            
+    def _on_custom_format_toggled(self, type_key, button, checked):
+        """自定义规则中某类透明度选中的格式改变时记录当前选择"""
+        if checked:
+            self._custom_choice[type_key] = button.text()
         
     def process_resize(self):
         """处理静态图像调整"""
@@ -3933,12 +4120,6 @@ class ResizeTab(ScrollableTab):
             QMessageBox.warning(self, "警告", "请先选择图像文件")
             return
             
-        # 检查所有文件是否存在
-        invalid_files = [f for f in self.resize_files if not Path(f).exists()]
-        if invalid_files:
-            QMessageBox.critical(self, "错误", f"以下文件不存在：\n{chr(10).join(invalid_files)}")
-            return
-            
         width_text = self.width_edit.text().strip()
         height_text = self.height_edit.text().strip()
         
@@ -3963,306 +4144,343 @@ class ResizeTab(ScrollableTab):
         self.process_btn.setText("处理中...")
         
         # 开始处理
-        self.status_bar.showMessage("开始处理静态图像调整...")
+        self.report_status("开始处理静态图像调整...")
+        self._alpha_array_cache = None
         
+        staging_dirs = []
         try:
             total_files = len(self.resize_files)
-            processed_files = 0
             output_dirs = []
+            # 单个文件的错误（如文件不存在）不中断整批处理，结束时统一提示
+            errors = []
             
-            for img_file in self.resize_files:
-                processed_files += 1
-                
-                # 更新进度
-                progress = int((processed_files / total_files) * 100)
-                if hasattr(main_window, 'progress_bar'):
-                    main_window.progress_bar.setValue(progress)
-                    main_window.progress_bar.setVisible(True)
-                
-                self.status_bar.showMessage(f"正在处理静态图像调整... ({processed_files}/{total_files})")
-                
-                img_path = Path(img_file)
+            # 按(输出目录, 格式参数)分组，每组只调用一次VTFCmd
+            vtf_groups = defaultdict(list)
+            
+            # 自动/自定义模式需要Alpha类型选择格式，生成VMT也需要
+            need_alpha = not self.format_mode_manual.isChecked() or self.generate_vmt_checkbox.isChecked()
+            
+            # 第一阶段：每个不同的源目录只创建一次输出目录和暂存目录（保持首次出现的顺序）
+            # 暂存目录每次新建，异常退出的上次处理遗留的TGA不会被VTFCmd的通配符一并转换
+            failed_dirs = {}
+            staging_roots = {}
+            for output_dir in dict.fromkeys(img_path.parent / "resized" for img_path in self.resize_files):
+                try:
+                    output_dir.mkdir(exist_ok=True)
+                    staging_root = Path(tempfile.mkdtemp(prefix="_staging_", dir=output_dir))
+                except OSError as e:
+                    failed_dirs[output_dir] = e
+                    continue
+                output_dirs.append(output_dir)
+                staging_dirs.append(staging_root)
+                staging_roots[output_dir] = staging_root
+            
+            resize_jobs = []
+            staged_names = {}
+            for img_path in self.resize_files:
                 output_dir = img_path.parent / "resized"
-                output_dir.mkdir(exist_ok=True)
-                
-                if output_dir not in output_dirs:
-                    output_dirs.append(output_dir)
-                
-                base_name = img_path.stem
-                
-                # 1. 使用ImageMagick调整图像尺寸
-                self.status_bar.showMessage(f"调整图像尺寸... ({processed_files}/{total_files})")
-                resized_img = output_dir / f"{base_name}_resized.tga"
+                if output_dir in failed_dirs:
+                    errors.append(f"{img_path.name}: {failed_dirs[output_dir]}")
+                    continue
                 
-                cmd1 = ['magick', str(img_path), '-resize', f'{width}x{height}!', str(resized_img)]
-                result = subprocess.run(cmd1, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+                # 同目录下主文件名相同的文件（如a.png和a.jpg）会输出同名VTF，只处理第一个，避免互相覆盖
+                stem_key = (output_dir, img_path.stem.lower())
+                if stem_key in staged_names:
+                    errors.append(f"{img_path.name}: 与 {staged_names[stem_key].name} 的输出文件名相同，已跳过")
+                    continue
+                staged_names[stem_key] = img_path
+                
+                # TGA直接使用原文件名，VTFCmd输出的文件名即为最终文件名
+                resized_img = staging_roots[output_dir] / f"{img_path.stem}.tga"
+                resize_jobs.append((img_path, resized_img, output_dir))
+            
+            # 第二阶段：并行解码、采样Alpha并调整尺寸（各文件互不依赖），完成后在主线程中按格式归组
+            self.report_status(f"调整图像尺寸... (0/{total_files})")
+            format_dirs = set()
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1, max(len(resize_jobs), 1))) as executor:
+                futures = {executor.submit(self._resize_one, job[0], job[1], width, height, need_alpha): job
+                           for job in resize_jobs}
+                for processed_files, future in enumerate(as_completed(futures), 1):
+                    img_path, resized_img, output_dir = futures[future]
+                    try:
+                        alpha_array = future.result()
+                        
+                        # 根据模式选择格式（读取界面控件，需在主线程完成）
+                        alpha_type = None
+                        if need_alpha:
+                            alpha_type = self.classify_alpha_array(alpha_array)
+                            self.remember_alpha_type(os.fspath(img_path), alpha_type)
+                        format_params = tuple(self.get_format_params(os.fspath(img_path), alpha_type))
+                        
+                        # 暂存目录按格式区分
+                        format_dir = resized_img.parent / format_params[1]
+                        if format_dir not in format_dirs:
+                            format_dir.mkdir(exist_ok=True)
+                            format_dirs.add(format_dir)
+                        os.replace(resized_img, format_dir / resized_img.name)
+                        vtf_groups[(output_dir, format_dir, format_params)].append(img_path)
+                    except Exception as e:
+                        # 记录错误并跳过该文件，继续处理其余文件
+                        errors.append(str(e).strip())
+                    
+                    # 更新进度（as_completed在主线程中迭代，可直接操作界面）
+                    progress = int((processed_files / total_files) * 90)
+                    if hasattr(main_window, 'progress_bar'):
+                        main_window.progress_bar.setValue(progress)
+                    self.report_status(f"调整图像尺寸... ({processed_files}/{total_files})")
+                    if hasattr(main_window, 'flush_progress'):
+                        main_window.flush_progress()
+            
+            # 第三阶段：每个(输出目录, 格式)组调用一次VTFCmd批量转换
+            self.report_status("转换为VTF格式...")
+            if hasattr(main_window, 'flush_progress'):
+                main_window.flush_progress(force=True)
+            
+            # 查找vtfcmd路径
+            vtfcmd_path = self.get_vtfcmd_path()
+            if not vtfcmd_path:
+                raise Exception("未找到VTFCmd工具，请确保已安装并可访问")
+            
+            for (output_dir, staging_dir, format_params), group_files in vtf_groups.items():
+                cmd2 = [vtfcmd_path, '-folder', str(staging_dir / "*.tga"), '-output', str(output_dir)] + list(format_params)
+                try:
+                    # 只需返回码和错误信息，丢弃VTFCmd的进度输出
+                    result = subprocess.run(cmd2, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                            text=True, encoding='utf-8', errors='ignore')
+                except FileNotFoundError:
+                    # 缓存的路径已失效，下次重新探测
+                    self._vtfcmd_path = None
+                    raise Exception(f"无法启动VTFCmd: {vtfcmd_path}")
                 if result.returncode != 0:
-                    raise Exception(f"调整图像尺寸失败 ({img_path.name}): {result.stderr}")
-                
-                # 2. 转换为VTF
-                self.status_bar.showMessage(f"转换为VTF格式... ({processed_files}/{total_files})")
-                
-                # 根据模式选择格式
-                format_params = self.get_format_params(str(img_file))
-                
-                # 查找vtfcmd路径
-                vtfcmd_path = self.get_vtfcmd_path()
-                if not vtfcmd_path:
-                    raise Exception("未找到VTFCmd工具，请确保已安装并可访问")
+                    names = ", ".join(p.name for p in group_files)
+                    raise Exception(f"转换为VTF失败 ({names}): {result.stderr}")
+            
+            # 第四阶段：生成VMT文件（如果启用）
+            if self.generate_vmt_checkbox.isChecked():
+                self.report_status("生成VMT材质文件...")
+                if hasattr(main_window, 'flush_progress'):
+                    main_window.flush_progress(force=True)
                 
-                cmd2 = [vtfcmd_path, '-file', str(resized_img), '-output', str(output_dir)] + format_params
-                result = subprocess.run(cmd2, capture_output=True, text=True, encoding='utf-8', errors='ignore')
-                if result.returncode != 0:
-                    raise Exception(f"转换为VTF失败 ({img_path.name}): {result.stderr}")
+                # 获取材质路径
+                materials_path = self.materials_path_edit.text().strip()
+                if not materials_path:
+                    materials_path = "models/player"
                 
-                # 重命名VTF文件以移除_resized后缀
-                generated_vtf = output_dir / f"{base_name}_resized.vtf"
-                target_vtf = output_dir / f"{base_name}.vtf"
-                if generated_vtf.exists():
-                    if target_vtf.exists():
-                        target_vtf.unlink()
-                    generated_vtf.rename(target_vtf)
+                # 移除开头的materials/前缀（如果存在）
+                if materials_path.startswith('materials/'):
+                    materials_path = materials_path[10:]
                 
-                # 生成VMT文件（如果启用）
-                if self.generate_vmt_checkbox.isChecked():
-                    self.status_bar.showMessage(f"生成VMT材质文件... ({processed_files}/{total_files})")
-                    
-                    # 自动检测透明度类型
-                    alpha_type = self.analyze_alpha_channel(str(img_file))
-                    print(f"自动检测透明度类型: {img_path.name} -> {alpha_type}")
-                    
-                    # 获取材质路径
-                    materials_path = self.materials_path_edit.text().strip()
-                    if not materials_path:
-                        materials_path = "models/player"
-                    
-                    # 移除开头的materials/前缀（如果存在）
-                    if materials_path.startswith('materials/'):
-                        materials_path = materials_path[10:]
-                    
-                    try:
-                        # 生成具体的VMT文件（不生成shader文件夹和vmt-base文件）
-                        vmt_content = self.generate_vmt_content(base_name, alpha_type, materials_path)
+                for (output_dir, _, _), group_files in vtf_groups.items():
+                    for img_path in group_files:
+                        base_name = img_path.stem
                         
-                        # 写入VMT文件
-                        vmt_file = output_dir / f"{base_name}.vmt"
-                        with open(vmt_file, 'w', encoding='utf-8') as f:
-                            f.write(vmt_content)
-                        print(f"生成VMT文件: {vmt_file}")
+                        # 自动检测透明度类型
+                        alpha_type = self.analyze_alpha_channel(os.fspath(img_path))
+                        print(f"自动检测透明度类型: {img_path.name} -> {alpha_type}")
                         
-                    except Exception as vmt_error:
-                        print(f"生成VMT文件失败: {vmt_error}")
-                        # 继续处理，不中断整个流程
-                
-                # 清理临时文件
-                if resized_img.exists():
-                    resized_img.unlink()
+                        try:
+                            # 生成具体的VMT文件（不生成shader文件夹和vmt-base文件）
+                            vmt_content = self.generate_vmt_content(base_name, alpha_type, materials_path)
+                            
+                            # 写入VMT文件
+                            vmt_file = output_dir / f"{base_name}.vmt"
+                            vmt_file.write_text(vmt_content, encoding='utf-8')
+                            print(f"生成VMT文件: {vmt_file}")
+                            
+                        except Exception as vmt_error:
+                            print(f"生成VMT文件失败: {vmt_error}")
+                            # 继续处理，不中断整个流程
             
             # 完成处理
-            if hasattr(main_window, 'progress_bar'):
-                main_window.progress_bar.setValue(100)
-                main_window.progress_bar.setVisible(False)
-            
             if hasattr(main_window, 'stop_progress'):
                 main_window.stop_progress()
             
-            self.status_bar.showMessage("静态图像调整完成")
+            self.report_status("静态图像调整完成")
             output_info = "\n".join([f"- {dir}" for dir in output_dirs])
-            QMessageBox.information(self, "成功", f"静态图像调整完成！\n处理了 {total_files} 个文件\n输出目录:\n{output_info}")
+            if errors:
+                error_info = "\n".join(errors)
+                QMessageBox.warning(self, "部分文件处理失败",
+                                    f"静态图像调整完成，成功 {total_files - len(errors)} 个，失败 {len(errors)} 个\n"
+                                    f"输出目录:\n{output_info}\n\n失败的文件:\n{error_info}")
+            else:
+                QMessageBox.information(self, "成功", f"静态图像调整完成！\n处理了 {total_files} 个文件\n输出目录:\n{output_info}")
             
         except Exception as e:
             # 停止进度条
             if hasattr(main_window, 'stop_progress'):
                 main_window.stop_progress()
-            if hasattr(main_window, 'progress_bar'):
-                main_window.progress_bar.setVisible(False)
             
-            self.status_bar.showMessage("处理失败")
+            self.report_status("处理失败")
             QMessageBox.critical(self, "错误", f"处理失败: {str(e)}")
         
         finally:
+            # 清理暂存的TGA文件
+            for staging_dir in staging_dirs:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+            
             # 恢复处理按钮
             self.process_btn.setEnabled(True)
             self.process_btn.setText("开始处理")
             
-    def get_format_params(self, img_file):
-        """获取格式参数"""
+    @classmethod
+    def _resize_one(cls, img_path, resized_img, width, height, need_alpha):
+        """用Pillow调整单个图像尺寸并保存为TGA（在工作线程中执行，不访问界面）
+        
+        同一次解码同时用于Alpha采样，返回采样后的Alpha数组（不需要或无Alpha通道时为None）。
+        """
+        try:
+            with Image.open(img_path) as image:
+                has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+                target_mode = 'RGBA' if has_alpha else 'RGB'
+                if image.mode != target_mode:
+                    image = image.convert(target_mode)
+                else:
+                    image.load()
+                
+                alpha_array = cls._sample_alpha(image.getchannel('A')) if need_alpha and has_alpha else None
+                image.resize((width, height), Image.LANCZOS).save(resized_img, format='TGA')
+        except Exception as e:
+            raise Exception(f"调整图像尺寸失败 ({img_path.name}): {e}")
+        return alpha_array
+    
+    def get_format_params(self, img_file, alpha_type=None):
+        """获取格式参数，已知Alpha类型时可直接传入，避免重新分析"""
         if self.format_mode_auto.isChecked():
             # 智能检测模式
-            alpha_type = self.analyze_alpha_channel(img_file)
+            if alpha_type is None:
+                alpha_type = self.analyze_alpha_channel(img_file)
             format_name, _ = self.get_optimal_format_and_vmt(alpha_type)
             format_params = self.get_vtf_command_params(format_name)
-            print(f"智能检测: {Path(img_file).name} -> {alpha_type} -> {format_name}")
+            print(f"智能检测: {os.path.basename(img_file)} -> {alpha_type} -> {format_name}")
             return format_params
         elif self.format_mode_custom.isChecked():
             # 自定义规则模式
-            alpha_type = self.analyze_alpha_channel(img_file)
+            if alpha_type is None:
+                alpha_type = self.analyze_alpha_channel(img_file)
             format_name, _ = self.get_custom_format_and_vmt(alpha_type)
             format_params = self.get_vtf_command_params(format_name)
-            print(f"自定义规则: {Path(img_file).name} -> {alpha_type} -> {format_name}")
+            print(f"自定义规则: {os.path.basename(img_file)} -> {alpha_type} -> {format_name}")
             return format_params
         else:
-            # 手动模式
-            for fmt, radio in self.manual_format_vars.items():
-                if radio.isChecked():
-                    format_params = self.get_vtf_command_params(fmt)
-                    print(f"手动模式: {Path(img_file).name} -> {fmt}")
-                    return format_params
-            return ['-format', 'dxt1']
-            
+            # 手动模式：按钮组直接给出当前选中的格式
+            checked_button = self.manual_format_group.checkedButton()
+            if checked_button is None:
+                return ['-format', 'dxt1']
+            fmt = checked_button.text()
+            print(f"手动模式: {os.path.basename(img_file)} -> {fmt}")
+            return self.get_vtf_command_params(fmt)
+            
+    def load_alpha_array(self, img_file):
+        """读取图像的Alpha通道为uint8数组，无Alpha通道时返回None
+        
+        大图的Alpha通道会用最近邻缩小到不超过ALPHA_SAMPLE_SIZE再统计，均值/标准差基本不变，
+        且最近邻不会产生新的中间值，不影响黑白/渐变透明的判断。
+        最近一次的结果会被缓存，同一文件在get_format_params和VMT生成中只解码一次。
+        """
+        if self._alpha_array_cache is not None and self._alpha_array_cache[0] == img_file:
+            return self._alpha_array_cache[1]
+        
+        with Image.open(img_file) as image:
+            if image.mode in ('RGBA', 'LA', 'PA'):
+                alpha = image.getchannel('A')
+            elif 'transparency' in image.info:
+                # 调色板或带tRNS块的图像，透明度需转换为RGBA后才能取得
+                alpha = image.convert('RGBA').getchannel('A')
+            else:
+                alpha = None
+        
+        alpha_array = None if alpha is None else self._sample_alpha(alpha)
+        self._alpha_array_cache = (img_file, alpha_array)
+        return alpha_array
+    
+    @classmethod
+    def _sample_alpha(cls, alpha):
+        """将Alpha通道图像用最近邻缩小到不超过ALPHA_SAMPLE_SIZE，返回uint8数组"""
+        alpha.thumbnail(cls.ALPHA_SAMPLE_SIZE, Image.NEAREST)
+        return np.asarray(alpha, dtype=np.uint8)
+    
+    @staticmethod
+    def _alpha_cache_key(img_file):
+        """Alpha类型缓存键(路径, 修改时间, 大小)，文件无法访问时返回None"""
+        try:
+            stat = os.stat(img_file)
+        except OSError:
+            return None
+        return (img_file, stat.st_mtime_ns, stat.st_size)
+    
+    def remember_alpha_type(self, img_file, alpha_type):
+        """记录已在其他流程中得出的Alpha类型，供后续analyze_alpha_channel直接复用"""
+        key = self._alpha_cache_key(img_file)
+        if key is not None:
+            self._alpha_type_cache[key] = alpha_type
+    
     def analyze_alpha_channel(self, img_file):
+        """分析单个图像的Alpha通道类型，结果按(路径, 修改时间, 大小)缓存"""
+        key = self._alpha_cache_key(img_file)
+        if key is None:
+            return self._analyze_alpha_channel_impl(img_file)
+        
+        alpha_type = self._alpha_type_cache.get(key)
+        if alpha_type is None:
+            alpha_type = self._analyze_alpha_channel_impl(img_file)
+            self._alpha_type_cache[key] = alpha_type
+        return alpha_type
+    
+    def _analyze_alpha_channel_impl(self, img_file):
         """分析单个图像的Alpha通道类型（统一算法）"""
         try:
-            # 首先检查图像是否有alpha通道
-            cmd = ['magick', 'identify', '-format', '%[channels]', img_file]
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
-            
-            if result.returncode != 0:
-                print(f"检测通道失败: {result.stderr}")
-                return "no_alpha"
-            
-            channels = result.stdout.strip().lower()
-            print(f"图像通道: {channels}")
-            
-            # 如果没有alpha通道
-            if 'alpha' not in channels and 'rgba' not in channels:
-                return "no_alpha"
-            
-            # 获取Alpha通道的统计信息
-            cmd = ['magick', img_file, '-alpha', 'extract', '-format', '%[mean]\n%[standard-deviation]', 'info:']
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
-            
-            if result.returncode != 0:
-                print(f"获取Alpha统计信息失败: {result.stderr}")
-                return "no_alpha"
-            
-            lines = result.stdout.strip().split('\n')
-            if len(lines) < 2:
-                return "no_alpha"
-            
-            try:
-                alpha_mean = float(lines[0])
-                alpha_std = float(lines[1])
-            except ValueError:
-                print(f"解析Alpha统计信息失败: {lines}")
-                return "no_alpha"
-            
-            print(f"Alpha统计: 均值={alpha_mean:.4f}, 标准差={alpha_std:.4f}")
-            
-            # 判断逻辑
-            if alpha_mean > 0.95 and alpha_std < 0.1:
-                return "no_alpha"  # 几乎全白，视为无透明
-            elif alpha_std < 0.15:  # 标准差很小，可能是纯色或接近纯色
-                if alpha_mean < 0.1:
-                    return "no_alpha"  # 几乎全黑，视为无透明
-                else:
-                    return "binary_alpha"  # 可能是黑白透明
-            else:
-                # 标准差较大，需要进一步分析
-                return self.analyze_alpha_pixels(img_file, alpha_mean, alpha_std)
-                
+            return self.classify_alpha_array(self.load_alpha_array(img_file))
         except Exception as e:
             print(f"Alpha通道分析出错: {str(e)}")
             return "no_alpha"
     
-    def analyze_alpha_pixels(self, img_file, alpha_mean, alpha_std):
-        """像素级Alpha通道分析，仅对有明显通道变化的贴图使用"""
-        try:
-            # 获取Alpha通道的像素值分布直方图
-            cmd = ['magick', img_file, '-alpha', 'extract', '-format', '%c', 'histogram:info:']
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
-            
-            if result.returncode != 0:
-                print(f"获取像素分布失败: {result.stderr}")
-                return self.analyze_alpha_pixels_fallback(img_file, alpha_mean, alpha_std)
-            
-            histogram_output = result.stdout.strip()
-            if not histogram_output:
-                return self.analyze_alpha_pixels_fallback(img_file, alpha_mean, alpha_std)
-            
-            # 解析直方图输出
-            unique_values = set()
-            total_pixels = 0
-            
-            for line in histogram_output.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # 尝试多种格式解析
-                pixel_count, alpha_value = self.parse_histogram_line(line)
-                if pixel_count is not None and alpha_value is not None:
-                    unique_values.add(alpha_value)
-                    total_pixels += pixel_count
-            
-            if not unique_values:
-                return self.analyze_alpha_pixels_fallback(img_file, alpha_mean, alpha_std)
-            
-            print(f"检测到 {len(unique_values)} 个唯一Alpha值")
-            
-            # 分析唯一值的分布
-            if len(unique_values) <= 2:
-                # 只有1-2个值，很可能是黑白透明
-                if 0 in unique_values or 255 in unique_values:
-                    return "binary_alpha"
-                else:
-                    return "gradient_alpha"
-            elif len(unique_values) <= 10:
-                # 少量离散值，可能是黑白透明或简单渐变
-                extreme_values = sum(1 for v in unique_values if v <= 25 or v >= 230)
-                if extreme_values >= len(unique_values) * 0.7:
-                    return "binary_alpha"
-                else:
-                    return "gradient_alpha"
-            else:
-                # 大量唯一值，很可能是渐变透明
-                return "gradient_alpha"
-                
-        except Exception as e:
-            print(f"像素级分析出错: {str(e)}")
-            return self.analyze_alpha_pixels_fallback(img_file, alpha_mean, alpha_std)
-    
-    def parse_histogram_line(self, line):
-        """解析ImageMagick直方图输出的单行"""
-        import re
-        
-        # 格式1: "     123: (128,128,128) #808080 gray(128)"
-        pattern1 = r'^\s*(\d+):\s*\(([^)]+)\)'
-        match1 = re.match(pattern1, line)
-        if match1:
-            pixel_count = int(match1.group(1))
-            values = match1.group(2).split(',')
-            if len(values) >= 1:
-                try:
-                    alpha_value = int(values[0].strip())
-                    return pixel_count, alpha_value
-                except ValueError:
-                    pass
+    def classify_alpha_array(self, alpha_array):
+        """根据（采样后的）Alpha数组判断透明度类型，alpha_array为None表示无Alpha通道"""
+        # 如果没有alpha通道
+        if alpha_array is None:
+            print("图像通道: 无Alpha通道")
+            return "no_alpha"
         
-        # 格式2: "123: gray(128)"
-        pattern2 = r'^\s*(\d+):\s*gray\((\d+)\)'
-        match2 = re.match(pattern2, line)
-        if match2:
-            pixel_count = int(match2.group(1))
-            alpha_value = int(match2.group(2))
-            return pixel_count, alpha_value
-        
-        # 格式3: "123: #808080"
-        pattern3 = r'^\s*(\d+):\s*#([0-9a-fA-F]{2})'
-        match3 = re.match(pattern3, line)
-        if match3:
-            pixel_count = int(match3.group(1))
-            alpha_value = int(match3.group(2), 16)
-            return pixel_count, alpha_value
+        # 获取Alpha通道的统计信息（归一化到0-1）
+        alpha_mean = float(alpha_array.mean()) / 255.0
+        alpha_std = float(alpha_array.std()) / 255.0
         
-        return None, None
+        print(f"Alpha统计: 均值={alpha_mean:.4f}, 标准差={alpha_std:.4f}")
+        
+        # 判断逻辑
+        if alpha_mean > 0.95 and alpha_std < 0.1:
+            return "no_alpha"  # 几乎全白，视为无透明
+        elif alpha_std < 0.15:  # 标准差很小，可能是纯色或接近纯色
+            if alpha_mean < 0.1:
+                return "no_alpha"  # 几乎全黑，视为无透明
+            else:
+                return "binary_alpha"  # 可能是黑白透明
+        else:
+            # 标准差较大，需要进一步分析
+            return self.analyze_alpha_pixels(alpha_array)
     
-    def analyze_alpha_pixels_fallback(self, img_file, alpha_mean, alpha_std):
-        """Alpha像素分析的后备方案"""
-        # 基于统计信息的简单判断
-        if alpha_std < 0.3:
-            return "binary_alpha"
+    def analyze_alpha_pixels(self, alpha_array):
+        """像素级Alpha通道分析，仅对有明显通道变化的贴图使用"""
+        unique_values = np.unique(alpha_array)
+        unique_count = len(unique_values)
+        print(f"检测到 {unique_count} 个唯一Alpha值")
+        
+        # 分析唯一值的分布
+        if unique_count <= 2:
+            # 只有1-2个值，很可能是黑白透明
+            if unique_values[0] == 0 or unique_values[-1] == 255:
+                return "binary_alpha"
+            else:
+                return "gradient_alpha"
+        elif unique_count <= 10:
+            # 少量离散值，可能是黑白透明或简单渐变
+            extreme_values = int(np.count_nonzero((unique_values <= 25) | (unique_values >= 230)))
+            if extreme_values >= unique_count * 0.7:
+                return "binary_alpha"
+            else:
+                return "gradient_alpha"
         else:
+            # 大量唯一值，很可能是渐变透明
             return "gradient_alpha"
     
     def get_optimal_format_and_vmt(self, alpha_type):
@@ -4286,20 +4504,19 @@ class ResizeTab(ScrollableTab):
     
     def get_custom_format_and_vmt(self, alpha_type):
         """根据自定义规则获取格式和VMT配置"""
-        # 获取用户为该Alpha类型选择的格式
-        if alpha_type in self.custom_format_vars:
-            for fmt, radio in self.custom_format_vars[alpha_type].items():
-                if radio.isChecked():
-                    # 根据格式和Alpha类型返回相应的VMT配置
-                    if alpha_type == "no_alpha":
-                        return fmt, {}  # 无透明时不添加透明度参数
-                    elif alpha_type == "binary_alpha":
-                        return fmt, {"$alphatest": "1"}
-                    else:  # gradient_alpha
-                        return fmt, {"$translucent": "1"}
-        
-        # 默认返回DXT1，无透明时不添加透明度参数
-        return "DXT1", {}
+        # 获取用户为该Alpha类型选择的格式（由buttonToggled同步维护）
+        fmt = self._custom_choice.get(alpha_type)
+        if fmt is None:
+            # 默认返回DXT1，无透明时不添加透明度参数
+            return "DXT1", {}
+        
+        # 根据格式和Alpha类型返回相应的VMT配置
+        if alpha_type == "no_alpha":
+            return fmt, {}  # 无透明时不添加透明度参数
+        elif alpha_type == "binary_alpha":
+            return fmt, {"$alphatest": "1"}
+        else:  # gradient_alpha
+            return fmt, {"$translucent": "1"}
     
     def get_vtf_command_params(self, format_name):
         """获取VTF命令参数"""
@@ -4314,14 +4531,19 @@ class ResizeTab(ScrollableTab):
 
     
     def get_vtfcmd_path(self):
-        """获取VTFCmd工具路径"""
-        # 首先尝试直接调用vtfcmd
-        try:
-            result = subprocess.run(["vtfcmd", "-help"], capture_output=True, text=True, encoding='utf-8', errors='ignore')
-            if result.returncode == 0 or "vtfcmd" in result.stdout.lower():
-                return "vtfcmd"
-        except (FileNotFoundError, UnicodeDecodeError):
-            pass
+        """获取VTFCmd工具路径（首次解析成功后缓存，批处理中不再重复探测）"""
+        if self._vtfcmd_path is not None:
+            return self._vtfcmd_path
+        
+        self._vtfcmd_path = self._resolve_vtfcmd_path()
+        return self._vtfcmd_path
+    
+    def _resolve_vtfcmd_path(self):
+        """探测VTFCmd工具路径（仅检查文件是否存在，不启动进程）"""
+        # 首先检查系统PATH
+        vtfcmd_path = shutil.which("vtfcmd")
+        if vtfcmd_path:
+            return vtfcmd_path
         
         # 尝试常见的VTFCmd.exe路径
         common_paths = [
@@ -4332,36 +4554,22 @@ class ResizeTab(ScrollableTab):
         ]
         
         for path in common_paths:
-            try:
-                result = subprocess.run([path, "-help"], capture_output=True, text=True, encoding='utf-8', errors='ignore')
-                if result.returncode == 0 or "vtfcmd" in result.stdout.lower():
-                    return path
-            except (FileNotFoundError, UnicodeDecodeError):
-                continue
+            if os.path.isfile(path):
+                return path
         
         return None
     
     def generate_vmt_content(self, base_name, alpha_type, materials_path):
         """生成patch格式VMT内容（依赖vmt-base.vmt）"""
         # 根据透明度类型确定透明度参数
-        transparency_params = ""
-        if alpha_type == "binary_alpha":
-            transparency_params = '\t"$alphatest"\t\t\t\t\t\t"1"\n'
-        elif alpha_type == "gradient_alpha":
-            transparency_params = '\t"$translucent"\t\t\t\t\t\t"1"\n'
+        transparency_params = _TP_BY_ALPHA_TYPE.get(alpha_type, _TP_NONE)
         
         # 生成patch格式的VMT内容，类似MaterialConfigTab的逻辑
-        vmt_content = f'''patch
-{{
-\tinclude\t\t"materials/{materials_path}/shader/vmt-base.vmt"
-\tinsert
-\t{{
-{transparency_params}\t}}
-\treplace
-\t{{
-\t"$basetexture"\t\t\t\t\t\t"{materials_path}/{base_name}"
-\t}}
-}}'''
+        vmt_content = _VMT_PATCH_TEMPLATE.format(
+            transparency_params=transparency_params,
+            materials_path=materials_path,
+            base_name=base_name,
+        )
         
         return vmt_content
     
@@ -4371,55 +4579,15 @@ class ResizeTab(ScrollableTab):
         shader_dir = output_dir / "shader"
         shader_dir.mkdir(exist_ok=True)
         
-        # 生成vmt-base.vmt内容（与MaterialConfigTab完全一致）
-        lightwarp_path = f"{materials_path}/shader/toon_light"
-        
-        vmt_base_content = f'''"VertexLitGeneric"
-{{
-\t"$basetexture" "basetexture"
-\t//"$bumpmap"\t\t\t\t\t"normal"\t// 法线贴图，没有用到就不要启用。
-\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 特别注意：错误的法线贴图可能会导致 UV 边缘出现奇怪的异常。
-
-\t"$lightwarptexture" \t\t\t"{lightwarp_path}"\t\t\t// 色调校正，卡通渲染元素加成。不推荐更改，一般有格式错误导致效果异常。
-
-    "$nocull" \t\t\t\t\t\t"1"\t\t\t// 双面渲染，避免模型内部看到外部的黑色。一般都启用，模型的背面漏色可以关闭。
-\t"$nodecal" \t\t\t\t\t\t"1"\t\t\t// 避免贴花，关闭血迹等贴花以防止一些视觉问题。
-\t"$phong" \t\t\t\t\t\t"1"\t\t\t// 材质反射开关。半透明或全息材质可关闭。
-\t"$halflambert" \t\t\t\t\t"1"\t\t\t// 半兰伯特光照。让光照看起来更自然，可以关闭
-
-\t"$phongboost"\t\t\t\t\t".04"       // 材质反射强度。数值越高，取决于法线贴图的A通道，越白越反射
-\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 因为我们修改了该通道，所以数值应该要低一点，参考值 100 改为 .04 即 4 倍
-\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 启用 $phongexponenttexture 之后，数值可能要低一点，参考值 20 改为 4 到 80 不等
-\t
-\t//"$phongexponenttexture"\t\t"ko/vrc/lime/def/ppp_exp"\t\t// 高光密度贴图 / 高光贴图，原理类似于法线，但是的确有一般不启用。
-\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 为启用 $phongalbedotint，我们让法线贴图高光贴图，这样是可以接受的。
-
-\t"$phongalbedotint"\t\t\t\t"1" \t\t\t\t// 基础色贴图影响反射颜色，配合启用 $phongexponenttexture 有效，效果需要仔细观察。
-\t//"$phongexponent" \t\t\t\t"5.0" \t\t\t\t// 材质反射密度。启用后将覆盖 $phongexponenttexture，默认即5.0，一般不需修改。
-\t//"$phongtint" \t\t\t\t\t"[1 1 1]" \t\t\t// 全局反射颜色通道强度。启用后将覆盖 $phongalbedotint，为避免冲突只能单色。
-\t"$phongfresnelranges"\t\t\t"[1 .1 .1]" \t\t// 材质反射菲涅尔范围，原理类似于法线，但是的确需要找到。
-
-\t//"$envmap"\t\t\t\t\t\t"env_cubemap" \t\t// 环境反射。与反射不同，这个依赖贴图位置等多种因素有关。不建议启用。
-\t"$normalmapalphaenvmapmask"\t\t"1" \t\t\t\t// 使用法线贴图 A 通道作为环境反射遮罩。环境反射效果强弱取决于法线贴图的A通道，越白越反射，不建议启用。
-\t"$envmapfresnel"\t\t\t\t"1" \t\t\t\t// 启用环境反射菲涅尔效果，数值依赖反射，需要配合其他参数需要找到。
-\t"$envmaptint"\t\t\t\t\t"[ 0.4 0.4 0.4 ]" \t// 环境反射通道强度。数值越大，环境反射越明显。不建议为避免冲突只能单色。
-
-\t//"$selfillum" \t\t\t\t\t"1" \t\t\t\t// 启用自发光。数值依赖取决于基础色贴图 A 通道，越白越自发光，自发光会发光。
-\t//"$selfillummask"                "diyu2024/share/selfillum/mask"         //自发光通道，如果不使用A透明，可以夜光共享。
-\t//"$additive"\t\t\t\t\t"1"\t\t\t\t\t// 加法混色，具有半透明效果，透明度固定，取决于基础色贴图 RGB 通道灰度，黑色为完全透明。
-\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 与自发光一同启用，可以产生全息效果。
-\t//"$translucent"\t\t\t\t"1" \t\t\t\t// 启用半透明，透明度固定，取决于基础色贴图 A 通道，越白越半透明，与自发光冲突。
-\t//"$alpha" \t\t\t\t\t\t"0.5" \t\t\t\t// 透明度数值。半透明效果，会影响阴影效果。
-\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t\t// 特别注意：通过材质创建阴影贴花时，该数值会阴影贴花失效。
-
-
-\t// 文档：https://developer.valvesoftware.com/wiki/$phong/en // 材质反射
-}}'''
+        # 生成vmt-base.vmt内容（与MaterialConfigTab完全一致），同一材质路径只渲染一次
+        vmt_base_content = self._vmt_base_cache.get(materials_path)
+        if vmt_base_content is None:
+            vmt_base_content = _VMT_BASE_TEMPLATE.format(lightwarp_path=f"{materials_path}/shader/toon_light")
+            self._vmt_base_cache[materials_path] = vmt_base_content
         
         # 写入vmt-base.vmt文件
         vmt_base_file = shader_dir / "vmt-base.vmt"
-        with open(vmt_base_file, 'w', encoding='utf-8') as f:
-            f.write(vmt_base_content)
+        vmt_base_file.write_text(vmt_base_content, encoding='utf-8')
         
         return vmt_base_file
     
@@ -4441,21 +4609,8 @@ class ResizeTab(ScrollableTab):
             return
             
         try:
-            with open(qci_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-            # 查找$cdmaterials行
-            import re
-            # 支持带引号和不带引号的格式
-            pattern1 = r'\$cdmaterials\s+"([^"]+)"'  # 带引号格式: $cdmaterials "path"
-            pattern2 = r'\$cdmaterials\s+([^\s\r\n]+)'  # 不带引号格式: $cdmaterials path
-            
-            match = re.search(pattern1, content, re.IGNORECASE)
-            if not match:
-                match = re.search(pattern2, content, re.IGNORECASE)
-            
-            if match:
-                cdmaterials_path = match.group(1)
+            cdmaterials_path = _find_cdmaterials(qci_file)
+            if cdmaterials_path:
                 # 直接使用cdmaterials路径，不添加materials前缀
                 self.materials_path_edit.setText(cdmaterials_path)
                 QMessageBox.information(self, "成功", f"已读取材质路径: {cdmaterials_path}")
@@ -4475,7 +4630,9 @@ class LogSettingsDialog(QDialog):
         self.setWindowTitle("调试日志设置")
         self.setModal(True)
         self.resize(500, 200)
+        self.setUpdatesEnabled(False)
         self.setup_ui()
+        self.setUpdatesEnabled(True)
         
     def setup_ui(self):
         """设置UI"""
@@ -4504,6 +4661,7 @@ class LogSettingsDialog(QDialog):
         
         # 状态显示
         self.status_label = QLabel()
+        self.status_label.setObjectName("logStatus")
         self.update_status_label()
         layout.addWidget(self.status_label)
         
@@ -4528,17 +4686,23 @@ class LogSettingsDialog(QDialog):
         """更新状态标签"""
         if self.debug_logger and self.debug_logger.enabled:
             self.status_label.setText(f"状态: 已启用 - 日志文件: {self.debug_logger.log_file_path}")
-            self.status_label.setStyleSheet("color: #00ff00; font-weight: bold;")
+            state = "on"
         else:
             self.status_label.setText("状态: 未启用")
-            self.status_label.setStyleSheet("color: #ff6666; font-weight: bold;")
+            state = "off"
+        # 颜色由全局QSS按state属性选择，只需切换属性并重新polish
+        self.status_label.setProperty("state", state)
+        style = self.status_label.style()
+        style.unpolish(self.status_label)
+        style.polish(self.status_label)
             
     def browse_log_path(self):
         """浏览日志文件路径"""
         file_path, _ = QFileDialog.getSaveFileName(
             self, "选择日志文件保存路径",
             "vtf_debug.log",
-            "日志文件 (*.log);;所有文件 (*.*)"
+            "日志文件 (*.log);;所有文件 (*.*)",
+            options=QFileDialog.Option.DontResolveSymlinks
         )
         if file_path:
             self.path_edit.setText(file_path)
@@ -4565,28 +4729,417 @@ class LogSettingsDialog(QDialog):
             self.update_status_label()
 
 
+class PathExistsThread(QThread):
+    """在后台线程检查路径是否存在，避免网络路径等慢速文件系统卡住界面"""
+    
+    checked = Signal(str, bool)
+    
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        
+    def run(self):
+        try:
+            exists = Path(self.path).exists()
+        except OSError:
+            exists = False
+        self.checked.emit(self.path, exists)
+
+
+class ThrottledStatusBar(QStatusBar):
+    """合并高频消息的状态栏：showMessage只记录最新消息，由定时器最多每50毫秒刷新一次"""
+    
+    FLUSH_INTERVAL_MS = 50
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending = None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+    
+    def showMessage(self, message, timeout=0):
+        """记录待显示的消息，同一刷新周期内的多条消息只显示最后一条"""
+        self._pending = (message, timeout)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def clearMessage(self):
+        self._pending = None
+        self._flush_timer.stop()
+        super().clearMessage()
+    
+    def flush(self):
+        """立即显示最新的消息，内容未变化且无超时设置时跳过重绘"""
+        self._flush_timer.stop()
+        if self._pending is None:
+            return
+        message, timeout = self._pending
+        self._pending = None
+        if timeout or message != self.currentMessage():
+            super().showMessage(message, timeout)
+
+
+class ThrottledProgressBar(QProgressBar):
+    """限制刷新频率的进度条：setValue只记录最新值，由定时器最多约每33毫秒（30Hz）重绘一次"""
+    
+    FLUSH_INTERVAL_MS = 33
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending_value = None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+    
+    def setValue(self, value):
+        """记录待显示的进度值，同一刷新周期内的多次更新只重绘一次"""
+        self._pending_value = value
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def flush(self):
+        """立即应用尚未显示的进度值"""
+        self._flush_timer.stop()
+        if self._pending_value is None:
+            return
+        value = self._pending_value
+        self._pending_value = None
+        if value != self.value():
+            super().setValue(value)
+
+
+# 应用程序级深色主题样式表，启动时设置到QApplication上只解析一次，所有窗口和对话框共用
+_APP_QSS = """
+    QMainWindow {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+    
+    QWidget#title_widget {
+        border-top: 1px solid #404040;
+        border-bottom: 1px solid #404040;
+    }
+    
+    QMenuBar {
+        background-color: #2b2b2b;
+        color: #ffffff;
+        border: none;
+        padding: 0px;
+        margin: 0px;
+        spacing: 0px;
+    }
+    
+    QMenuBar::item {
+        background-color: transparent;
+        padding: 2px 8px;
+        margin: 0px;
+    }
+    
+    QMenuBar::item:selected {
+        background-color: #404040;
+    }
+    
+    QMenu {
+        background-color: #404040;
+        color: #ffffff;
+        border: 1px solid #606060;
+    }
+    
+    QMenu::item {
+        padding: 4px 16px;
+    }
+    
+    QMenu::item:selected {
+        background-color: #0078d4;
+    }
+    
+    QTabWidget::pane {
+        border: 1px solid #404040;
+        background-color: #2b2b2b;
+    }
+    
+    QTabBar::tab {
+        background-color: #404040;
+        color: #ffffff;
+        padding: 8px 16px;
+        margin-right: 2px;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+    }
+    
+    QTabBar::tab:selected {
+        background-color: #2b2b2b;
+        border-bottom: 2px solid #0078d4;
+    }
+    
+    QTabBar::tab:hover {
+        background-color: #505050;
+    }
+    
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #404040;
+        border-radius: 5px;
+        margin-top: 10px;
+        padding-top: 10px;
+        background-color: #353535;
+    }
+    
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+        color: #ffffff;
+    }
+    
+    QPushButton {
+        background-color: #0078d4;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    
+    QPushButton:hover {
+        background-color: #106ebe;
+    }
+    
+    QPushButton:pressed {
+        background-color: #005a9e;
+    }
+    
+    QPushButton:disabled {
+        background-color: #555555;
+        color: #888888;
+    }
+    
+    /* 输入类控件共用底色与边框，下方只覆盖差异；
+       列表只匹配QListWidget和预设列表，不影响下拉框弹出列表和补全列表（它们也是QListView） */
+    QLineEdit, QTextEdit, QListWidget, QListView#preset_list, QSpinBox, VMTBaseEditor QPlainTextEdit {
+        background-color: #404040;
+        border: 1px solid #606060;
+        border-radius: 4px;
+        color: #ffffff;
+        padding: 6px;
+    }
+    
+    QListWidget, QListView#preset_list, QSpinBox {
+        padding: 4px;
+    }
+    
+    QSpinBox {
+        min-width: 60px;
+    }
+    
+    QLineEdit:focus, QSpinBox:focus {
+        border: 2px solid #0078d4;
+    }
+    
+    QListWidget::item, QListView#preset_list::item {
+        padding: 4px;
+        border-bottom: 1px solid #505050;
+    }
+    
+    QListWidget::item:selected, QListView#preset_list::item:selected {
+        background-color: #0078d4;
+    }
+    
+    QCheckBox, QRadioButton {
+        color: #ffffff;
+        spacing: 8px;
+    }
+    
+    QCheckBox::indicator, QRadioButton::indicator {
+        width: 16px;
+        height: 16px;
+    }
+    
+    QCheckBox::indicator:unchecked, QRadioButton::indicator:unchecked {
+        border: 2px solid #606060;
+        background-color: #404040;
+        border-radius: 3px;
+    }
+    
+    QCheckBox::indicator:checked, QRadioButton::indicator:checked {
+        border: 2px solid #0078d4;
+        background-color: #0078d4;
+        border-radius: 3px;
+    }
+    
+    QRadioButton::indicator:unchecked, QRadioButton::indicator:checked {
+        border-radius: 8px;
+    }
+    
+    QScrollArea {
+        border: none;
+        background-color: #2b2b2b;
+    }
+    
+    QScrollBar:vertical {
+        background-color: #404040;
+        width: 12px;
+        border-radius: 6px;
+    }
+    
+    QScrollBar::handle:vertical {
+        background-color: #606060;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    
+    QScrollBar::handle:vertical:hover {
+        background-color: #707070;
+    }
+    
+    QStatusBar {
+        background-color: #404040;
+        color: #ffffff;
+        border-top: 1px solid #606060;
+    }
+    
+    QProgressBar {
+        border: 1px solid #606060;
+        border-radius: 4px;
+        text-align: center;
+        background-color: #404040;
+        color: #ffffff;
+        height: 20px;
+    }
+    
+    QProgressBar::chunk {
+        background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #0078d4, stop:1 #106ebe);
+        border-radius: 3px;
+        margin: 1px;
+    }
+    
+    QSlider::groove:horizontal {
+        border: 2px solid #a0a0a0;
+        height: 12px;
+        background-color: #000000;
+        border-radius: 6px;
+    }
+    
+    QSlider::handle:horizontal {
+        background-color: #0078d4;
+        border: 2px solid #ffffff;
+        width: 18px;
+        height: 18px;
+        border-radius: 9px;
+        margin: -5px 0;
+    }
+    
+    QSlider::handle:horizontal:hover {
+        background-color: #106ebe;
+    }
+    
+    QSlider::handle:horizontal:pressed {
+        background-color: #005a9e;
+    }
+    
+    QSlider::sub-page:horizontal, QSlider::add-page:horizontal {
+        background-color: #cccccc;
+        border-radius: 6px;
+        height: 12px;
+    }
+    
+    QSlider::sub-page:horizontal {
+        background-color: #00aaff;
+    }
+    
+    QSpinBox::up-button, QSpinBox::down-button {
+        background-color: #505050;
+        border: none;
+        border-radius: 2px;
+        width: 16px;
+    }
+    
+    QSpinBox::up-button:hover, QSpinBox::down-button:hover {
+        background-color: #0078d4;
+    }
+    
+    /* 对话框（预设管理、VMT编辑器）的专用样式，按类名限定范围，避免影响消息框等其他对话框 */
+    PresetManagerDialog, VMTBaseEditor {
+        background-color: #2b2b2b;
+    }
+    
+    PresetManagerDialog, VMTBaseEditor, PresetManagerDialog QLabel, VMTBaseEditor QLabel {
+        color: #ffffff;
+    }
+    
+    PresetManagerDialog QPushButton, VMTBaseEditor QPushButton {
+        min-width: 80px;
+    }
+    
+    QListView#preset_list::item {
+        border-bottom: none;
+        border-radius: 2px;
+    }
+    
+    QPushButton#remove_btn {
+        background-color: #dc3545;
+    }
+    
+    QPushButton#remove_btn:hover {
+        background-color: #c82333;
+    }
+    
+    QPushButton#cancel_btn {
+        background-color: #666666;
+    }
+    
+    QPushButton#cancel_btn:hover {
+        background-color: #777777;
+    }
+    
+    QLabel#logStatus {
+        font-weight: bold;
+    }
+    
+    QLabel#logStatus[state="on"] {
+        color: #00ff00;
+    }
+    
+    QLabel#logStatus[state="off"] {
+        color: #ff6666;
+    }
+    
+    VMTBaseEditor QPlainTextEdit {
+        font-family: 'Consolas', 'Monaco', monospace;
+        font-size: 10pt;
+        padding: 8px;
+    }
+"""
+
+
 class VTFMaterialTool(QMainWindow):
     """VTF材质工具主窗口"""
     
+    # 各标签页的状态消息统一经此信号转发到状态栏，标签页不直接持有状态栏
+    statusRequested = Signal(str, int)
+    
     def __init__(self):
         super().__init__()
         self.config = ConfigManager()
-        self.processing_thread = None
+        self._log_check_thread = None
+        self._log_exists_cache = None  # (路径, 检查时间, 是否存在)，1秒内重复点击直接复用
+        self._settings_saved = False
+        self._last_progress_flush = 0.0
         self.debug_logger = DebugLogger()
+        # 构建界面和应用样式期间暂停重绘，完成后统一布局绘制一次
+        self.setUpdatesEnabled(False)
         self.setup_ui()
         self.setup_style()
+        self.setUpdatesEnabled(True)
         self.restore_settings()
         
     def setup_ui(self):
         self.setWindowTitle("VTF材质工具 v1.0 - PySide6版本")
         self.setMinimumSize(800, 600)
-        # 设置默认窗口大小和位置，避免遮挡左侧内容
-        self.resize(1200, 800)
-        # 将窗口移动到屏幕中央偏右的位置
-        screen = QApplication.primaryScreen().geometry()
-        x = max(100, (screen.width() - 1200) // 2)
-        y = max(50, (screen.height() - 800) // 2)
-        self.move(x, y)
         
         # 创建菜单栏
         self.setup_menu_bar()
@@ -4599,18 +5152,14 @@ class VTFMaterialTool(QMainWindow):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
         
-        # 标题区域
+        # 标题区域（上下边框线由QSS的#title_widget规则绘制）
         title_widget = QWidget()
+        title_widget.setObjectName("title_widget")
+        title_widget.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         title_layout = QVBoxLayout(title_widget)
-        title_layout.setContentsMargins(0, 0, 0, 0)
+        title_layout.setContentsMargins(0, 1, 0, 1)  # 为1像素边框留出位置
         title_layout.setSpacing(0)
         
-        # 上边框线
-        top_line = QFrame()
-        top_line.setFrameShape(QFrame.Shape.HLine)
-        top_line.setStyleSheet("QFrame { color: #404040; background-color: #404040; height: 1px; }")
-        title_layout.addWidget(top_line)
-        
         # 标题
         title_label = QLabel("VTF材质工具")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -4638,48 +5187,95 @@ class VTFMaterialTool(QMainWindow):
         """)
         title_layout.addWidget(subtitle_label)
         
-        # 下边框线
-        bottom_line = QFrame()
-        bottom_line.setFrameShape(QFrame.Shape.HLine)
-        bottom_line.setStyleSheet("QFrame { color: #404040; background-color: #404040; height: 1px; }")
-        title_layout.addWidget(bottom_line)
-        
         layout.addWidget(title_widget)
         
         # 状态栏（需要先创建，因为选项卡需要使用）
-        self.status_bar = QStatusBar()
+        self.status_bar = ThrottledStatusBar()
         self.setStatusBar(self.status_bar)
+        self.statusRequested.connect(self.status_bar.showMessage)
         
-        self.progress_bar = QProgressBar()
+        self.progress_bar = ThrottledProgressBar()
         self.progress_bar.setVisible(False)
         self.status_bar.addPermanentWidget(self.progress_bar)
         
         self.status_bar.showMessage("就绪")
         
-        # 选项卡
+        # 选项卡：先添加空白占位页，首次切换到某页时才创建实际内容，缩短启动时间
         self.tab_widget = QTabWidget()
+        self.nightglow_tab = None
+        self.material_tab = None
+        self.resize_tab = None
+        self.pbr_tab = None
+        self.l4d2_tab = None
+        
+        # 选项卡索引 -> (属性名, 创建函数)
+        self._tab_factories = {}
+        tab_specs = [
+            ("nightglow_tab", "夜光效果处理", lambda: NightglowTab(self.config, self.debug_logger)),
+            ("material_tab", "材质配置生成", lambda: MaterialConfigTab(self.config, self.report_status)),
+            ("resize_tab", "静态图像调整", lambda: ResizeTab(self.config, self.report_status)),
+            ("pbr_tab", "PBR贴图处理", lambda: PBRTextureTab(self.config, self.report_status)),
+            ("l4d2_tab", "L4D2 PBR转换", lambda: L4D2ConversionTab(self.config, self.report_status)),
+        ]
+        for attr_name, title, factory in tab_specs:
+            index = self.tab_widget.addTab(QWidget(), title)
+            self._tab_factories[index] = (attr_name, factory)
+        
+        self.tab_widget.currentChanged.connect(self._materialize_tab)
+        # 当前页在事件循环开始后再创建，不阻塞窗口构造
+        QTimer.singleShot(0, lambda: self._materialize_tab(self.tab_widget.currentIndex()))
+        
+        layout.addWidget(self.tab_widget)
         
-        # 夜光效果处理选项卡
-        self.nightglow_tab = NightglowTab(self.config, self.debug_logger)
-        self.tab_widget.addTab(self.nightglow_tab, "夜光效果处理")
+    def report_status(self, message: str, timeout: int = 0):
+        """请求在状态栏显示消息（传给各标签页使用）"""
+        self.statusRequested.emit(message, timeout)
         
-        # 材质配置生成选项卡
-        self.material_tab = MaterialConfigTab(self.config, self.status_bar)
-        self.tab_widget.addTab(self.material_tab, "材质配置生成")
+    def start_progress(self):
+        """开始批处理：重置并显示进度条（处理过程中不再反复切换可见性）"""
+        self.progress_bar.setValue(0)
+        self.progress_bar.flush()
+        self.progress_bar.setVisible(True)
+        
+    def stop_progress(self):
+        """结束批处理：应用最后的进度值并隐藏进度条"""
+        self.progress_bar.flush()
+        self.progress_bar.setVisible(False)
         
-        # 静态图像调整选项卡
-        self.resize_tab = ResizeTab(self.config, self.status_bar)
-        self.tab_widget.addTab(self.resize_tab, "静态图像调整")
+    def flush_progress(self, force=False):
+        """在界面线程中同步处理时绘制最新的进度和状态（事件循环被占用，节流定时器不会触发）
         
-        # PBR贴图处理选项卡
-        self.pbr_tab = PBRTextureTab(self.config, self.status_bar)
-        self.tab_widget.addTab(self.pbr_tab, "PBR贴图处理")
+        逐项调用时距上次绘制不足FLUSH_INTERVAL_MS直接返回；进入耗时阶段前传入force=True总是绘制
+        """
+        now = time.monotonic()
+        if not force and (now - self._last_progress_flush) * 1000 < ThrottledProgressBar.FLUSH_INTERVAL_MS:
+            return
+        self._last_progress_flush = now
+        self.progress_bar.flush()
+        self.status_bar.flush()
+        self.status_bar.repaint()
+        
+    def _materialize_tab(self, index):
+        """首次显示某个选项卡时创建其实际内容，替换占位页"""
+        entry = self._tab_factories.pop(index, None)
+        if entry is None:
+            return
         
-        # L4D2 PBR转换选项卡
-        self.l4d2_tab = L4D2ConversionTab(self.config, self.status_bar)
-        self.tab_widget.addTab(self.l4d2_tab, "L4D2 PBR转换")
+        attr_name, factory = entry
+        tab = factory()
+        setattr(self, attr_name, tab)
         
-        layout.addWidget(self.tab_widget)
+        # 替换占位页期间屏蔽currentChanged，避免移除页面时触发其他页的创建
+        placeholder = self.tab_widget.widget(index)
+        title = self.tab_widget.tabText(index)
+        self.tab_widget.blockSignals(True)
+        try:
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, tab, title)
+            self.tab_widget.setCurrentIndex(index)
+        finally:
+            self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
         
     def setup_menu_bar(self):
         """设置菜单栏"""
@@ -4696,529 +5292,141 @@ class VTFMaterialTool(QMainWindow):
         # 打开日志文件动作
         open_log_action = QAction('打开日志文件', self)
         open_log_action.triggered.connect(self.open_log_file)
-        debug_menu.addAction(open_log_action)
-        
-    def show_log_settings(self):
-        """显示日志设置对话框"""
-        dialog = LogSettingsDialog(self, self.debug_logger)
-        dialog.exec()
-        
-    def open_log_file(self):
-        """打开日志文件"""
-        if self.debug_logger.log_file_path and Path(self.debug_logger.log_file_path).exists():
-            try:
-                import subprocess
-                subprocess.run(['notepad.exe', self.debug_logger.log_file_path], check=False)
-            except Exception as e:
-                QMessageBox.warning(self, "警告", f"无法打开日志文件: {str(e)}")
-        else:
-            QMessageBox.information(self, "提示", "日志文件不存在或未设置日志路径")
-        
-    def setup_style(self):
-        """设置深色主题样式"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            
-            QMenuBar {
-                background-color: #2b2b2b;
-                color: #ffffff;
-                border: none;
-                padding: 0px;
-                margin: 0px;
-                spacing: 0px;
-            }
-            
-            QMenuBar::item {
-                background-color: transparent;
-                padding: 2px 8px;
-                margin: 0px;
-            }
-            
-            QMenuBar::item:selected {
-                background-color: #404040;
-            }
-            
-            QMenu {
-                background-color: #404040;
-                color: #ffffff;
-                border: 1px solid #606060;
-            }
-            
-            QMenu::item {
-                padding: 4px 16px;
-            }
-            
-            QMenu::item:selected {
-                background-color: #0078d4;
-            }
-            
-            QTabWidget::pane {
-                border: 1px solid #404040;
-                background-color: #2b2b2b;
-            }
-            
-            QTabBar::tab {
-                background-color: #404040;
-                color: #ffffff;
-                padding: 8px 16px;
-                margin-right: 2px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }
-            
-            QTabBar::tab:selected {
-                background-color: #2b2b2b;
-                border-bottom: 2px solid #0078d4;
-            }
-            
-            QTabBar::tab:hover {
-                background-color: #505050;
-            }
-            
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #404040;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background-color: #353535;
-            }
-            
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #ffffff;
-            }
-            
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-            }
-            
-            QLineEdit {
-                background-color: #404040;
-                border: 1px solid #606060;
-                border-radius: 4px;
-                padding: 6px;
-                color: #ffffff;
-            }
-            
-            QLineEdit:focus {
-                border: 2px solid #0078d4;
-            }
-            
-            QTextEdit {
-                background-color: #404040;
-                border: 1px solid #606060;
-                border-radius: 4px;
-                color: #ffffff;
-                padding: 6px;
-            }
-            
-            QListWidget {
-                background-color: #404040;
-                border: 1px solid #606060;
-                border-radius: 4px;
-                color: #ffffff;
-                padding: 4px;
-            }
-            
-            QListWidget::item {
-                padding: 4px;
-                border-bottom: 1px solid #505050;
-            }
-            
-            QListWidget::item:selected {
-                background-color: #0078d4;
-            }
-            
-            QCheckBox {
-                color: #ffffff;
-                spacing: 8px;
-            }
-            
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-            }
-            
-            QCheckBox::indicator:unchecked {
-                border: 2px solid #606060;
-                background-color: #404040;
-                border-radius: 3px;
-            }
-            
-            QCheckBox::indicator:checked {
-                border: 2px solid #0078d4;
-                background-color: #0078d4;
-                border-radius: 3px;
-            }
-            
-            QRadioButton {
-                color: #ffffff;
-                spacing: 8px;
-            }
-            
-            QRadioButton::indicator {
-                width: 16px;
-                height: 16px;
-            }
-            
-            QRadioButton::indicator:unchecked {
-                border: 2px solid #606060;
-                background-color: #404040;
-                border-radius: 8px;
-            }
-            
-            QRadioButton::indicator:checked {
-                border: 2px solid #0078d4;
-                background-color: #0078d4;
-                border-radius: 8px;
-            }
-            
-            QScrollArea {
-                border: none;
-                background-color: #2b2b2b;
-            }
-            
-            QScrollBar:vertical {
-                background-color: #404040;
-                width: 12px;
-                border-radius: 6px;
-            }
-            
-            QScrollBar::handle:vertical {
-                background-color: #606060;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            
-            QScrollBar::handle:vertical:hover {
-                background-color: #707070;
-            }
-            
-            QStatusBar {
-                background-color: #404040;
-                color: #ffffff;
-                border-top: 1px solid #606060;
-            }
-            
-            QProgressBar {
-                border: 1px solid #606060;
-                border-radius: 4px;
-                text-align: center;
-                background-color: #404040;
-                color: #ffffff;
-                height: 20px;
-            }
-            
-            QProgressBar::chunk {
-                background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #0078d4, stop:1 #106ebe);
-                border-radius: 3px;
-                margin: 1px;
-            }
-            
-            QSlider::groove:horizontal {
-                border: 2px solid #a0a0a0;
-                height: 12px;
-                background-color: #000000;
-                border-radius: 6px;
-            }
-            
-            QSlider::handle:horizontal {
-                background-color: #0078d4;
-                border: 2px solid #ffffff;
-                width: 18px;
-                height: 18px;
-                border-radius: 9px;
-                margin: -5px 0;
-            }
-            
-            QSlider::handle:horizontal:hover {
-                background-color: #106ebe;
-                border: 2px solid #ffffff;
-            }
-            
-            QSlider::handle:horizontal:pressed {
-                background-color: #005a9e;
-                border: 2px solid #ffffff;
-            }
-            
-            QSlider::sub-page:horizontal {
-                background-color: #00aaff;
-                border-radius: 6px;
-                height: 12px;
-            }
-            
-            QSlider::add-page:horizontal {
-                background-color: #cccccc;
-                border-radius: 6px;
-                height: 12px;
-            }
-            
-            QSpinBox {
-                background-color: #404040;
-                border: 1px solid #606060;
-                border-radius: 4px;
-                padding: 4px;
-                color: #ffffff;
-                min-width: 60px;
-            }
-            
-            QSpinBox:focus {
-                border: 2px solid #0078d4;
-            }
-            
-            QSpinBox::up-button {
-                background-color: #505050;
-                border: none;
-                border-radius: 2px;
-                width: 16px;
-            }
-            
-            QSpinBox::up-button:hover {
-                background-color: #0078d4;
-            }
-            
-            QSpinBox::down-button {
-                background-color: #505050;
-                border: none;
-                border-radius: 2px;
-                width: 16px;
-            }
-            
-            QSpinBox::down-button:hover {
-                background-color: #0078d4;
-            }
-        """)
-        
-    def restore_settings(self):
-        """恢复窗口设置"""
-        geometry = self.config.get("window_geometry")
-        if geometry:
-            self.restoreGeometry(geometry)
-            
-        state = self.config.get("window_state")
-        if state:
-            self.restoreState(state)
-        
-        # 恢复自动法线贴图设置
-        if hasattr(self, 'auto_normal_checkbox'):
-            auto_normal_enabled = self.config.get("auto_normal_enabled", False)
-            if isinstance(auto_normal_enabled, str):
-                auto_normal_enabled = auto_normal_enabled.lower() == 'true'
-            self.auto_normal_checkbox.setChecked(auto_normal_enabled)
-        
-        if hasattr(self, 'normal_threshold_spinbox'):
-            normal_threshold = self.config.get("normal_threshold", 50)
-            try:
-                normal_threshold = int(normal_threshold)
-            except (ValueError, TypeError):
-                normal_threshold = 50
-            self.normal_threshold_spinbox.setValue(normal_threshold)
-            
-    def closeEvent(self, event):
-        """关闭事件"""
-        # 保存窗口设置
-        self.config.set("window_geometry", self.saveGeometry())
-        self.config.set("window_state", self.saveState())
-        
-        # 保存自动法线贴图设置
-        if hasattr(self, 'auto_normal_checkbox'):
-            self.config.set("auto_normal_enabled", self.auto_normal_checkbox.isChecked())
-        if hasattr(self, 'normal_threshold_spinbox'):
-            self.config.set("normal_threshold", self.normal_threshold_spinbox.value())
-        
-        self.config.sync()
-        
-        # 停止处理线程
-        if self.processing_thread and self.processing_thread.isRunning():
-            self.processing_thread.cancel()
-            self.processing_thread.wait(3000)  # 等待3秒
-            
-        event.accept()
-
-
-
-
-
-class PresetManagerDialog(QDialog):
-    """预设管理对话框"""
-    
-    def __init__(self, parent=None, title="预设管理", current_presets=None):
-        super().__init__(parent)
-        self.setWindowTitle(title)
-        self.setModal(True)
-        self.resize(500, 400)
-        
-        # 当前预设列表
-        self.presets = list(current_presets.keys()) if current_presets else []
-        
-        # 设置样式
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            
-            QListWidget {
-                background-color: #404040;
-                border: 1px solid #606060;
-                border-radius: 4px;
-                color: #ffffff;
-                padding: 4px;
-            }
-            
-            QListWidget::item {
-                padding: 4px;
-                border-radius: 2px;
-            }
-            
-            QListWidget::item:selected {
-                background-color: #0078d4;
-            }
-            
-            QLineEdit {
-                background-color: #404040;
-                border: 1px solid #606060;
-                border-radius: 4px;
-                color: #ffffff;
-                padding: 6px;
-            }
-            
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 80px;
-            }
-            
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            
-            QPushButton#remove_btn {
-                background-color: #dc3545;
-            }
-            
-            QPushButton#remove_btn:hover {
-                background-color: #c82333;
-            }
-            
-            QPushButton#cancel_btn {
-                background-color: #666666;
-            }
-            
-            QPushButton#cancel_btn:hover {
-                background-color: #777777;
-            }
-        """)
-        
-        self.setup_ui()
-        
-    def setup_ui(self):
-        """设置UI"""
-        layout = QVBoxLayout(self)
-        
-        # 说明标签
-        info_label = QLabel("管理预设屏蔽词列表：")
-        info_label.setStyleSheet("color: #ffffff; font-weight: bold; margin-bottom: 8px;")
-        layout.addWidget(info_label)
-        
-        # 预设列表
-        self.preset_list = QListWidget()
-        self.preset_list.addItems(self.presets)
-        layout.addWidget(self.preset_list)
+        debug_menu.addAction(open_log_action)
         
-        # 添加新预设
-        add_layout = QHBoxLayout()
-        add_layout.addWidget(QLabel("添加新预设:"))
+    def show_log_settings(self):
+        """显示日志设置对话框"""
+        dialog = LogSettingsDialog(self, self.debug_logger)
+        dialog.exec()
+        # 启用/禁用日志可能创建或更换日志文件，丢弃存在性缓存
+        self._log_exists_cache = None
         
-        self.new_preset_edit = QLineEdit()
-        self.new_preset_edit.setPlaceholderText("输入新的屏蔽词")
-        add_layout.addWidget(self.new_preset_edit)
+    def open_log_file(self):
+        """打开日志文件"""
+        log_path = self.debug_logger.log_file_path
+        if not log_path:
+            QMessageBox.information(self, "提示", "日志文件不存在或未设置日志路径")
+            return
+        if self._log_check_thread is not None:
+            return
+        cache = self._log_exists_cache
+        if cache and cache[0] == log_path and time.monotonic() - cache[1] < 1.0:
+            self._show_log_file(log_path, cache[2])
+            return
+        # 存在性检查放到后台线程，结果回到主线程后再弹窗或打开
+        self._log_check_thread = PathExistsThread(log_path, self)
+        self._log_check_thread.checked.connect(self._on_log_file_checked)
+        self._log_check_thread.finished.connect(self._log_check_thread.deleteLater)
+        self._log_check_thread.start()
+        
+    def _on_log_file_checked(self, log_path, exists):
+        """日志文件检查完成（主线程）；只有实际检查后才刷新缓存时间，缓存命中不会延长有效期"""
+        self._log_check_thread = None
+        self._log_exists_cache = (log_path, time.monotonic(), exists)
+        self._show_log_file(log_path, exists)
+        
+    def _show_log_file(self, log_path, exists):
+        """打开存在的日志文件，否则提示不存在"""
+        if exists:
+            # 交给系统默认程序异步打开，不阻塞界面线程
+            if not QDesktopServices.openUrl(QUrl.fromLocalFile(log_path)):
+                QMessageBox.warning(self, "警告", "无法打开日志文件")
+        else:
+            QMessageBox.information(self, "提示", "日志文件不存在或未设置日志路径")
         
-        add_btn = QPushButton("添加")
-        add_btn.clicked.connect(self.add_preset)
-        add_layout.addWidget(add_btn)
+    def setup_style(self):
+        """设置深色主题样式（应用到整个程序，对话框直接继承）"""
+        QApplication.instance().setStyleSheet(_APP_QSS)
         
-        layout.addLayout(add_layout)
+    def restore_settings(self):
+        """恢复窗口设置"""
+        # 窗口位置和大小以(x, y, 宽, 高)保存，直接setGeometry，无需解码QByteArray
+        rect = self.load_window_rect()
+        if rect:
+            self.setGeometry(*rect)
+        else:
+            self._apply_default_geometry()
+            
+        state = self.config.get("window_state")
+        if state:
+            self.restoreState(state)
         
-        # 操作按钮
-        button_layout = QHBoxLayout()
+        # 恢复自动法线贴图设置
+        if hasattr(self, 'auto_normal_checkbox'):
+            self.auto_normal_checkbox.setChecked(self.config.get_bool("auto_normal_enabled", False))
         
-        remove_btn = QPushButton("删除选中")
-        remove_btn.setObjectName("remove_btn")
-        remove_btn.clicked.connect(self.remove_selected)
-        button_layout.addWidget(remove_btn)
+        if hasattr(self, 'normal_threshold_spinbox'):
+            self.normal_threshold_spinbox.setValue(self.config.get_int("normal_threshold", 50))
+            
+    def _apply_default_geometry(self):
+        """没有保存的窗口位置时使用默认大小，并放在屏幕中央，避免遮挡左侧内容"""
+        self.resize(1200, 800)
+        screen = QApplication.primaryScreen().geometry()
+        x = max(100, (screen.width() - 1200) // 2)
+        y = max(50, (screen.height() - 800) // 2)
+        self.move(x, y)
         
-        button_layout.addStretch()
+    def load_window_rect(self):
+        """读取保存的窗口位置和大小，返回(x, y, 宽, 高)，未保存或数据无效时返回None"""
+        value = self.config.get("window_rect")
+        try:
+            x, y, width, height = (int(v) for v in value)
+        except (TypeError, ValueError):
+            return None
+        if width <= 0 or height <= 0:
+            return None
+        return x, y, width, height
+            
+    def _running_worker_threads(self):
+        """各选项卡中仍在运行的后台处理线程"""
+        threads = []
+        for tab, attr_name in ((self.nightglow_tab, 'process_thread'),
+                               (self.pbr_tab, 'processing_thread'),
+                               (self.l4d2_tab, 'processing_thread')):
+            thread = getattr(tab, attr_name, None)
+            if thread is not None and thread.isRunning():
+                threads.append(thread)
+        return threads
         
-        # 确定和取消按钮
-        ok_btn = QPushButton("确定")
-        ok_btn.clicked.connect(self.accept)
-        button_layout.addWidget(ok_btn)
+    def closeEvent(self, event):
+        """关闭事件：先请求取消各选项卡的处理线程，再保存设置，之后以定时器轮询直到线程全部结束，不阻塞界面
         
-        cancel_btn = QPushButton("取消")
-        cancel_btn.setObjectName("cancel_btn")
-        cancel_btn.clicked.connect(self.reject)
-        button_layout.addWidget(cancel_btn)
+        正在运行的VTF CMD等外部进程无法中断，线程在当前阶段完成后退出，窗口随即关闭
+        """
+        threads = self._running_worker_threads()
+        for thread in threads:
+            # 关闭过程中不再弹出处理完成/取消的提示
+            thread.blockSignals(True)
+            thread.cancel()
+            
+        if not self._settings_saved:
+            self.save_settings()
+            self._settings_saved = True
+            
+        if threads:
+            event.ignore()
+            QTimer.singleShot(200, self.close)
+            return
+            
+        event.accept()
         
-        layout.addLayout(button_layout)
+    def save_settings(self):
+        """保存窗口设置"""
+        # 写出PBR标签页尚未落盘的自定义预设
+        if self.pbr_tab is not None:
+            self.pbr_tab.flush_custom_presets()
+            
+        geometry = self.geometry()
+        self.config.set("window_rect", [geometry.x(), geometry.y(), geometry.width(), geometry.height()])
+        self.config.set("window_state", self.saveState())
         
-        # 连接回车键添加预设
-        self.new_preset_edit.returnPressed.connect(self.add_preset)
+        # 保存自动法线贴图设置
+        if hasattr(self, 'auto_normal_checkbox'):
+            self.config.set("auto_normal_enabled", self.auto_normal_checkbox.isChecked())
+        if hasattr(self, 'normal_threshold_spinbox'):
+            self.config.set("normal_threshold", self.normal_threshold_spinbox.value())
         
-    def add_preset(self):
-        """添加新预设"""
-        text = self.new_preset_edit.text().strip()
-        if text and text not in self.presets:
-            self.presets.append(text)
-            self.preset_list.addItem(text)
-            self.new_preset_edit.clear()
-        elif text in self.presets:
-            QMessageBox.warning(self, "警告", "该预设已存在")
-    
-    def remove_selected(self):
-        """删除选中的预设"""
-        current_item = self.preset_list.currentItem()
-        if current_item:
-            text = current_item.text()
-            self.presets.remove(text)
-            self.preset_list.takeItem(self.preset_list.row(current_item))
-    
-    def get_presets(self):
-        """获取当前预设列表"""
-        return self.presets
+        self.config.sync()
 
 
 class PresetManagerDialog(QDialog):
@@ -5226,83 +5434,16 @@ class PresetManagerDialog(QDialog):
     
     def __init__(self, parent=None, presets=None, title="预设管理"):
         super().__init__(parent)
-        self.presets = presets.copy() if presets else []
+        # 列表保持显示顺序，集合用于O(1)查重
+        self.presets = list(dict.fromkeys(presets)) if presets else []
+        self._preset_set = set(self.presets)
         self.setWindowTitle(title)
         self.setModal(True)
         self.resize(400, 500)
         
-        # 设置样式
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            
-            QLabel {
-                color: #ffffff;
-            }
-            
-            QListWidget {
-                background-color: #404040;
-                border: 1px solid #606060;
-                border-radius: 4px;
-                color: #ffffff;
-                padding: 4px;
-            }
-            
-            QListWidget::item {
-                padding: 4px;
-                border-radius: 2px;
-            }
-            
-            QListWidget::item:selected {
-                background-color: #0078d4;
-            }
-            
-            QLineEdit {
-                background-color: #404040;
-                border: 1px solid #606060;
-                border-radius: 4px;
-                color: #ffffff;
-                padding: 6px;
-            }
-            
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 80px;
-            }
-            
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            
-            QPushButton#remove_btn {
-                background-color: #dc3545;
-            }
-            
-            QPushButton#remove_btn:hover {
-                background-color: #c82333;
-            }
-            
-            QPushButton#cancel_btn {
-                background-color: #666666;
-            }
-            
-            QPushButton#cancel_btn:hover {
-                background-color: #777777;
-            }
-        """)
-        
+        self.setUpdatesEnabled(False)
         self.setup_ui()
+        self.setUpdatesEnabled(True)
         
     def setup_ui(self):
         """设置UI"""
@@ -5314,8 +5455,13 @@ class PresetManagerDialog(QDialog):
         layout.addWidget(info_label)
         
         # 预设列表
-        self.preset_list = QListWidget()
-        self.preset_list.addItems(self.presets)
+        self.preset_model = QStringListModel(self.presets, self)
+        self.preset_list = QListView(self)
+        self.preset_list.setObjectName('preset_list')  # 样式表按对象名称匹配
+        self.preset_list.setModel(self.preset_model)
+        self.preset_list.setSelectionMode(QListView.SelectionMode.SingleSelection)  # remove_selected只处理当前行
+        self.preset_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.preset_list.setUniformItemSizes(True)
         layout.addWidget(self.preset_list)
         
         # 添加新预设
@@ -5360,20 +5506,25 @@ class PresetManagerDialog(QDialog):
     def add_preset(self):
         """添加新预设"""
         text = self.new_preset_edit.text().strip()
-        if text and text not in self.presets:
-            self.presets.append(text)
-            self.preset_list.addItem(text)
-            self.new_preset_edit.clear()
-        elif text in self.presets:
+        if not text:
+            return
+        if text in self._preset_set:
             QMessageBox.warning(self, "警告", "该预设已存在")
+            return
+        self._preset_set.add(text)
+        self.presets.append(text)
+        row = self.preset_model.rowCount()
+        self.preset_model.insertRow(row)
+        self.preset_model.setData(self.preset_model.index(row), text)
+        self.new_preset_edit.clear()
     
     def remove_selected(self):
         """删除选中的预设"""
-        current_item = self.preset_list.currentItem()
-        if current_item:
-            text = current_item.text()
-            self.presets.remove(text)
-            self.preset_list.takeItem(self.preset_list.row(current_item))
+        index = self.preset_list.currentIndex()
+        if index.isValid():
+            row = index.row()
+            self._preset_set.discard(self.presets.pop(row))
+            self.preset_model.removeRow(row)
     
     def get_presets(self):
         """获取当前预设列表"""
@@ -5383,57 +5534,14 @@ class PresetManagerDialog(QDialog):
 class VMTBaseEditor(QDialog):
     """VMT Base文件编辑器对话框"""
     
-    def __init__(self, parent=None, content="", file_path=None):
+    def __init__(self, parent=None, content="", file_path=None, report_status=None):
         super().__init__(parent)
         self.file_path = file_path
+        self.report_status = report_status
         self.setWindowTitle("编辑 vmt-base.vmt")
         self.setModal(True)
         self.resize(800, 600)
         
-        # 设置样式
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            
-            QPlainTextEdit {
-                background-color: #404040;
-                border: 1px solid #606060;
-                border-radius: 4px;
-                color: #ffffff;
-                font-family: 'Consolas', 'Monaco', monospace;
-                font-size: 10pt;
-                padding: 8px;
-            }
-            
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 80px;
-            }
-            
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            
-            QPushButton#cancel_btn {
-                background-color: #666666;
-            }
-            
-            QPushButton#cancel_btn:hover {
-                background-color: #777777;
-            }
-        """)
-        
         self.setup_ui(content)
         
     def setup_ui(self, content):
@@ -5480,14 +5588,29 @@ class VMTBaseEditor(QDialog):
             
             if self.file_path:
                 # 确保目录存在
-                Path(self.file_path).parent.mkdir(parents=True, exist_ok=True)
+                target = Path(self.file_path)
+                target.parent.mkdir(parents=True, exist_ok=True)
                 
-                # 保存文件
-                with open(self.file_path, 'w', encoding='utf-8') as f:
+                # 先写临时文件并落盘，再原子替换，写入中途出错不会损坏原文件
+                tmp_file = target.with_name(target.name + ".tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
                     f.write(content)
-                
-                QMessageBox.information(self, "成功", f"文件已保存到:\n{self.file_path}")
-                self.accept()
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, target)
+                
+                if self.report_status:
+                    # 在主窗口状态栏提示，不弹出模态对话框
+                    self.report_status(f"已保存: {self.file_path}", 3000)
+                    self.accept()
+                else:
+                    # 单独使用时显示短暂的浮动提示后关闭
+                    toast = QLabel(f"文件已保存到: {self.file_path}", self)
+                    toast.setStyleSheet("QLabel { background-color: #2d5a2d; color: #ffffff; padding: 6px 12px; border-radius: 4px; }")
+                    toast.adjustSize()
+                    toast.move((self.width() - toast.width()) // 2, self.height() - toast.height() - 60)
+                    toast.show()
+                    QTimer.singleShot(1500, self.accept)
             else:
                 QMessageBox.warning(self, "错误", "文件路径无效")
                 
@@ -5498,12 +5621,67 @@ class VMTBaseEditor(QDialog):
 class PBRTextureTab(QWidget):
     """PBR贴图处理标签页"""
     
-    def __init__(self, config: ConfigManager, status_bar: QStatusBar):
+    # 预览用解码图像缓存的最大条目数
+    IMG_CACHE_SIZE = 32
+    # 预览合成前先把图像缩到不超过此边长（约为显示尺寸的2倍），单文件预览显示300，批量预览显示150
+    PREVIEW_SOURCE_SIZE = 600
+    BATCH_PREVIEW_SOURCE_SIZE = 300
+    # 自定义预设文件（相对当前工作目录）
+    PRESETS_FILE = Path("presets.json")
+    # 批量预览组占位高度，与填充后的高度一致以免滚动时跳动
+    BATCH_GROUP_HEIGHT = 210
+    # QPixmapCache容量（KB），批量预览的缩略图较多
+    PIXMAP_CACHE_KB = 51200
+    # 批量预览缩略图磁盘缓存的容量上限（字节），超出时按最近使用时间删除
+    THUMB_CACHE_LIMIT = 500 * 1024 * 1024
+    # (数值, 尺寸) -> 只读常数平面，由_constant_plane维护
+    _constant_planes = {}
+    # 通道来源下拉框选项，顺序与_build_channel_table返回的通道表一致
+    CHANNEL_SOURCES = ("红色通道", "绿色通道", "蓝色通道", "Alpha通道", "灰度", "白色", "黑色")
+    # 超过此像素数的图像在批量处理时按STRIP_ROWS行分条合成MRAO
+    STRIP_MIN_PIXELS = 2048 * 2048
+    STRIP_ROWS = 256
+    # 预览更新中可预期的错误（文件无法读取、格式不支持、图像过大），其他异常直接抛出
+    PREVIEW_ERRORS = (OSError, ValueError, MemoryError, Image.DecompressionBombError)
+    # PNG压缩级别：PIL默认6；勾选"快速PNG压缩"时用1，编码快数倍，文件略大
+    PNG_COMPRESS_LEVEL = 6
+    FAST_PNG_COMPRESS_LEVEL = 1
+    # 内置预设：(名称, M/R/AO的来源下拉框索引)，顺序即预设下拉框中的顺序，None表示保持当前设置
+    BUILTIN_PRESETS = (
+        ("自定义", None),
+        ("标准PBR (M=B, R=G, AO=R)", (2, 1, 0)),
+        ("Unity标准 (M=R, R=G, AO=B)", (0, 1, 2)),
+        ("UE4标准 (M=B, R=G, AO=R)", (2, 1, 0)),
+    )
+    
+    def __init__(self, config: ConfigManager, report_status):
         super().__init__()
         self.config = config
-        self.status_bar = status_bar
+        self.report_status = report_status
         self.batch_files = []
+        self._batch_group_pool = []  # 批量预览组按序号复用，重新选择文件时不再销毁重建
         self.current_input_file = None
+        self.processing_thread = None
+        self._mrao_scratch = None  # MRAO预览缓冲区，尺寸不变时复用
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), self.PIXMAP_CACHE_KB))
+        # 批量预览缩略图的磁盘缓存目录，启动后延迟清理超出容量的旧文件
+        self._thumb_dir = Path(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)) / "thumbs"
+        QTimer.singleShot(2000, self._sweep_thumb_cache)
+        # (路径, 最大边长) -> [只读RGB数组, 通道表或None, 文件修改时间]（LRU），切换映射配置时无需重新解码图像
+        self._img_cache = OrderedDict()
+        # 映射配置变化时合并短时间内的多次刷新请求（应用预设会连续改动多个控件）
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(40)
+        self._preview_timer.timeout.connect(self._do_update_all_previews)
+        self._last_mapping_key = None  # 上次刷新时的映射配置，未变化时跳过刷新
+        # 自定义预设读入内存，修改后延迟500毫秒合并写盘；文件被外部修改（修改时间变化）时重新读取
+        self._presets_mtime = None
+        self._custom_presets = self._read_custom_presets()
+        self._presets_save_timer = QTimer(self)
+        self._presets_save_timer.setSingleShot(True)
+        self._presets_save_timer.setInterval(500)
+        self._presets_save_timer.timeout.connect(self._write_custom_presets)
         self.setup_ui()
         
     def setup_ui(self):
@@ -5615,6 +5793,12 @@ class PBRTextureTab(QWidget):
         self.format_combo.addItems(["PNG", "TGA", "JPG"])
         format_layout.addWidget(self.format_combo)
         
+        self.fast_png_check = QCheckBox("快速PNG压缩")
+        self.fast_png_check.setToolTip("使用低压缩级别保存PNG，处理速度更快，文件略大")
+        self.fast_png_check.setChecked(self.config.get_bool("pbr_fast_png", True))
+        self.fast_png_check.toggled.connect(lambda checked: self.config.set("pbr_fast_png", checked))
+        format_layout.addWidget(self.fast_png_check)
+        
         output_layout.addLayout(format_layout)
         
         layout.addWidget(output_group)
@@ -5718,6 +5902,12 @@ class PBRTextureTab(QWidget):
         self.batch_scroll_area.setWidget(self.batch_preview_container)
         batch_layout.addWidget(self.batch_scroll_area)
         
+        # 滚动或尺寸变化时只填充进入可见区域的预览组
+        scroll_bar = self.batch_scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._populate_visible_batch_groups)
+        scroll_bar.rangeChanged.connect(self._populate_visible_batch_groups)
+        self.tab_widget.currentChanged.connect(self._populate_visible_batch_groups)
+        
         self.tab_widget.addTab(self.batch_tab, "批量预览")
         
         # 初始时隐藏批量预览标签页
@@ -5748,7 +5938,7 @@ class PBRTextureTab(QWidget):
             mapping_layout.addWidget(QLabel(label), i, 0)
             
             source_combo = QComboBox()
-            source_combo.addItems(["红色通道", "绿色通道", "蓝色通道", "Alpha通道", "灰度", "白色", "黑色"])
+            source_combo.addItems(self.CHANNEL_SOURCES)
             mapping_layout.addWidget(QLabel("来源:"), i, 1)
             mapping_layout.addWidget(source_combo, i, 2)
             
@@ -5797,6 +5987,7 @@ class PBRTextureTab(QWidget):
         if file_path:
             self.current_input_file = file_path
             self.batch_files = []
+            self._last_mapping_key = None
             self.file_list_label.setText(f"单个文件: {Path(file_path).name}")
             # 隐藏批量预览标签页
             if hasattr(self, 'batch_tab'):
@@ -5812,6 +6003,7 @@ class PBRTextureTab(QWidget):
         if file_paths:
             self.batch_files = file_paths
             self.current_input_file = None
+            self._last_mapping_key = None
             file_names = [Path(f).name for f in file_paths[:3]]
             if len(file_paths) > 3:
                 file_names.append(f"... 等{len(file_paths)}个文件")
@@ -5831,39 +6023,27 @@ class PBRTextureTab(QWidget):
         if not preset_name or preset_name.strip() == "":
             return
         
-        # 临时断开信号连接，避免在设置过程中触发多次更新
-        for channel, widgets in self.channel_combos.items():
-            try:
-                widgets['source'].currentTextChanged.disconnect(self.update_all_previews)
-                widgets['invert'].toggled.disconnect(self.update_all_previews)
-            except:
-                pass  # 如果信号未连接，忽略错误
-        
-        if preset_name == "标准PBR (M=B, R=G, AO=R)":
-            self.channel_combos['metallic']['source'].setCurrentText("蓝色通道")
-            self.channel_combos['roughness']['source'].setCurrentText("绿色通道")
-            self.channel_combos['ao']['source'].setCurrentText("红色通道")
-        elif preset_name == "Unity标准 (M=R, R=G, AO=B)":
-            self.channel_combos['metallic']['source'].setCurrentText("红色通道")
-            self.channel_combos['roughness']['source'].setCurrentText("绿色通道")
-            self.channel_combos['ao']['source'].setCurrentText("蓝色通道")
-        elif preset_name == "UE4标准 (M=B, R=G, AO=R)":
-            self.channel_combos['metallic']['source'].setCurrentText("蓝色通道")
-            self.channel_combos['roughness']['source'].setCurrentText("绿色通道")
-            self.channel_combos['ao']['source'].setCurrentText("红色通道")
-        elif preset_name.startswith("[自定义]"):
-            # 自定义预设
-            actual_name = preset_name.replace("[自定义] ", "")
-            presets_file = Path("presets.json")
-            
-            if presets_file.exists():
-                try:
-                    import json
-                    with open(presets_file, 'r', encoding='utf-8') as f:
-                        custom_presets = json.load(f)
-                    
-                    if actual_name in custom_presets:
-                        preset = custom_presets[actual_name]
+        # 设置过程中屏蔽映射控件的信号，避免触发多次更新
+        blockers = [
+            QSignalBlocker(widget)
+            for widgets in self.channel_combos.values()
+            for widget in (widgets['source'], widgets['invert'])
+        ]
+        try:
+            # 内置预设位于下拉框开头，按索引直接设置来源
+            preset_index = self.preset_combo.currentIndex()
+            if 0 <= preset_index < len(self.BUILTIN_PRESETS):
+                sources = self.BUILTIN_PRESETS[preset_index][1]
+                if sources is not None:
+                    for key, src_idx in zip(('metallic', 'roughness', 'ao'), sources):
+                        self.channel_combos[key]['source'].setCurrentIndex(src_idx)
+            elif preset_name.startswith("[自定义]"):
+                # 自定义预设
+                actual_name = preset_name.replace("[自定义] ", "")
+                preset = self._custom_presets.get(actual_name)
+                
+                if preset:
+                    try:
                         # 重置所有反转状态
                         for channel in self.channel_combos:
                             self.channel_combos[channel]['invert'].setChecked(False)
@@ -5874,13 +6054,11 @@ class PBRTextureTab(QWidget):
                                 self.channel_combos[channel]['source'].setCurrentText(config['source'])
                                 self.channel_combos[channel]['invert'].setChecked(config['invert'])
                                 
-                except Exception as e:
-                    print(f"加载自定义预设失败: {e}")
-        
-        # 重新连接信号
-        for channel, widgets in self.channel_combos.items():
-            widgets['source'].currentTextChanged.connect(self.update_all_previews)
-            widgets['invert'].toggled.connect(self.update_all_previews)
+                    except Exception as e:
+                        print(f"加载自定义预设失败: {e}")
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
         
         # 应用预设后更新所有预览
         if preset_name != "自定义":
@@ -5891,43 +6069,20 @@ class PBRTextureTab(QWidget):
             
     def load_presets(self):
         """加载预设配置"""
-        # 临时断开信号连接，避免在加载过程中触发apply_preset
-        try:
-            self.preset_combo.currentTextChanged.disconnect()
-        except:
-            pass
-        
-        # 内置预设
-        builtin_presets = [
-            "自定义",
-            "标准PBR (M=B, R=G, AO=R)",
-            "Unity标准 (M=R, R=G, AO=B)",
-            "UE4标准 (M=B, R=G, AO=R)"
-        ]
-        
-        self.preset_combo.clear()
-        self.preset_combo.addItems(builtin_presets)
-        
-        # 加载自定义预设
-        presets_file = Path("presets.json")
-        if presets_file.exists():
-            try:
-                import json
-                with open(presets_file, 'r', encoding='utf-8') as f:
-                    custom_presets = json.load(f)
-                    for preset_name in custom_presets.keys():
-                        display_name = f"[自定义] {preset_name}"
-                        self.preset_combo.addItem(display_name)
-            except Exception as e:
-                print(f"加载自定义预设失败: {e}")
-        
-        # 重新连接信号
-        self.preset_combo.currentTextChanged.connect(self.apply_preset)
+        self._sync_custom_presets()
+        # 加载过程中屏蔽下拉框信号，避免触发apply_preset
+        with QSignalBlocker(self.preset_combo):
+            # 内置预设
+            builtin_presets = [name for name, _ in self.BUILTIN_PRESETS]
+            
+            self.preset_combo.clear()
+            self.preset_combo.addItems(builtin_presets)
+            
+            # 加载自定义预设
+            self.preset_combo.addItems([f"[自定义] {preset_name}" for preset_name in self._custom_presets])
                 
     def save_custom_preset(self):
         """保存自定义预设"""
-        from PySide6.QtWidgets import QInputDialog
-        
         preset_name, ok = QInputDialog.getText(
             self, "保存预设", "请输入预设名称:"
         )
@@ -5936,42 +6091,21 @@ class PBRTextureTab(QWidget):
             preset_name = preset_name.strip()
             current_config = self.get_mapping_config()
             
-            # 读取现有预设
-            presets_file = Path("presets.json")
-            custom_presets = {}
-            
-            if presets_file.exists():
-                try:
-                    import json
-                    with open(presets_file, 'r', encoding='utf-8') as f:
-                        custom_presets = json.load(f)
-                except Exception as e:
-                    print(f"读取预设文件失败: {e}")
+            # 保存新预设（内存中更新，稍后统一写盘）
+            self._custom_presets[preset_name] = current_config
+            self._presets_save_timer.start()
             
-            # 保存新预设
-            custom_presets[preset_name] = current_config
+            # 重新加载预设列表
+            self.load_presets()
             
-            try:
-                import json
-                with open(presets_file, 'w', encoding='utf-8') as f:
-                    json.dump(custom_presets, f, ensure_ascii=False, indent=2)
-                
-                # 重新加载预设列表
-                self.load_presets()
-                
-                # 选择新保存的预设
-                new_preset_name = f"[自定义] {preset_name}"
-                index = self.preset_combo.findText(new_preset_name)
-                if index >= 0:
-                    self.preset_combo.setCurrentIndex(index)
-                    
-            except Exception as e:
-                print(f"保存预设失败: {e}")
+            # 选择新保存的预设
+            new_preset_name = f"[自定义] {preset_name}"
+            index = self.preset_combo.findText(new_preset_name)
+            if index >= 0:
+                self.preset_combo.setCurrentIndex(index)
                 
     def delete_custom_preset(self):
         """删除自定义预设"""
-        from PySide6.QtWidgets import QMessageBox
-        
         current_preset = self.preset_combo.currentText()
         
         if not current_preset.startswith("[自定义] "):
@@ -5987,56 +6121,76 @@ class PBRTextureTab(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            presets_file = Path("presets.json")
+            if self._custom_presets.pop(preset_name, None) is not None:
+                self._presets_save_timer.start()
+                
+                # 重新加载预设列表
+                self.load_presets()
+                self.preset_combo.setCurrentIndex(0)  # 选择"自定义"
             
-            if presets_file.exists():
-                try:
-                    import json
-                    with open(presets_file, 'r', encoding='utf-8') as f:
-                        custom_presets = json.load(f)
-                    
-                    if preset_name in custom_presets:
-                        del custom_presets[preset_name]
-                        
-                        with open(presets_file, 'w', encoding='utf-8') as f:
-                            json.dump(custom_presets, f, ensure_ascii=False, indent=2)
-                        
-                        # 重新加载预设列表
-                        self.load_presets()
-                        self.preset_combo.setCurrentIndex(0)  # 选择"自定义"
-                        
-                except Exception as e:
-                    print(f"删除预设失败: {e}")
+    def _presets_file_mtime(self):
+        try:
+            return self.PRESETS_FILE.stat().st_mtime_ns
+        except OSError:
+            return None
+            
+    def _read_custom_presets(self) -> dict:
+        """读取自定义预设文件，并记录读取时的修改时间"""
+        self._presets_mtime = self._presets_file_mtime()
+        if self._presets_mtime is None:
+            return {}
+        try:
+            with open(self.PRESETS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"加载自定义预设失败: {e}")
+            return {}
+            
+    def _sync_custom_presets(self):
+        """预设文件在上次读写后被外部修改时重新读取；有尚未写盘的修改时以内存为准"""
+        if self._presets_save_timer.isActive():
+            return
+        if self._presets_file_mtime() != self._presets_mtime:
+            self._custom_presets = self._read_custom_presets()
+            
+    def _write_custom_presets(self):
+        """把内存中的自定义预设写回文件：先写临时文件再原子替换，避免写到一半留下损坏的文件"""
+        tmp_file = self.PRESETS_FILE.with_name(self.PRESETS_FILE.name + ".tmp")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._custom_presets, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.PRESETS_FILE)
+            self._presets_mtime = self._presets_file_mtime()
+        except Exception as e:
+            print(f"保存预设失败: {e}")
+            
+    def flush_custom_presets(self):
+        """立即写出尚未保存的预设修改（程序关闭时调用）"""
+        if self._presets_save_timer.isActive():
+            self._presets_save_timer.stop()
+            self._write_custom_presets()
             
     def update_previews(self):
         """更新预览"""
         if self.current_input_file:
             try:
-                from PIL import Image as PILImage
-                img = PILImage.open(self.current_input_file)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
+                table = self._get_channel_table(self.current_input_file, self.PREVIEW_SOURCE_SIZE)
                 
                 # 更新通道预览
-                channels = img.split()
                 channel_names = ["红色通道", "绿色通道", "蓝色通道"]
                 
                 for i, name in enumerate(channel_names):
-                    if i < len(channels):
-                        channel_img = channels[i]
+                    if i < len(table):
                         # 转换为QPixmap并显示
-                        from PySide6.QtGui import QPixmap
-                        from PIL.ImageQt import ImageQt
-                        qimg = ImageQt(channel_img)
-                        pixmap = QPixmap.fromImage(qimg)
+                        pixmap = self._np_to_pixmap(table[i])
                         scaled_pixmap = pixmap.scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
                         self.channel_previews[name].setPixmap(scaled_pixmap)
                 
                 # 更新输出预览
                 self.update_single_output_preview()
                         
-            except Exception as e:
-                self.status_bar.showMessage(f"预览更新失败: {str(e)}")
+            except self.PREVIEW_ERRORS as e:
+                self._preview_failed("预览更新失败", e)
                 
     def update_single_output_preview(self):
         """更新单个文件的输出预览"""
@@ -6044,70 +6198,213 @@ class PBRTextureTab(QWidget):
             return
             
         try:
-            from PIL import Image as PILImage
-            from PIL.ImageQt import ImageQt
-            from PySide6.QtGui import QPixmap
-            import numpy as np
-            
-            # 加载输入图像
-            image = PILImage.open(self.current_input_file)
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            # 加载输入图像的通道表（命中缓存时不再解码）
+            table = self._get_channel_table(self.current_input_file, self.PREVIEW_SOURCE_SIZE)
             
-            img_array = np.array(image)
-            height, width = img_array.shape[:2]
+            # 合成MRAO贴图预览（M -> R, R -> G, AO -> B）
+            mrao_array = self._compose_mrao_preview(table)
             
-            # 获取当前映射配置
-            mapping_config = self.get_mapping_config()
-            
-            # 分离通道
-            channels = {
-                '红色通道': img_array[:, :, 0],
-                '绿色通道': img_array[:, :, 1],
-                '蓝色通道': img_array[:, :, 2]
-            }
-            
-            # 合成MRAO贴图预览
-            mrao_array = np.zeros((height, width, 3), dtype=np.uint8)
-            
-            for i, channel_key in enumerate(['metallic', 'roughness', 'ao']):
-                if channel_key in mapping_config:
-                    config = mapping_config[channel_key]
-                    source = config['source']
-                    invert = config['invert']
-                    
-                    if source in channels:
-                        channel_data = channels[source]
-                    elif source == '灰度':
-                        channel_data = np.dot(img_array[:, :, :3], [0.299, 0.587, 0.114]).astype(np.uint8)
-                    elif source == '白色':
-                        channel_data = np.full((height, width), 255, dtype=np.uint8)
-                    elif source == '黑色':
-                        channel_data = np.full((height, width), 0, dtype=np.uint8)
-                    else:
-                        channel_data = np.full((height, width), 128, dtype=np.uint8)
-                    
-                    if invert:
-                        channel_data = 255 - channel_data
-                    
-                    mrao_array[:, :, i] = channel_data
-            
-            # 创建可视化预览图像
-            preview_array = np.zeros((height, width, 3), dtype=np.uint8)
-            preview_array[:, :, 0] = mrao_array[:, :, 0]  # M -> R
-            preview_array[:, :, 1] = mrao_array[:, :, 1]  # R -> G  
-            preview_array[:, :, 2] = mrao_array[:, :, 2]  # AO -> B
-            
-            preview_image = PILImage.fromarray(preview_array, mode='RGB')
-            qt_image = ImageQt(preview_image)
-            pixmap = QPixmap.fromImage(qt_image)
+            pixmap = self._np_to_pixmap(mrao_array)
             scaled_pixmap = pixmap.scaled(300, 300, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
             
             self.output_preview.setPixmap(scaled_pixmap)
             
-        except Exception as e:
-            print(f"更新单个输出预览失败: {e}")
-                
+        except self.PREVIEW_ERRORS as e:
+            self._preview_failed("更新单个输出预览失败", e)
+            
+    def _preview_failed(self, message, error):
+        """输出预览错误并在状态栏提示3秒；VTF_PROFILE=1时重新抛出"""
+        print(f"{message}: {error}")
+        self.report_status(f"{message}: {error}", 3000)
+        if _VTF_PROFILE:
+            raise error
+                
+    def _get_img_array(self, path, max_size=None):
+        """获取预览用的RGB数组，超过max_size的图像先缩小，按(路径, 最大边长)做LRU缓存"""
+        return self._get_cache_entry(path, max_size)[0]
+        
+    def _get_channel_table(self, path, max_size=None):
+        """获取图像的通道表，每张图像只构建一次并随图像缓存"""
+        entry = self._get_cache_entry(path, max_size)
+        if entry[1] is None:
+            entry[1] = self._build_channel_table(entry[0])
+        return entry[1]
+        
+    def _get_cache_entry(self, path, max_size):
+        cache = self._img_cache
+        key = (path, max_size)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        entry = cache.get(key)
+        # 文件在磁盘上被修改后重新解码，否则直接复用已解码的数组
+        if entry is not None and entry[2] == mtime:
+            cache.move_to_end(key)
+            return entry
+        
+        with Image.open(path) as image:
+            if max_size:
+                # JPEG等格式在解码时直接按1/2、1/4、1/8缩小（结果不小于max_size），其他格式无影响
+                image.draft('RGB', (max_size, max_size))
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            if max_size and max(image.size) > max_size:
+                scale = max_size / max(image.size)
+                new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+                # reducing_gap：先用reduce()按整数倍盒式缩小，再对剩余部分做双线性缩放
+                image = image.resize(new_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+            img_array = np.ascontiguousarray(np.asarray(image))
+        img_array.setflags(write=False)  # 多个预览共享，防止被意外修改
+        
+        entry = [img_array, None, mtime]
+        cache[key] = entry
+        cache.move_to_end(key)
+        if len(cache) > self.IMG_CACHE_SIZE:
+            cache.popitem(last=False)
+        return entry
+        
+    @classmethod
+    def _build_channel_table(cls, img_array):
+        """按CHANNEL_SOURCES的顺序预先生成7个uint8平面：R, G, B, A(预览图无Alpha时为255), 灰度, 白色, 黑色"""
+        shape = img_array.shape[:2]
+        white = cls._constant_plane(255, shape)
+        alpha = np.ascontiguousarray(img_array[:, :, 3]) if img_array.shape[2] > 3 else white
+        table = [
+            np.ascontiguousarray(img_array[:, :, 0]),
+            np.ascontiguousarray(img_array[:, :, 1]),
+            np.ascontiguousarray(img_array[:, :, 2]),
+            alpha,
+            cls.luminance_u8(img_array),
+            white,
+            cls._constant_plane(0, shape),
+        ]
+        for plane in table:
+            plane.setflags(write=False)
+        return table
+        
+    @classmethod
+    def _constant_plane(cls, value, shape):
+        """同尺寸图像共用的只读常数平面（白色/黑色），不再为每张图像各分配一份"""
+        key = (value, shape)
+        plane = cls._constant_planes.get(key)
+        if plane is None:
+            if len(cls._constant_planes) >= 16:
+                cls._constant_planes.clear()  # 已缓存的通道表仍持有各自的引用
+            plane = np.full(shape, value, dtype=np.uint8)
+            plane.setflags(write=False)
+            cls._constant_planes[key] = plane
+        return plane
+        
+    def _compose_mrao_preview(self, table, mapping=None):
+        """按当前映射把通道表中的平面直接写入MRAO缓冲区；缓冲区尺寸不变时复用，不再清零（三个通道都会被覆盖）"""
+        shape = table[0].shape + (3,)
+        mrao_array = self._mrao_scratch
+        if mrao_array is None or mrao_array.shape != shape:
+            mrao_array = self._mrao_scratch = np.empty(shape, dtype=np.uint8)
+        
+        if mapping is None:
+            mapping = self._mapping_indices()
+        if _HAS_NUMBA:
+            args = []
+            for src_idx, invert in mapping:
+                args += (table[src_idx], np.uint8(0xFF if invert else 0))
+            _assemble_mrao(*args, mrao_array)
+            return mrao_array
+        
+        for i, (src_idx, invert) in enumerate(mapping):
+            channel_data = table[src_idx]
+            if invert:
+                np.invert(channel_data, out=mrao_array[:, :, i])
+            else:
+                mrao_array[:, :, i] = channel_data
+        return mrao_array
+        
+    def _cached_thumbnail(self, image_path, tag, build_fn):
+        """依次查QPixmapCache和磁盘缓存，都未命中时调用build_fn生成并写入两级缓存
+        
+        缓存键包含文件路径、修改时间和tag（缩略图种类与映射配置），源文件修改后自动失效
+        """
+        try:
+            mtime = os.path.getmtime(image_path)
+        except OSError:
+            return build_fn()
+        key = hashlib.sha1(f"{image_path}|{mtime}|{tag}".encode('utf-8')).hexdigest()
+        
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None:
+            return pixmap
+        
+        cache_file = self._thumb_dir / f"{key}.png"
+        pixmap = QPixmap(os.fspath(cache_file)) if cache_file.exists() else None
+        if pixmap is not None and not pixmap.isNull():
+            try:
+                os.utime(cache_file)  # 记录最近使用时间，供容量清理时参考
+            except OSError:
+                pass
+        else:
+            pixmap = build_fn()
+            try:
+                self._thumb_dir.mkdir(parents=True, exist_ok=True)
+                pixmap.save(os.fspath(cache_file), "PNG")
+            except OSError as e:
+                print(f"写入缩略图缓存失败: {e}")
+        
+        QPixmapCache.insert(key, pixmap)
+        return pixmap
+        
+    def _sweep_thumb_cache(self):
+        """缩略图磁盘缓存超过THUMB_CACHE_LIMIT时，从最久未使用的文件开始删除"""
+        try:
+            entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                       for entry in os.scandir(self._thumb_dir) if entry.is_file()]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        if total <= self.THUMB_CACHE_LIMIT:
+            return
+        
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            if total <= self.THUMB_CACHE_LIMIT:
+                break
+        
+    def _mapping_key(self, mapping=None) -> str:
+        """当前映射配置（或传入的_mapping_indices结果）的紧凑字符串表示，用作缓存键"""
+        if mapping is None:
+            mapping = self._mapping_indices()
+        return "".join(f"{src_idx}{int(invert)}" for src_idx, invert in mapping)
+        
+    def _mapping_indices(self):
+        """当前M/R/AO三个输出的(来源下拉框索引, 是否反转)"""
+        return [
+            (self.channel_combos[key]['source'].currentIndex(), self.channel_combos[key]['invert'].isChecked())
+            for key in ('metallic', 'roughness', 'ao')
+        ]
+        
+    @staticmethod
+    def _np_to_pixmap(arr):
+        """uint8数组(H×W或H×W×3)直接构造QImage再转QPixmap，不经过PIL/ImageQt"""
+        arr = np.ascontiguousarray(arr)  # 通道切片不连续时才复制
+        height, width = arr.shape[:2]
+        fmt = QImage.Format.Format_RGB888 if arr.ndim == 3 else QImage.Format.Format_Grayscale8
+        qimg = QImage(arr.data, width, height, arr.strides[0], fmt)
+        # copy()使QImage脱离numpy缓冲区的生命周期
+        return QPixmap.fromImage(qimg.copy())
+        
+    @staticmethod
+    def luminance_u8(img_array):
+        """计算灰度（BT.601）：(77R + 150G + 29B) >> 8，全程uint16定点运算，不产生浮点临时数组"""
+        gray = np.multiply(img_array[:, :, 0], 77, dtype=np.uint16)
+        gray += np.multiply(img_array[:, :, 1], 150, dtype=np.uint16)
+        gray += np.multiply(img_array[:, :, 2], 29, dtype=np.uint16)
+        gray >>= 8
+        return gray.astype(np.uint8)
+        
     def start_processing(self):
         """开始处理"""
         if not (self.current_input_file or self.batch_files):
@@ -6124,37 +6421,87 @@ class PBRTextureTab(QWidget):
         # 获取映射配置
         mapping_config = self.get_mapping_config()
         
+        # 判断是单个文件还是批量处理
+        self._batch_mode = bool(self.batch_files)
+        files = list(self.batch_files) if self._batch_mode else [self.current_input_file]
+        self._processing_output_dir = output_dir
+        
         # 禁用处理按钮
         self.process_btn.setEnabled(False)
-        self.status_bar.showMessage("开始处理PBR贴图...")
+        self.report_status("开始处理PBR贴图...")
         
-        try:
-            # 判断是单个文件还是批量处理
-            if self.batch_files and len(self.batch_files) > 0:
-                # 批量处理
-                self.process_batch_files(self.batch_files, mapping_config, output_dir)
+        compress_level = self.FAST_PNG_COMPRESS_LEVEL if self.fast_png_check.isChecked() else self.PNG_COMPRESS_LEVEL
+        
+        # 在后台线程处理，界面保持响应
+        self.processing_thread = PBRProcessingThread(files, mapping_config, output_dir, compress_level, self)
+        self.processing_thread.status_updated.connect(self.report_status)
+        self.processing_thread.progress_updated.connect(self.update_progress)
+        self.processing_thread.processing_finished.connect(self.on_processing_finished)
+        
+        main_window = self.window()
+        if hasattr(main_window, 'start_progress'):
+            main_window.start_progress()
+        
+        self.processing_thread.start()
+        
+    def update_progress(self, value: int):
+        """更新进度"""
+        main_window = self.window()
+        if hasattr(main_window, 'progress_bar'):
+            main_window.progress_bar.setValue(value)
+            
+    def on_processing_finished(self, success_count: int, errors: list):
+        """处理完成回调"""
+        main_window = self.window()
+        if hasattr(main_window, 'stop_progress'):
+            main_window.stop_progress()
+        
+        # 重新启用处理按钮
+        self.process_btn.setEnabled(True)
+        self.report_status("就绪")
+        
+        output_dir = self._processing_output_dir
+        if not self._batch_mode:
+            if errors:
+                QMessageBox.critical(self, "错误", f"处理失败: {errors[0]}")
             else:
-                # 单个文件处理
-                if self.current_input_file:
-                    self.process_single_file(self.current_input_file, mapping_config, output_dir)
-                    
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"处理失败: {str(e)}")
-        finally:
-            # 重新启用处理按钮
-            self.process_btn.setEnabled(True)
-            self.status_bar.showMessage("就绪")
+                QMessageBox.information(self, "成功", f"文件处理完成！\n输出目录: {output_dir}")
+            return
         
-    def create_batch_preview_group(self, image_path: str, index: int) -> QWidget:
-        """创建单个批量预览组（包含图像名称、RGB通道和输出结果）"""
-        from pathlib import Path
+        # 显示批量处理结果
+        error_count = len(errors)
+        message = f"批量处理完成！\n成功: {success_count} 个文件\n失败: {error_count} 个文件\n输出目录: {output_dir}"
+        if error_count > 0:
+            QMessageBox.warning(self, "批量处理完成", message)
+        else:
+            QMessageBox.information(self, "批量处理完成", message)
         
+    def create_batch_preview_group(self, image_path: str, index: int) -> QWidget:
+        """创建单个批量预览组的占位框，预览内容在进入可见区域时才创建"""
         group = QGroupBox(f"图像 {index + 1}: {Path(image_path).name}")
-        group_layout = QGridLayout(group)
-        group_layout.setSpacing(10)
+        group.setMinimumHeight(self.BATCH_GROUP_HEIGHT)
         
         # 存储文件路径到组件属性中
         group.file_path = image_path
+        group.previews = None
+        group.loaded_path = None  # 预览内容对应的文件，与file_path不同时需要刷新
+        
+        return group
+        
+    def _reuse_batch_preview_group(self, group: QWidget, image_path: str, index: int):
+        """把池中的预览组改为显示另一个文件；已创建的预览标签保留，进入可见区域时再刷新内容"""
+        group.setTitle(f"图像 {index + 1}: {Path(image_path).name}")
+        group.file_path = image_path
+        if group.loaded_path != image_path:
+            group.loaded_path = None
+            if group.previews:
+                for name, preview in group.previews.items():
+                    preview.setText("MRAO输出" if name == "输出" else name)
+        
+    def _populate_batch_group(self, group: QWidget):
+        """为占位预览组创建RGB通道和输出结果预览"""
+        group_layout = QGridLayout(group)
+        group_layout.setSpacing(10)
         
         # 创建预览组件
         previews = {}
@@ -6180,113 +6527,79 @@ class PBRTextureTab(QWidget):
         previews["输出"] = output_preview
         group_layout.addWidget(output_preview, 0, 3)
         
+        group.previews = previews
+        
         # 更新预览内容
-        self.update_batch_preview_content(image_path, previews)
+        self.update_batch_preview_content(group.file_path, previews)
+        group.loaded_path = group.file_path
         
-        return group
+    def _populate_visible_batch_groups(self, *args):
+        """填充与滚动视口（上下各多留一屏）相交的未加载预览组"""
+        if not hasattr(self, 'batch_preview_container') or not self.batch_tab.isVisible():
+            return
+        # 容器尚未按占位高度完成布局时各组几何信息无效，等待rangeChanged再检查
+        group_count = len(getattr(self, 'batch_files', None) or [])
+        if self.batch_preview_container.height() < group_count * self.BATCH_GROUP_HEIGHT:
+            return
+        self.batch_preview_layout.activate()
+        viewport_height = self.batch_scroll_area.viewport().height()
+        top = self.batch_scroll_area.verticalScrollBar().value() - viewport_height
+        bottom = top + viewport_height * 3
+        
+        for i in range(self.batch_preview_layout.count()):
+            group = self.batch_preview_layout.itemAt(i).widget()
+            if group is None or group.loaded_path == group.file_path:
+                continue
+            geometry = group.geometry()
+            if geometry.bottom() >= top and geometry.top() <= bottom:
+                if group.previews is None:
+                    self._populate_batch_group(group)
+                else:
+                    self.update_batch_preview_content(group.file_path, group.previews)
+                    group.loaded_path = group.file_path
         
     def update_batch_preview_content(self, image_path: str, previews: dict):
         """更新批量预览内容"""
         try:
-            from PIL import Image as PILImage
-            from PIL.ImageQt import ImageQt
-            from PySide6.QtGui import QPixmap
-            import numpy as np
-            
-            # 加载图像
-            image = PILImage.open(image_path)
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            img_array = np.array(image)
-            
-            # 更新RGB通道预览
-            channels = {
-                "红色通道": img_array[:, :, 0],
-                "绿色通道": img_array[:, :, 1],
-                "蓝色通道": img_array[:, :, 2]
-            }
+            # 更新RGB通道预览（缩略图与映射配置无关，按文件和通道缓存）
+            channel_names = ["红色通道", "绿色通道", "蓝色通道"]
             
-            for name, channel_data in channels.items():
+            for i, name in enumerate(channel_names):
                 if name in previews:
-                    channel_image = PILImage.fromarray(channel_data, mode='L')
-                    qt_image = ImageQt(channel_image)
-                    pixmap = QPixmap.fromImage(qt_image)
-                    scaled_pixmap = pixmap.scaled(150, 150, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                    previews[name].setPixmap(scaled_pixmap)
+                    def build(i=i):
+                        # 加载图像的通道表（命中缓存时不再解码）
+                        table = self._get_channel_table(image_path, self.BATCH_PREVIEW_SOURCE_SIZE)
+                        pixmap = self._np_to_pixmap(table[i])
+                        return pixmap.scaled(150, 150, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+                    previews[name].setPixmap(self._cached_thumbnail(image_path, f"ch{i}|150", build))
             
             # 更新输出预览
             self.update_batch_output_preview(image_path, previews["输出"])
             
-        except Exception as e:
-            print(f"更新批量预览失败: {e}")
+        except self.PREVIEW_ERRORS as e:
+            self._preview_failed("更新批量预览失败", e)
             
-    def update_batch_output_preview(self, image_path: str, output_preview: QLabel):
-        """更新批量输出预览"""
+    def update_batch_output_preview(self, image_path: str, output_preview: QLabel, mapping=None):
+        """更新批量输出预览；批量刷新时由调用方传入一次性读取的映射配置，不再逐个读取下拉框"""
         try:
-            from PIL import Image as PILImage
-            from PIL.ImageQt import ImageQt
-            from PySide6.QtGui import QPixmap
-            import numpy as np
-            
-            # 加载输入图像
-            image = PILImage.open(image_path)
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            img_array = np.array(image)
-            height, width = img_array.shape[:2]
-            
-            # 获取当前映射配置
-            mapping_config = self.get_mapping_config()
-            
-            # 分离通道
-            channels = {
-                '红色通道': img_array[:, :, 0],
-                '绿色通道': img_array[:, :, 1],
-                '蓝色通道': img_array[:, :, 2]
-            }
-            
-            # 合成MRAO贴图预览
-            mrao_array = np.zeros((height, width, 3), dtype=np.uint8)
-            
-            for i, channel_key in enumerate(['metallic', 'roughness', 'ao']):
-                if channel_key in mapping_config:
-                    config = mapping_config[channel_key]
-                    source = config['source']
-                    invert = config['invert']
-                    
-                    if source in channels:
-                        channel_data = channels[source]
-                    elif source == '灰度':
-                        channel_data = np.dot(img_array[:, :, :3], [0.299, 0.587, 0.114]).astype(np.uint8)
-                    elif source == '白色':
-                        channel_data = np.full((height, width), 255, dtype=np.uint8)
-                    elif source == '黑色':
-                        channel_data = np.full((height, width), 0, dtype=np.uint8)
-                    else:
-                        channel_data = np.full((height, width), 128, dtype=np.uint8)
-                    
-                    if invert:
-                        channel_data = 255 - channel_data
-                    
-                    mrao_array[:, :, i] = channel_data
+            if mapping is None:
+                mapping = self._mapping_indices()
             
-            # 创建可视化预览图像
-            preview_array = np.zeros((height, width, 3), dtype=np.uint8)
-            preview_array[:, :, 0] = mrao_array[:, :, 0]  # M -> R
-            preview_array[:, :, 1] = mrao_array[:, :, 1]  # R -> G  
-            preview_array[:, :, 2] = mrao_array[:, :, 2]  # AO -> B
-            
-            preview_image = PILImage.fromarray(preview_array, mode='RGB')
-            qt_image = ImageQt(preview_image)
-            pixmap = QPixmap.fromImage(qt_image)
-            scaled_pixmap = pixmap.scaled(150, 150, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            def build():
+                # 加载输入图像的通道表（命中缓存时不再解码）
+                table = self._get_channel_table(image_path, self.BATCH_PREVIEW_SOURCE_SIZE)
+                
+                # 合成MRAO贴图预览（M -> R, R -> G, AO -> B）
+                mrao_array = self._compose_mrao_preview(table, mapping)
+                
+                pixmap = self._np_to_pixmap(mrao_array)
+                return pixmap.scaled(150, 150, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
             
-            output_preview.setPixmap(scaled_pixmap)
+            # 同一文件在同一映射配置下的输出缩略图直接复用
+            output_preview.setPixmap(self._cached_thumbnail(image_path, f"mrao|{self._mapping_key(mapping)}|150", build))
             
-        except Exception as e:
-            print(f"更新批量输出预览失败: {e}")
+        except self.PREVIEW_ERRORS as e:
+            self._preview_failed("更新批量输出预览失败", e)
             
     def get_mapping_config(self) -> dict:
         """获取当前通道映射配置"""
@@ -6308,21 +6621,37 @@ class PBRTextureTab(QWidget):
                     
                 # 清空现有预览
                 if hasattr(self, 'batch_preview_container'):
-                    # 清除所有子组件
-                    for i in reversed(range(self.batch_preview_layout.count())):
-                        child = self.batch_preview_layout.itemAt(i)
-                        if child.widget():
-                            child.widget().deleteLater()
-                        elif child.layout():
-                            self.clear_layout(child.layout())
-                    
-                    # 为每个文件创建预览组
-                    for index, file_path in enumerate(self.batch_files):
-                        preview_group = self.create_batch_preview_group(file_path, index)
-                        self.batch_preview_layout.addWidget(preview_group)
+                    # 重建期间暂停重绘，全部添加完后只做一次布局和绘制
+                    self.batch_preview_container.setUpdatesEnabled(False)
+                    try:
+                        # 把所有预览组移出布局（组件保留在池中，弹性空间直接丢弃）
+                        while self.batch_preview_layout.count():
+                            self.batch_preview_layout.takeAt(0)
+                        
+                        # 按序号复用池中的预览组，不够时再创建占位预览组
+                        pool = self._batch_group_pool
+                        for index, file_path in enumerate(self.batch_files):
+                            if index < len(pool):
+                                preview_group = pool[index]
+                                self._reuse_batch_preview_group(preview_group, file_path, index)
+                                preview_group.show()
+                            else:
+                                preview_group = self.create_batch_preview_group(file_path, index)
+                                pool.append(preview_group)
+                            self.batch_preview_layout.addWidget(preview_group)
                         
-                    # 添加弹性空间
-                    self.batch_preview_layout.addStretch()
+                        # 多余的预览组隐藏备用；隐藏期间不会随映射配置刷新，复用时需要重新加载
+                        for preview_group in pool[len(self.batch_files):]:
+                            preview_group.hide()
+                            preview_group.loaded_path = None
+                            
+                        # 添加弹性空间
+                        self.batch_preview_layout.addStretch()
+                    finally:
+                        self.batch_preview_container.setUpdatesEnabled(True)
+                    
+                    # 布局完成后填充可见区域
+                    QTimer.singleShot(0, self._populate_visible_batch_groups)
             else:
                 # 隐藏批量预览标签页
                 if hasattr(self, 'batch_tab'):
@@ -6344,26 +6673,27 @@ class PBRTextureTab(QWidget):
         """更新所有批量预览（当配置改变时调用）"""
         try:
             if hasattr(self, 'batch_files') and self.batch_files and hasattr(self, 'batch_preview_container'):
-                # 遍历所有批量预览组，更新输出预览
-                for i in range(self.batch_preview_layout.count()):
-                    item = self.batch_preview_layout.itemAt(i)
-                    if item and item.widget():
-                        group_widget = item.widget()
-                        if hasattr(group_widget, 'layout') and group_widget.layout() and hasattr(group_widget, 'file_path'):
-                            # 查找输出预览组件（第4个位置，索引3）
-                            layout = group_widget.layout()
-                            if layout.count() > 3:
-                                output_item = layout.itemAtPosition(0, 3)
-                                if output_item and output_item.widget():
-                                    output_preview = output_item.widget()
-                                    if isinstance(output_preview, QLabel):
-                                        # 更新输出预览
-                                        self.update_batch_output_preview(group_widget.file_path, output_preview)
+                # 遍历已加载的批量预览组，更新输出预览（未加载的组在填充时使用当前配置）
+                mapping = self._mapping_indices()
+                layout = self.batch_preview_layout
+                update_output = self.update_batch_output_preview
+                for i in range(layout.count()):
+                    group_widget = layout.itemAt(i).widget()
+                    if group_widget is not None and group_widget.loaded_path == group_widget.file_path:
+                        update_output(group_widget.file_path, group_widget.previews["输出"], mapping)
                                 
-        except Exception as e:
-             print(f"更新所有批量预览失败: {e}")
+        except self.PREVIEW_ERRORS as e:
+            self._preview_failed("更新所有批量预览失败", e)
              
     def update_all_previews(self):
+        """请求更新所有预览，40毫秒内的多次请求只刷新一次；映射配置未变化时直接返回"""
+        mapping_key = self._mapping_key()
+        if mapping_key == self._last_mapping_key:
+            return
+        self._last_mapping_key = mapping_key
+        self._preview_timer.start()
+        
+    def _do_update_all_previews(self):
         """更新所有预览（单个文件和批量文件）"""
         # 更新单个文件的输出预览
         if self.current_input_file:
@@ -6386,27 +6716,9 @@ class PBRTextureTab(QWidget):
             # 弹出对话框让用户输入预设名称
             name, ok = QInputDialog.getText(self, '保存预设', '请输入预设名称:')
             if ok and name.strip():
-                # 保存到配置文件
-                import json
-                import os
-                
-                preset_file = 'presets.json'
-                presets = {}
-                
-                # 读取现有预设
-                if os.path.exists(preset_file):
-                    try:
-                        with open(preset_file, 'r', encoding='utf-8') as f:
-                            presets = json.load(f)
-                    except:
-                        presets = {}
-                
-                # 添加新预设
-                presets[name.strip()] = current_config
-                
-                # 保存到文件
-                with open(preset_file, 'w', encoding='utf-8') as f:
-                    json.dump(presets, f, ensure_ascii=False, indent=2)
+                # 添加新预设（内存中更新，稍后统一写盘）
+                self._custom_presets[name.strip()] = current_config
+                self._presets_save_timer.start()
                 
                 # 更新预设下拉框
                 self.refresh_preset_combo()
@@ -6419,18 +6731,7 @@ class PBRTextureTab(QWidget):
     def load_preset(self):
         """加载预设配置"""
         try:
-            import json
-            import os
-            
-            preset_file = 'presets.json'
-            if not os.path.exists(preset_file):
-                QMessageBox.information(self, '提示', '没有找到预设文件')
-                return
-            
-            # 读取预设文件
-            with open(preset_file, 'r', encoding='utf-8') as f:
-                presets = json.load(f)
-            
+            presets = self._custom_presets
             if not presets:
                 QMessageBox.information(self, '提示', '没有可用的预设')
                 return
@@ -6466,27 +6767,11 @@ class PBRTextureTab(QWidget):
     def refresh_preset_combo(self):
         """刷新预设下拉框"""
         try:
-            import json
-            import os
-            
-            preset_file = 'presets.json'
-            base_items = [
-                "自定义",
-                "标准PBR (M=B, R=G, AO=R)",
-                "Unity标准 (M=R, R=G, AO=B)",
-                "UE4标准 (M=B, R=G, AO=R)"
-            ]
-            
-            items = base_items.copy()
+            self._sync_custom_presets()
+            items = [name for name, _ in self.BUILTIN_PRESETS]
             
             # 添加用户自定义预设
-            if os.path.exists(preset_file):
-                try:
-                    with open(preset_file, 'r', encoding='utf-8') as f:
-                        presets = json.load(f)
-                    items.extend([f"[自定义] {name}" for name in presets.keys()])
-                except:
-                    pass
+            items.extend([f"[自定义] {name}" for name in self._custom_presets])
             
             # 更新下拉框
             current_text = self.preset_combo.currentText()
@@ -6504,18 +6789,7 @@ class PBRTextureTab(QWidget):
     def delete_preset(self):
         """删除预设配置"""
         try:
-            import json
-            import os
-            
-            preset_file = 'presets.json'
-            if not os.path.exists(preset_file):
-                QMessageBox.information(self, '提示', '没有找到预设文件')
-                return
-            
-            # 读取预设文件
-            with open(preset_file, 'r', encoding='utf-8') as f:
-                presets = json.load(f)
-            
+            presets = self._custom_presets
             if not presets:
                 QMessageBox.information(self, '提示', '没有可删除的预设')
                 return
@@ -6531,12 +6805,9 @@ class PBRTextureTab(QWidget):
                                            QMessageBox.StandardButton.No)
                 
                 if reply == QMessageBox.StandardButton.Yes:
-                    # 删除预设
+                    # 删除预设（内存中更新，稍后统一写盘）
                     del presets[name]
-                    
-                    # 保存到文件
-                    with open(preset_file, 'w', encoding='utf-8') as f:
-                        json.dump(presets, f, ensure_ascii=False, indent=2)
+                    self._presets_save_timer.start()
                     
                     # 更新预设下拉框
                     self.refresh_preset_combo()
@@ -6548,118 +6819,282 @@ class PBRTextureTab(QWidget):
     
 
     
-    def process_single_file(self, input_file, mapping_config, output_dir, show_message=True):
-        """处理单个文件"""
+    @classmethod
+    def process_file(cls, input_file, mapping_config, output_dir, scratch=None, prepared_dirs=None,
+                     compress_level=PNG_COMPRESS_LEVEL):
+        """处理单个文件，返回文件基础名（在处理线程中调用，不访问界面控件）
+        
+        scratch为批量处理时传入的字典，用于在同尺寸文件之间复用MRAO输出缓冲区；
+        prepared_dirs为已创建好的(Fake PBR目录, PBR目录)，批量处理时只需创建一次；
+        compress_level为输出PNG的压缩级别；
+        大图按STRIP_ROWS行分条合成MRAO，避免整幅图像的numpy副本和输出数组同时占用内存
+        """
         try:
-            import numpy as np
-            from PIL import Image
-            from pathlib import Path
-            
             # 加载图像
             image = Image.open(input_file)
             
-            # 转换为RGBA模式以保留所有通道
-            if image.mode != 'RGBA':
+            # 转换为RGBA模式以保留所有通道；RGB图像不转换，Alpha通道按常数255处理
+            if image.mode not in ('RGBA', 'RGB'):
                 image = image.convert('RGBA')
-            
-            # 转换为numpy数组
-            img_array = np.array(image)
-            height, width = img_array.shape[:2]
-            
-            # 分离通道
-            channels = {
-                '红色通道': img_array[:, :, 0],
-                '绿色通道': img_array[:, :, 1],
-                '蓝色通道': img_array[:, :, 2],
-                'Alpha通道': img_array[:, :, 3] if img_array.shape[2] > 3 else np.full((height, width), 255, dtype=np.uint8),
-                '灰度': np.mean(img_array[:, :, :3], axis=2).astype(np.uint8),
-                '白色': np.full((height, width), 255, dtype=np.uint8),
-                '黑色': np.full((height, width), 0, dtype=np.uint8)
-            }
+            width, height = image.size
             
             # 创建输出目录
-            output_path = Path(output_dir)
-            fake_pbr_dir = output_path / "Fake PBR"
-            pbr_dir = output_path / "PBR"
-            fake_pbr_dir.mkdir(parents=True, exist_ok=True)
-            pbr_dir.mkdir(parents=True, exist_ok=True)
+            if prepared_dirs is None:
+                prepared_dirs = cls.prepare_output_dirs(output_dir)
+            fake_pbr_dir, pbr_dir = prepared_dirs
             
-            # 保存分离的通道 (Fake PBR)
+            # 保存分离的通道 (Fake PBR)，使用与原始程序一致的命名规则
             base_name = Path(input_file).stem
-            
-            # 使用与原始程序一致的命名规则
-            channel_mapping = {
-                '红色通道': 'R',
-                '绿色通道': 'G',
-                '蓝色通道': 'B',
-                'Alpha通道': 'A'
-            }
-            
-            for channel_name, channel_data in channels.items():
-                if channel_name in channel_mapping:
-                    channel_image = Image.fromarray(channel_data, mode='L')
-                    mapped_name = channel_mapping[channel_name]
-                    channel_output_path = fake_pbr_dir / f"{base_name}_{mapped_name}.png"
-                    channel_image.save(channel_output_path)
-            
-            # 创建MRA贴图
-            mra_array = np.zeros((height, width, 3), dtype=np.uint8)
-            
-            # 根据映射配置填充MRA通道
-            for i, channel_key in enumerate(['metallic', 'roughness', 'ao']):
-                if channel_key in mapping_config:
-                    source = mapping_config[channel_key]['source']
-                    invert = mapping_config[channel_key]['invert']
-                    
-                    # 获取源数据
-                    if source in channels:
-                        data = channels[source].copy()
-                        if invert:
-                            data = 255 - data
-                        mra_array[:, :, i] = data
+            # split()一次取出四个通道，不再对每个通道各调用一次getchannel
+            bands = image.split()
+            if len(bands) == 3:
+                bands += (Image.new('L', image.size, 255),)
+            for band, channel_image in zip(('R', 'G', 'B', 'A'), bands):
+                channel_output_path = fake_pbr_dir / f"{base_name}_{band}.png"
+                channel_image.save(channel_output_path, compress_level=compress_level)
             
             # 保存MRAO贴图（与原始程序命名一致）
-            mra_image = Image.fromarray(mra_array, mode='RGB')
             mra_output_path = pbr_dir / f"{base_name}_MRAO.png"
-            mra_image.save(mra_output_path)
-            
-            self.status_bar.showMessage(f"处理完成: {base_name}")
-            # 只在单个文件处理时显示消息框，批量处理时不显示
-            if show_message:
-                QMessageBox.information(self, "成功", f"文件处理完成！\n输出目录: {output_dir}")
+            if width * height < cls.STRIP_MIN_PIXELS:
+                img_array = np.asarray(image)
+                mra_array = cls._scratch_buffer(scratch, (height, width, 3))
+                cls._fill_mrao_channels(img_array, mapping_config, mra_array)
+                Image.fromarray(mra_array, mode='RGB').save(mra_output_path, compress_level=compress_level)
+            else:
+                # 每一行都会被分条写入，color=None跳过整幅清零
+                mra_image = Image.new('RGB', (width, height), None)
+                strip_buffer = cls._scratch_buffer(scratch, (cls.STRIP_ROWS, width, 3))
+                for top in range(0, height, cls.STRIP_ROWS):
+                    bottom = min(top + cls.STRIP_ROWS, height)
+                    strip = np.asarray(image.crop((0, top, width, bottom)))
+                    out = strip_buffer[:bottom - top]
+                    cls._fill_mrao_channels(strip, mapping_config, out)
+                    mra_image.paste(Image.fromarray(out, mode='RGB'), (0, top))
+                mra_image.save(mra_output_path, compress_level=compress_level)
+            
+            return base_name
             
         except Exception as e:
             raise Exception(f"处理文件 {input_file} 时出错: {str(e)}")
+            
+    @staticmethod
+    def prepare_output_dirs(output_dir):
+        """创建并返回输出目录下的(Fake PBR目录, PBR目录)"""
+        output_path = Path(output_dir)
+        fake_pbr_dir = output_path / "Fake PBR"
+        pbr_dir = output_path / "PBR"
+        fake_pbr_dir.mkdir(parents=True, exist_ok=True)
+        pbr_dir.mkdir(parents=True, exist_ok=True)
+        return fake_pbr_dir, pbr_dir
+        
+    @staticmethod
+    def _scratch_buffer(scratch, shape):
+        """取得指定尺寸的uint8缓冲区；尺寸与上次相同时复用scratch中的缓冲区（各通道都会被完整写入，无需清零）"""
+        buffer = scratch.get(shape) if scratch is not None else None
+        if buffer is None:
+            buffer = np.empty(shape, dtype=np.uint8)
+            if scratch is not None:
+                scratch.clear()  # 只保留最近尺寸的缓冲区
+                scratch[shape] = buffer
+        return buffer
+        
+    @staticmethod
+    def _fill_mrao_channels(img_array, mapping_config, mra_array):
+        """根据映射配置把RGBA/RGB数组（整幅或一条）填入MRA数组的三个通道"""
+        # 分离通道（灰度只在被映射使用时计算，白色/黑色直接填充常数，不生成整幅平面）
+        channels = {
+            '红色通道': img_array[:, :, 0],
+            '绿色通道': img_array[:, :, 1],
+            '蓝色通道': img_array[:, :, 2],
+            'Alpha通道': (img_array[:, :, 3] if img_array.shape[2] > 3
+                          else np.broadcast_to(np.uint8(255), img_array.shape[:2]))
+        }
+        
+        if _HAS_NUMBA:
+            # 白色/黑色/未知来源都用全0平面加异或掩码表示，三个通道由内核一次遍历写出
+            zero = np.broadcast_to(np.uint8(0), img_array.shape[:2])
+            args = []
+            for channel_key in ('metallic', 'roughness', 'ao'):
+                config = mapping_config.get(channel_key)
+                source = config['source'] if config else None
+                mask = 0xFF if config and config['invert'] else 0
+                if source == '灰度' and '灰度' not in channels:
+                    channels['灰度'] = PBRTextureTab.luminance_u8(img_array)
+                if source in channels:
+                    plane = channels[source]
+                elif source in ('白色', '黑色'):
+                    plane = zero
+                    if source == '白色':
+                        mask ^= 0xFF
+                else:
+                    plane, mask = zero, 0
+                args += (plane, np.uint8(mask))
+            _assemble_mrao(*args, mra_array)
+            return
+        
+        # 反转（uint8按位取反即255-x）直接写入输出，不产生临时数组
+        for i, channel_key in enumerate(['metallic', 'roughness', 'ao']):
+            config = mapping_config.get(channel_key)
+            source = config['source'] if config else None
+            invert = bool(config and config['invert'])
+            out = mra_array[:, :, i]
+            
+            if source == '灰度' and '灰度' not in channels:
+                channels['灰度'] = PBRTextureTab.luminance_u8(img_array)
+            
+            if source in channels:
+                if invert:
+                    np.invert(channels[source], out=out)
+                else:
+                    out[...] = channels[source]
+            elif source == '白色':
+                out.fill(0 if invert else 255)
+            elif source == '黑色':
+                out.fill(255 if invert else 0)
+            else:
+                out.fill(0)
+
+# 每个工作线程/进程各自复用的MRAO输出缓冲区
+_pbr_worker_local = threading.local()
+
+
+def _process_pbr_file(input_file, mapping_config, output_dir, prepared_dirs, compress_level):
+    """在工作线程或进程中处理单个PBR文件（模块级函数，可被子进程序列化调用）"""
+    scratch = getattr(_pbr_worker_local, 'scratch', None)
+    if scratch is None:
+        scratch = _pbr_worker_local.scratch = {}
+    return PBRTextureTab.process_file(input_file, mapping_config, output_dir, scratch, prepared_dirs, compress_level)
+
+
+class PBRProcessingThread(QThread):
+    """PBR贴图处理线程"""
+    
+    progress_updated = Signal(int)
+    status_updated = Signal(str)
+    processing_finished = Signal(int, list)  # 成功数量, 错误信息列表
     
-    def process_batch_files(self, file_list, mapping_config, output_dir):
-        """批量处理文件"""
+    # 文件数达到此数量时改用多进程处理：spawn的每个工作进程都要重新导入PySide6/numpy/numba（实测约1秒），
+    # 而单个文件约1~2秒且线程池中PIL编解码和numba内核会释放GIL，少于此数量时线程池更快
+    PROCESS_POOL_MIN_FILES = 16
+    
+    def __init__(self, files: List[str], mapping_config: Dict[str, Any], output_dir: str,
+                 compress_level: int = PBRTextureTab.PNG_COMPRESS_LEVEL, parent=None):
+        super().__init__(parent)
+        self.files = files
+        self.mapping_config = mapping_config
+        self.output_dir = output_dir
+        self.compress_level = compress_level
+        self._scratch = {}  # 同尺寸文件之间复用的输出缓冲区
+        self._prepared_dirs = None
+        self._futures = {}
+        self.is_cancelled = False
+        
+    def cancel(self):
+        """请求取消：不再开始新的文件，已提交但未开始的任务直接取消，正在处理的文件会完成
+        
+        执行器由处理线程自己关闭并等待工作进程退出
+        """
+        self.is_cancelled = True
+        for future in list(self._futures):
+            future.cancel()
+        
+    def _drop_duplicate_stems(self):
+        """主文件名相同的文件（如a.png和a.jpg）输出到同名文件，并行处理时会互相覆盖，只保留第一个"""
+        files, errors, seen = [], [], {}
+        for file_path in self.files:
+            stem = Path(file_path).stem.lower()
+            if stem in seen:
+                errors.append(f"处理文件 {file_path} 时出错: 与 {Path(seen[stem]).name} 的输出文件名相同，已跳过")
+                continue
+            seen[stem] = file_path
+            files.append(file_path)
+        self.files = files
+        return errors
+        
+    def run(self):
+        duplicate_errors = self._drop_duplicate_stems()
+        total = len(self.files)
+        try:
+            # 输出目录只在开始时创建一次，不再为每个文件重复mkdir
+            self._prepared_dirs = PBRTextureTab.prepare_output_dirs(self.output_dir)
+        except OSError as e:
+            # 交给各文件的处理过程重试，失败时按文件记录错误
+            print(f"创建输出目录失败: {e}")
+        workers = min(os.cpu_count() or 1, total)
+        if workers > 1 and total >= self.PROCESS_POOL_MIN_FILES:
+            # 各文件互不依赖，分给多个进程并行处理；使用spawn启动，避免在多线程的Qt进程中fork
+            self.status_updated.emit(f"使用 {workers} 个进程处理 {total} 个文件...")
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            success_count, errors = self._run_in_pool(executor)
+        elif workers > 1:
+            # 少量文件用线程池，PIL解码/编码和numpy运算期间会释放GIL
+            self.status_updated.emit(f"使用 {workers} 个线程处理 {total} 个文件...")
+            success_count, errors = self._run_in_pool(ThreadPoolExecutor(max_workers=workers))
+        else:
+            success_count, errors = self._run_sequential()
+        
+        if not self.is_cancelled:
+            self.processing_finished.emit(success_count, duplicate_errors + errors)
+        
+    def _run_in_pool(self, executor):
+        """把各文件提交到线程池或进程池，按完成顺序汇总结果（信号跨线程发出，由界面线程处理）"""
+        success_count = 0
+        errors = []
+        total = len(self.files)
+        
+        futures = self._futures
+        # 退出with时等待正在处理的文件完成、工作进程退出
+        with executor:
+            for file_path in self.files:
+                if self.is_cancelled:
+                    break
+                future = executor.submit(_process_pbr_file, file_path, self.mapping_config, self.output_dir,
+                                         self._prepared_dirs, self.compress_level)
+                futures[future] = file_path
+            for done, future in enumerate(as_completed(futures), 1):
+                if self.is_cancelled:
+                    break
+                file_path = futures[future]
+                try:
+                    base_name = future.result()
+                    success_count += 1
+                    self.status_updated.emit(f"处理完成: {base_name}")
+                except Exception as e:
+                    errors.append(str(e))
+                    print(f"处理文件失败: {file_path}, 错误: {str(e)}")
+                self.progress_updated.emit(int(done * 100 / total))
+        
+        return success_count, errors
+        
+    def _run_sequential(self):
         success_count = 0
-        error_count = 0
+        errors = []
+        total = len(self.files)
         
-        for i, file_path in enumerate(file_list):
+        for i, file_path in enumerate(self.files):
+            if self.is_cancelled:
+                break
+            self.status_updated.emit(f"处理文件 {i+1}/{total}: {Path(file_path).name}")
             try:
-                self.status_bar.showMessage(f"处理文件 {i+1}/{len(file_list)}: {Path(file_path).name}")
-                self.process_single_file(file_path, mapping_config, output_dir, show_message=False)
+                base_name = PBRTextureTab.process_file(file_path, self.mapping_config, self.output_dir,
+                                                       self._scratch, self._prepared_dirs, self.compress_level)
                 success_count += 1
+                self.status_updated.emit(f"处理完成: {base_name}")
             except Exception as e:
-                error_count += 1
+                errors.append(str(e))
                 print(f"处理文件失败: {file_path}, 错误: {str(e)}")
+            self.progress_updated.emit(int((i + 1) * 100 / total))
         
-        # 显示批量处理结果
-        message = f"批量处理完成！\n成功: {success_count} 个文件\n失败: {error_count} 个文件\n输出目录: {output_dir}"
-        if error_count > 0:
-            QMessageBox.warning(self, "批量处理完成", message)
-        else:
-            QMessageBox.information(self, "批量处理完成", message)
+        return success_count, errors
 
 
 class L4D2ConversionTab(QWidget):
     """L4D2 PBR转换标签页"""
     
-    def __init__(self, config: ConfigManager, status_bar: QStatusBar):
+    def __init__(self, config: ConfigManager, report_status):
         super().__init__()
         self.config = config
-        self.status_bar = status_bar
+        self.report_status = report_status
         self.texture_paths = {}
         self.processing_thread = None
         self.setup_ui()
@@ -7104,7 +7539,6 @@ class L4D2ConversionTab(QWidget):
     
     def log(self, message: str):
         """添加日志消息"""
-        import datetime
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         self.log_text.append(f"[{timestamp}] {message}")
         self.log_text.ensureCursorVisible()
@@ -7224,12 +7658,30 @@ class L4D2ProcessingThread(QThread):
     finished = Signal(bool, str)
     error = Signal(str)
     
+    # VTF CMD路径探测结果在所有处理线程间共享（None表示不可用），_UNSET表示尚未探测
+    _UNSET = object()
+    _cached_vtfcmd_path = _UNSET
+    
     def __init__(self, texture_paths: dict, output_dir: str, material_name: str, existing_vmt_path: str = None):
         super().__init__()
         self.texture_paths = texture_paths
         self.output_dir = output_dir
         self.material_name = material_name
         self.existing_vmt_path = existing_vmt_path
+        # 待转换的VTF：(输出目录, 格式参数) -> (暂存目录, 输出路径列表)，由flush_vtf_queue统一转换
+        self._vtf_queue = {}
+        self._vtf_staging_dir = None
+        self.is_cancelled = False
+    
+    def cancel(self):
+        """请求取消：当前阶段（如正在运行的VTF CMD）完成后不再继续"""
+        self.is_cancelled = True
+    
+    def _check_cancelled(self) -> bool:
+        """已请求取消时发出取消结果，调用方随即返回"""
+        if self.is_cancelled:
+            self.finished.emit(False, "处理已取消")
+        return self.is_cancelled
     
     def run(self):
         try:
@@ -7245,9 +7697,6 @@ class L4D2ProcessingThread(QThread):
                 return
             
             # 加载必需贴图
-            from PIL import Image
-            import numpy as np
-            
             # 保持原始PNG的通道数，不强制转换为RGBA
             albedo_img = Image.open(self.texture_paths['albedo'])
             # 检查原始图像是否有透明通道
@@ -7277,6 +7726,8 @@ class L4D2ProcessingThread(QThread):
                 self.progress.emit("AO贴图缺失，生成默认AO贴图")
                 ao_img = PBRSourceAlgorithms.generate_default_ao(albedo_img.size)
             
+            if self._check_cancelled():
+                return
             self.progress.emit("正在处理PBR材质...")
             
             # 使用PBR-2-Source算法生成HL2 Phong+Envmap+alpha模式贴图
@@ -7289,12 +7740,16 @@ class L4D2ProcessingThread(QThread):
             self.progress.emit("生成环境贴图遮罩...")
             envmap_mask_img = PBRSourceAlgorithms.make_envmask(metallic_img, roughness_img, ao_img)
             
+            if self._check_cancelled():
+                return
             self.progress.emit("生成基础色贴图...")
             base_texture_img = PBRSourceAlgorithms.make_basecolor(albedo_img, metallic_img, roughness_img, ao_img, preserve_alpha=has_alpha)
             
             self.progress.emit("生成法线贴图（嵌入Phong遮罩）...")
             normal_with_phong_img = PBRSourceAlgorithms.make_bumpmap_with_phong_mask(normal_img, phong_mask_img)
             
+            if self._check_cancelled():
+                return
             self.progress.emit("正在保存VTF文件...")
             
             # 保存处理后的贴图 - 按照PBR-2-Source的标准输出4个文件，转换为VTF格式
@@ -7309,7 +7764,11 @@ class L4D2ProcessingThread(QThread):
             self.convert_pil_to_vtf(normal_with_phong_img, str(output_path / f"{self.material_name}_bump.vtf"), lossy=False, texture_type="normal")
             self.convert_pil_to_vtf(phong_exponent_img, str(output_path / f"{self.material_name}_phongexp.vtf"), lossy=False, texture_type="phong")
             self.convert_pil_to_vtf(envmap_mask_img, str(output_path / f"{self.material_name}_envmask.vtf"), lossy=False, texture_type="envmap")
+            # 按格式分组转换（Phong指数和环境贴图遮罩同为I8，一次VTF CMD调用完成）
+            self.flush_vtf_queue()
             
+            if self._check_cancelled():
+                return
             self.progress.emit("正在生成VMT文件...")
             
             # 检测materials目录并生成相应的VMT内容
@@ -7354,7 +7813,6 @@ class L4D2ProcessingThread(QThread):
             backup_path = protected_dir / f"{self.material_name}_original.vmt"
             
             # 复制原始文件到保护目录
-            import shutil
             shutil.copy2(original_path, backup_path)
             
             self.progress.emit(f"已备份原始VMT文件: {backup_path.name}")
@@ -7368,26 +7826,17 @@ class L4D2ProcessingThread(QThread):
             return False
         
         # 获取Alpha通道
-        if pil_image.mode == 'RGBA':
-            alpha_channel = pil_image.split()[3]
-        else:  # LA模式
-            alpha_channel = pil_image.split()[1]
-        
-        # 转换为numpy数组进行分析
-        alpha_array = np.array(alpha_channel)
-        
-        # 检查是否所有像素都是完全不透明(255)
-        unique_values = np.unique(alpha_array)
+        alpha_channel = pil_image.getchannel('A')
         
-        # 如果只有255这一个值，说明没有透明信息
-        if len(unique_values) == 1 and unique_values[0] == 255:
-            return False
-        
-        # 如果有其他值，说明有透明信息
-        return True
+        # 最小值为255说明所有像素都完全不透明，没有透明信息（getextrema在C中一次遍历，无需numpy副本和排序）
+        lowest, _ = alpha_channel.getextrema()
+        return lowest != 255
     
     def convert_pil_to_vtf(self, pil_image, output_path: str, lossy: bool = True, texture_type: str = "auto"):
-        """将PIL图像转换为VTF格式，使用VTF CMD命令行工具
+        """将PIL图像加入VTF转换队列，由flush_vtf_queue统一调用VTF CMD命令行工具转换
+        
+        图像先按目标格式保存到临时目录下的分组子目录，文件名与输出VTF一致，
+        同一格式、同一输出目录的贴图只需启动一次VTF CMD
         
         Args:
             pil_image: PIL图像对象
@@ -7407,12 +7856,8 @@ class L4D2ProcessingThread(QThread):
                 self.progress.emit(f"VTF CMD不可用，保存为TGA格式: {Path(tga_path).name}")
                 return tga_path
             
-            # 先保存为临时TGA文件
-            temp_tga_path = output_path.replace('.vtf', '_temp.tga')
-            pil_image.save(temp_tga_path)
-            
-            # 构建VTF CMD命令
-            cmd = [vtfcmd_path, '-file', temp_tga_path, '-output', str(Path(output_path).parent)]
+            # VTF CMD格式参数
+            cmd = []
             
             # 根据贴图类型选择固定格式
             if texture_type == "normal":
@@ -7492,43 +7937,86 @@ class L4D2ProcessingThread(QThread):
                         cmd.extend(['-format', 'i8'])
                         self.progress.emit(f"Auto模式(灰度)使用I8格式")
             
-            # 执行VTF CMD命令
-            self.progress.emit(f"执行VTF命令: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
-            
-            # 输出VTF命令的结果
-            if result.stdout:
-                self.progress.emit(f"VTF命令输出: {result.stdout}")
-            if result.stderr:
-                self.progress.emit(f"VTF命令错误: {result.stderr}")
-            
-            # 删除临时TGA文件
-            try:
-                os.remove(temp_tga_path)
-            except:
-                pass
-            
-            # 检查VTF CMD是否成功生成了VTF文件
-            expected_vtf_path = Path(output_path).parent / f"{Path(temp_tga_path).stem}.vtf"
-            if expected_vtf_path.exists():
-                # 如果生成的文件名不匹配，重命名
-                if str(expected_vtf_path) != output_path:
-                    os.rename(str(expected_vtf_path), output_path)
-                
-                self.progress.emit(f"已转换为VTF: {Path(output_path).name}")
-                return output_path
-            else:
-                raise Exception(f"VTF CMD执行失败: {result.stderr}")
+            # 按(输出目录, 格式参数)分组暂存TGA，文件名直接使用输出VTF的名称，转换后无需重命名
+            if self._vtf_staging_dir is None:
+                self._vtf_staging_dir = tempfile.mkdtemp(prefix="vtf_queue_")
+            key = (str(Path(output_path).parent), tuple(cmd))
+            bucket = self._vtf_queue.get(key)
+            if bucket is None:
+                bucket_dir = Path(self._vtf_staging_dir) / f"{len(self._vtf_queue)}_{'_'.join(cmd[1::2])}"
+                bucket_dir.mkdir()
+                bucket = self._vtf_queue[key] = (bucket_dir, [])
+            staged_tga_path = bucket[0] / f"{Path(output_path).stem}.tga"
+            pil_image.save(staged_tga_path)
+            bucket[1].append(output_path)
+            return output_path
             
         except Exception as e:
-            # 如果VTF转换失败，回退到TGA格式
+            # 如果暂存失败，回退到TGA格式
             tga_path = output_path.replace('.vtf', '.tga')
             pil_image.save(tga_path)
             self.progress.emit(f"VTF转换失败，保存为TGA格式: {Path(tga_path).name} (错误: {str(e)})")
             return tga_path
     
-    def get_vtfcmd_path(self):
-        """获取VTF CMD工具路径"""
+    def flush_vtf_queue(self):
+        """对队列中的每组贴图调用一次VTF CMD（-folder通配符），未生成VTF的贴图回退保存为TGA"""
+        queue, staging_dir = self._vtf_queue, self._vtf_staging_dir
+        self._vtf_queue, self._vtf_staging_dir = {}, None
+        try:
+            vtfcmd_path = self.get_vtfcmd_path() if queue else None
+            for (output_dir, format_args), (bucket_dir, output_paths) in queue.items():
+                if self.is_cancelled:
+                    break  # 剩余分组不再转换，暂存的TGA在finally中删除
+                cmd = [vtfcmd_path, '-folder', str(bucket_dir / '*.tga'), '-output', output_dir, *format_args]
+                # 记录已有输出文件的修改时间，用于判断本次是否真正生成
+                old_mtimes = {output_path: self._mtime_ns(output_path) for output_path in output_paths}
+                
+                # 执行VTF CMD命令
+                self.progress.emit(f"执行VTF命令: {' '.join(cmd)}")
+                try:
+                    result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+                    stderr = result.stderr
+                    
+                    # 输出VTF命令的结果
+                    if result.stdout:
+                        self.progress.emit(f"VTF命令输出: {result.stdout}")
+                    if stderr:
+                        self.progress.emit(f"VTF命令错误: {stderr}")
+                except OSError as e:
+                    stderr = str(e)
+                
+                # 检查VTF CMD是否为每个文件生成了VTF
+                for output_path in output_paths:
+                    mtime = self._mtime_ns(output_path)
+                    if mtime is not None and mtime != old_mtimes[output_path]:
+                        self.progress.emit(f"已转换为VTF: {Path(output_path).name}")
+                    else:
+                        # 如果VTF转换失败，回退到TGA格式
+                        tga_path = output_path.replace('.vtf', '.tga')
+                        shutil.move(str(bucket_dir / f"{Path(output_path).stem}.tga"), tga_path)
+                        self.progress.emit(f"VTF转换失败，保存为TGA格式: {Path(tga_path).name} (错误: VTF CMD执行失败: {stderr})")
+        finally:
+            # 删除临时TGA文件
+            if staging_dir is not None:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+    
+    @staticmethod
+    def _mtime_ns(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    
+    @classmethod
+    def get_vtfcmd_path(cls):
+        """获取VTF CMD工具路径（首次探测后缓存在类上，不可用的结果也缓存，之后不再启动探测进程）"""
+        if cls._cached_vtfcmd_path is cls._UNSET:
+            L4D2ProcessingThread._cached_vtfcmd_path = cls._resolve_vtfcmd_path()
+        return cls._cached_vtfcmd_path
+    
+    @staticmethod
+    def _resolve_vtfcmd_path():
+        """探测VTF CMD工具路径"""
         # 首先尝试直接调用vtfcmd
         try:
             result = subprocess.run(["vtfcmd", "-help"], capture_output=True, text=True, encoding='utf-8', errors='ignore')
@@ -7836,6 +8324,10 @@ class L4D2BatchProcessingThread(QThread):
         self.output_dir = output_dir
         self.processed_count = 0
         self.failed_count = 0
+        self.is_cancelled = False
+    
+    def cancel(self):
+        self.is_cancelled = True
     
     def run(self):
         try:
@@ -7846,6 +8338,9 @@ class L4D2BatchProcessingThread(QThread):
             self.progress.emit(f"批量处理输出目录: {output_path_base}")
             
             for i, vmt_file_path in enumerate(self.vmt_files):
+                if self.is_cancelled:
+                    self.finished.emit(False, "处理已取消")
+                    return
                 try:
                     vmt_path = Path(vmt_file_path)
                     material_name = vmt_path.stem
@@ -7869,7 +8364,6 @@ class L4D2BatchProcessingThread(QThread):
                     
                     # 备份原始文件
                     backup_path = output_path_base / f"{material_name}_original.vmt"
-                    import shutil
                     shutil.copy2(vmt_file_path, backup_path)
                     
                     self.processed_count += 1
@@ -8212,6 +8706,8 @@ class L4D2BatchProcessingThread(QThread):
 
 
 def main():
+    if _HAS_NUMBA:
+        _start_mrao_kernel_warm_up()
     app = QApplication(sys.argv)
     
     # 设置应用程序信息
@@ -8227,4 +8723,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的程序启动多进程工作进程时需要
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file